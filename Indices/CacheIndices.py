@@ -0,0 +1,116 @@
+import os
+import time
+import json
+import sqlite3
+import hashlib
+from pathlib import Path
+
+if __package__:
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from Instrumentacion import instrumentar
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_FILE = ROOT_DIR / '.cache' / 'indices.sqlite'
+DEFAULT_MAX_ENTRIES = 100_000
+HASH_BLOCK_SIZE = 1 << 20
+
+class IndexCache:
+    """
+    Caché persistente de índices direccionada por contenido.
+
+    La clave de cada resultado es el hash de (índice, versión del índice,
+    hash de cada archivo de entrada), por lo que un índice solo se vuelve a
+    calcular cuando cambia alguno de sus archivos o su implementación. El
+    número de entradas está acotado y se descartan las menos usadas (LRU).
+
+    Los hashes de archivo se recuerdan por (ruta, tamaño, mtime) para no
+    releer archivos que no cambiaron.
+    """
+
+    def __init__(self, filename=DEFAULT_CACHE_FILE, max_entries=DEFAULT_MAX_ENTRIES):
+        self.filename = Path(filename)
+        self.max_entries = max_entries
+        self.filename.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.filename), timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_last_access ON results(last_access);
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def file_hash(self, filename):
+        """Retorna el SHA-256 de un archivo, reutilizando el guardado si no cambió."""
+        path = str(Path(filename).resolve())
+        stat = os.stat(path)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, sha256 FROM file_hashes WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, sha256))
+        return sha256
+
+    @instrumentar
+    def make_key(self, index_name, version, filenames):
+        """Clave del resultado de un índice para un conjunto de archivos de entrada."""
+        parts = [index_name, str(version)] + [self.file_hash(f) for f in filenames]
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Retorna el valor guardado para `key`, o None si no existe."""
+        row = self.conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        with self.conn:
+            self.conn.execute(
+                "UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put_many(self, items):
+        """Guarda varios pares (clave, valor) y aplica la política de desalojo."""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                [(key, json.dumps(value), now) for key, value in items])
+            self.evict()
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def evict(self):
+        """Elimina las entradas menos usadas recientemente si se supera `max_entries`."""
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_access LIMIT ?)", (excess,))
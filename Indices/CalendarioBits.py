@@ -0,0 +1,235 @@
+"""
+Calendarios de sala como máscaras de bits.
+
+La semana de una sala son 5 x 9 = 45 franjas y cabe en un entero: el bit
+`dia * 9 + (bloque - 1)` está en 1 si la franja está ocupada. Un día es un
+grupo de 9 bits, así que los huecos y las ventanas de un día salen de
+tablas de 512 entradas, y la ocupación es un popcount.
+
+`CalendariosSalas` guarda los calendarios de todas las salas en un arreglo
+`uint64`, ordenado por campus y capacidad, para responder "salas del
+campus X con capacidad >= v libres en (día, bloque)" con un `searchsorted`
+y un AND sobre el tramo del campus.
+"""
+import numpy as np
+
+if __package__:
+    from .MatrizHorario import DIAS, INDICE_DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from .EvaluadorIncremental import HUECOS
+    from .FormatoBinario import cargar_json, cargar_tabla_preferente
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from MatrizHorario import DIAS, INDICE_DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from EvaluadorIncremental import HUECOS
+    from FormatoBinario import cargar_json, cargar_tabla_preferente
+    from Instrumentacion import instrumentar
+
+MASCARA_DIA = (1 << TOTAL_PERIODOS) - 1
+SEMANA = (1 << TOTAL_SLOTS) - 1
+
+def ventanas_dia(mascara):
+    """
+    Duraciones de las ventanas de un día, como en `Metricas/scheduling.ipynb`:
+    tramos libres después del primer bloque ocupado, incluido el del final del día.
+    """
+    if mascara == 0:
+        return ()
+    # Se descarta lo anterior al primer bloque ocupado
+    primero = (mascara & -mascara).bit_length() - 1
+    resto = mascara >> primero
+    ancho = TOTAL_PERIODOS - primero
+    duraciones = []
+    libre = 0
+    for bloque in range(ancho):
+        if resto >> bloque & 1:
+            if libre:
+                duraciones.append(libre)
+                libre = 0
+        else:
+            libre += 1
+    if libre:
+        duraciones.append(libre)
+    return tuple(duraciones)
+
+# Tablas por máscara de un día (2^9 entradas)
+VENTANAS = [ventanas_dia(mascara) for mascara in range(1 << TOTAL_PERIODOS)]
+HUECOS_NP = np.array(HUECOS, dtype=np.int64)
+
+def indice_dia(dia):
+    """Día como 0-4, desde el nombre (cualquier caja) o el índice."""
+    return dia if isinstance(dia, (int, np.integer)) else INDICE_DIAS[dia.capitalize()]
+
+def bit_franja(dia, bloque):
+    """Máscara con solo la franja (día, bloque) encendida; `bloque` va de 1 a 9."""
+    return 1 << (indice_dia(dia) * TOTAL_PERIODOS + bloque - 1)
+
+def calendario_sala(asignaturas):
+    """Calendario (entero de 45 bits) de una sala a partir de sus `Asignaturas`."""
+    calendario = 0
+    for asignatura in asignaturas:
+        calendario |= bit_franja(asignatura['Dia'], asignatura['Bloque'])
+    return calendario
+
+def dias(calendario):
+    """Las 5 máscaras de 9 bits de un calendario."""
+    return [(calendario >> (dia * TOTAL_PERIODOS)) & MASCARA_DIA for dia in range(len(DIAS))]
+
+def ocupados(calendario):
+    return int(calendario).bit_count()
+
+def huecos(calendario):
+    """Bloques libres entre el primer y el último bloque ocupado de cada día (Compactacion.py)."""
+    return sum(HUECOS[mascara] for mascara in dias(calendario))
+
+def duraciones_ventanas(calendario):
+    """Duraciones de todas las ventanas de la semana, día por día."""
+    return [duracion for mascara in dias(calendario) for duracion in VENTANAS[mascara]]
+
+def a_grilla(calendario):
+    """Grilla 5 x 9 de booleanos, la representación anterior de `Metricas/scheduling.ipynb`."""
+    return [[bool(mascara >> bloque & 1) for bloque in range(TOTAL_PERIODOS)] for mascara in dias(calendario)]
+
+def popcount(calendarios):
+    """Bits encendidos de cada elemento de un arreglo `uint64`."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(calendarios).astype(np.int64)
+    # NumPy < 2.0: popcount por byte
+    por_byte = np.array([bin(b).count('1') for b in range(256)], dtype=np.int64)
+    return por_byte[calendarios.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+def huecos_arreglo(calendarios):
+    """`huecos` de cada calendario de un arreglo `uint64`."""
+    total = np.zeros(len(calendarios), dtype=np.int64)
+    for dia in range(len(DIAS)):
+        mascaras = (calendarios >> np.uint64(dia * TOTAL_PERIODOS)) & np.uint64(MASCARA_DIA)
+        total += HUECOS_NP[mascaras.astype(np.intp)]
+    return total
+
+class CalendariosSalas:
+    """
+    Calendarios de todas las salas, ordenados por campus y luego por capacidad.
+
+    `rangos_campus[campus]` es el tramo (inicio, fin) de las salas del
+    campus, con sus capacidades en orden creciente.
+    """
+
+    __slots__ = ('codigos', 'campus', 'capacidades', 'calendarios', 'indice', 'rangos_campus')
+
+    def __init__(self, codigos, campus, capacidades, calendarios):
+        orden = sorted(range(len(codigos)), key=lambda i: (campus[i], capacidades[i], codigos[i]))
+        self.codigos = [codigos[i] for i in orden]
+        self.campus = [campus[i] for i in orden]
+        self.capacidades = np.array([capacidades[i] for i in orden], dtype=np.int64)
+        self.calendarios = np.array([calendarios[i] for i in orden], dtype=np.uint64)
+        self.indice = {codigo: posicion for posicion, codigo in enumerate(self.codigos)}
+
+        self.rangos_campus = {}
+        for posicion, nombre in enumerate(self.campus):
+            inicio, _ = self.rangos_campus.get(nombre, (posicion, posicion))
+            self.rangos_campus[nombre] = (inicio, posicion + 1)
+
+    @classmethod
+    def _desde_calendarios(cls, salas, calendarios):
+        """
+        `calendarios` va por código de sala. Las salas del horario que no
+        están en `salas.json` quedan sin campus y con capacidad 0.
+        """
+        codigos, campus, capacidades, valores = [], [], [], []
+        for sala in salas:
+            codigos.append(sala['Codigo'])
+            campus.append(sala['Campus'])
+            capacidades.append(sala['Capacidad'])
+            valores.append(calendarios.get(sala['Codigo'], 0))
+        conocidas = set(codigos)
+        for codigo, calendario in calendarios.items():
+            if codigo not in conocidas:
+                codigos.append(codigo)
+                campus.append('')
+                capacidades.append(0)
+                valores.append(calendario)
+        return cls(codigos, campus, capacidades, valores)
+
+    @classmethod
+    @instrumentar
+    def desde_json(cls, salas, horarios_salas):
+        """
+        Args:
+            salas (list): Contenido de `salas.json` (campus y capacidad).
+            horarios_salas (list): Contenido de `Horarios_salas.json`.
+        """
+        calendarios = {sala['Codigo']: calendario_sala(sala['Asignaturas']) for sala in horarios_salas}
+        return cls._desde_calendarios(salas, calendarios)
+
+    @classmethod
+    @instrumentar
+    def desde_tabla(cls, salas, tabla):
+        """Desde una TablaAsignaciones de `Horarios_salas.json` (HorarioCompacto.py), sin recorrer diccionarios."""
+        bits = np.left_shift(np.uint64(1), (tabla.dia.astype(np.uint64) * np.uint64(TOTAL_PERIODOS)
+                                            + tabla.bloque.astype(np.uint64) - np.uint64(1)))
+        por_grupo = np.zeros(len(tabla.grupos), dtype=np.uint64)
+        np.bitwise_or.at(por_grupo, tabla.grupo, bits)
+        calendarios = {tabla.strings[codigo]: int(calendario)
+                       for codigo, calendario in zip(tabla.grupos.tolist(), por_grupo.tolist())}
+        return cls._desde_calendarios(salas, calendarios)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def calendario(self, codigo):
+        return int(self.calendarios[self.indice[codigo]])
+
+    def asignar(self, codigo, dia, bloque):
+        """Marca la franja como ocupada; False si ya lo estaba."""
+        posicion = self.indice[codigo]
+        bit = np.uint64(bit_franja(dia, bloque))
+        if self.calendarios[posicion] & bit:
+            return False
+        self.calendarios[posicion] |= bit
+        return True
+
+    def liberar(self, codigo, dia, bloque):
+        posicion = self.indice[codigo]
+        self.calendarios[posicion] &= ~np.uint64(bit_franja(dia, bloque))
+
+    def posiciones_libres(self, campus, capacidad_minima=0, mascara=0):
+        """Posiciones de las salas del campus con capacidad >= `capacidad_minima` y todos los bits de `mascara` libres."""
+        inicio, fin = self.rangos_campus.get(campus, (0, 0))
+        inicio += int(np.searchsorted(self.capacidades[inicio:fin], capacidad_minima, side='left'))
+        if not mascara:
+            return np.arange(inicio, fin)
+        libres = (self.calendarios[inicio:fin] & np.uint64(mascara)) == 0
+        return inicio + np.flatnonzero(libres)
+
+    def salas_libres(self, campus, capacidad_minima=0, dia=None, bloque=None, mascara=0):
+        """
+        Códigos de las salas del campus con capacidad suficiente libres en (`dia`, `bloque`)
+        y en las franjas de `mascara`, de menor a mayor capacidad.
+        """
+        if dia is not None and bloque is not None:
+            mascara |= bit_franja(dia, bloque)
+        return [self.codigos[posicion] for posicion in self.posiciones_libres(campus, capacidad_minima, mascara).tolist()]
+
+    def ocupacion(self):
+        """Franjas ocupadas de cada sala, en el orden de `codigos`."""
+        return popcount(self.calendarios)
+
+    def huecos(self):
+        return huecos_arreglo(self.calendarios)
+
+    def room_occupancy(self):
+        """Room_Occupancy (RO.py) sobre todas las salas del calendario."""
+        if len(self) == 0:
+            return 0.0
+        return int(self.ocupacion().sum()) / (len(self) * TOTAL_SLOTS)
+
+    def compactacion_global(self):
+        """Compactacion global, igual a `calculate_global_compactness_matrix` (Compactacion.py)."""
+        total_periodos = int(self.ocupacion().sum())
+        if total_periodos <= 1:
+            return 1.0
+        return 1.0 - int(self.huecos().sum()) / (total_periodos - 1)
+
+def cargar_calendarios(salas_filename, horarios_salas_filename):
+    """CalendariosSalas de una ejecución, leyendo el `.bin` del horario si está vigente (FormatoBinario.py)."""
+    return CalendariosSalas.desde_tabla(cargar_json(salas_filename),
+                                        cargar_tabla_preferente(horarios_salas_filename, es_sala=True))
@@ -1,7 +1,13 @@
 import json
-import pandas as pd
+import numpy as np
 from collections import defaultdict
 
+if __package__:
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from Instrumentacion import instrumentar
+
+@instrumentar
 def load_json_file(filename):
     """Carga un archivo JSON y maneja posibles errores."""
     try:
@@ -40,6 +46,7 @@ def count_gaps(periods):
             
     return gaps
 
+@instrumentar
 def analyze_room_compactness(horarios_salas):
     """
     Analiza la compactación del horario para cada sala.
@@ -89,6 +96,75 @@ def analyze_room_compactness(horarios_salas):
     
     return compactness_stats
 
+def room_gap_counts(ocupacion):
+    """
+    Calcula huecos y períodos ocupados por sala sobre la matriz de ocupación.
+
+    Para cada día con al menos un bloque ocupado, los huecos son los bloques
+    libres entre el primer y el último bloque ocupado.
+
+    Args:
+        ocupacion (np.ndarray): Matriz booleana (salas x días x bloques).
+
+    Returns:
+        tuple: Arreglos (huecos, períodos) con un valor por sala.
+    """
+    num_bloques = ocupacion.shape[-1]
+    periodos_dia = ocupacion.sum(axis=-1)
+    primero = ocupacion.argmax(axis=-1)
+    ultimo = num_bloques - 1 - ocupacion[..., ::-1].argmax(axis=-1)
+    span = np.where(periodos_dia > 0, ultimo - primero + 1, 0)
+
+    huecos = (span - periodos_dia).sum(axis=-1)
+    periodos = periodos_dia.sum(axis=-1)
+    return huecos, periodos
+
+@instrumentar
+def analyze_room_compactness_matrix(schedule):
+    """
+    Versión vectorizada de `analyze_room_compactness`.
+
+    Args:
+        schedule (ScheduleTensor): Horario cargado con `build_schedule_tensor`.
+
+    Returns:
+        dict: Diccionario con estadísticas de compactación por sala.
+    """
+    huecos, periodos = room_gap_counts(schedule.ocupacion)
+    compactness = np.ones(len(periodos), dtype=float)
+    varios = periodos > 1
+    compactness[varios] = 1.0 - huecos[varios] / (periodos[varios] - 1)
+
+    return {
+        codigo: {
+            'total_gaps': float(gaps),
+            'total_periods': float(periods),
+            'compactness': float(compact)
+        }
+        for codigo, gaps, periods, compact in zip(
+            schedule.salas, huecos.tolist(), periodos.tolist(), compactness.tolist())
+    }
+
+@instrumentar
+def calculate_global_compactness_matrix(schedule):
+    """
+    Calcula la compactación global directamente sobre la matriz de ocupación.
+
+    Args:
+        schedule (ScheduleTensor): Horario cargado con `build_schedule_tensor`.
+
+    Returns:
+        float: Índice de compactación global.
+    """
+    huecos, periodos = room_gap_counts(schedule.ocupacion)
+    total_gaps = int(huecos.sum())
+    total_periods = int(periodos.sum())
+
+    if total_periods <= 1:
+        return 1.0
+
+    return 1.0 - (total_gaps / (total_periods - 1))
+
 def create_summary_table(compactness_stats):
     """
     Crea una tabla resumen de las estadísticas de compactación.
@@ -100,6 +176,8 @@ def create_summary_table(compactness_stats):
         pd.DataFrame: DataFrame con el resumen de estadísticas.
     """
     # Crear DataFrame
+    import pandas as pd
+
     df = pd.DataFrame.from_dict(compactness_stats, orient='index')
     
     # Ordenar por compactación (mayor a menor es mejor ahora)
@@ -117,6 +195,7 @@ def create_summary_table(compactness_stats):
     
     return df_sorted
 
+@instrumentar
 def calculate_global_compactness(compactness_stats):
     """
     Calcula la compactación global del horario.
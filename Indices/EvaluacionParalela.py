@@ -0,0 +1,309 @@
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+# pandas y el pool de procesos solo se importan para la grilla completa
+if __package__:
+    from .Compactacion import calculate_global_compactness_matrix
+    from .SobreCapacidad import calculate_occupation_mean_compact, load_capacity_dict, load_vacancies_dict
+    from .RE import get_unique_courses, calculate_room_eligibility
+    from .RO import calculate_ro_matrix
+    from .TE import calculate_te_matrix
+    from .HorarioCompacto import schedule_tensor
+    from .FormatoBinario import cargar_json, cargar_tabla_preferente
+    from .CacheIndices import IndexCache
+    from .Instrumentacion import instrumentar, activa, contar
+    from .Validacion import filtrar_validas
+else:  # ejecutado como script desde Indices/
+    from Compactacion import calculate_global_compactness_matrix
+    from SobreCapacidad import calculate_occupation_mean_compact, load_capacity_dict, load_vacancies_dict
+    from RE import get_unique_courses, calculate_room_eligibility
+    from RO import calculate_ro_matrix
+    from TE import calculate_te_matrix
+    from HorarioCompacto import schedule_tensor
+    from FormatoBinario import cargar_json, cargar_tabla_preferente
+    from CacheIndices import IndexCache
+    from Instrumentacion import instrumentar, activa, contar
+    from Validacion import filtrar_validas
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PLATAFORMAS = ['SPADE', 'JADE']
+ESCENARIOS = ['full', 'medium', 'small']
+
+# Las tareas llegan agrupadas por ejecución y un bloque de tareas (chunksize
+# <= índices) suele abarcar una o dos ejecuciones; guardar las entradas de
+# esas dos basta, y la memoria de cada proceso no crece con el archivo
+CACHE_JSON = 4  # salas.json y profesores.json de cada una
+CACHE_HORARIOS = 2
+
+@lru_cache(maxsize=CACHE_JSON)
+@instrumentar
+def load_json_cached(filename):
+    """Carga un archivo JSON, reutilizándolo mientras se calculan los índices de su ejecución."""
+    return cargar_json(filename)
+
+@lru_cache(maxsize=CACHE_HORARIOS)
+@instrumentar
+def load_schedule_cached(filename):
+    """
+    Construye el ScheduleTensor de un `Horarios_salas.json` una vez por ejecución.
+
+    El horario pasa por una TablaAsignaciones (HorarioCompacto.py), leída
+    del `.bin` mapeado en memoria si existe, y el JSON no queda en memoria;
+    solo se guardan las columnas y la matriz.
+    """
+    return schedule_tensor(cargar_tabla_preferente(filename, es_sala=True))
+
+@lru_cache(maxsize=CACHE_HORARIOS)
+@instrumentar
+def load_assignments_cached(filename):
+    """TablaAsignaciones de un `Horarios_asignados.json`, una vez por ejecución."""
+    return cargar_tabla_preferente(filename, es_sala=False)
+
+@instrumentar
+def index_ocupacion(run):
+    capacidades = load_capacity_dict(run['salas'])
+    vacantes = load_vacancies_dict(run['profesores'])
+    tabla = load_assignments_cached(run['horarios_asignados'])
+    return calculate_occupation_mean_compact(tabla, capacidades, vacantes)
+
+@instrumentar
+def index_compactacion(run):
+    return calculate_global_compactness_matrix(load_schedule_cached(run['horarios_salas']))
+
+@instrumentar
+def index_room_eligibility(run):
+    courses = get_unique_courses(load_json_cached(run['profesores']))
+    re_value, _ = calculate_room_eligibility(courses, load_json_cached(run['salas']))
+    return re_value
+
+@instrumentar
+def index_room_occupancy(run):
+    return calculate_ro_matrix(load_schedule_cached(run['horarios_salas']))
+
+@instrumentar
+def index_time_slot_eligibility(run):
+    return calculate_te_matrix(load_schedule_cached(run['horarios_salas']))
+
+# Mismos nombres que en `IndicesGlobal` de Indice.py
+INDICES = {
+    'Ocupacion': index_ocupacion,
+    'Compactacion': index_compactacion,
+    'Room_Eligibility': index_room_eligibility,
+    'Room_Occupancy': index_room_occupancy,
+    'Time_Slot_Eligibility': index_time_slot_eligibility,
+}
+
+# Incrementar la versión de un índice al cambiar su cálculo invalida su caché
+INDEX_VERSIONS = {
+    'Ocupacion': 1,
+    'Compactacion': 1,
+    'Room_Eligibility': 1,
+    'Room_Occupancy': 1,
+    'Time_Slot_Eligibility': 1,
+}
+
+# Archivos de la ejecución de los que depende cada índice
+INDEX_INPUTS = {
+    'Ocupacion': ('horarios_asignados', 'salas', 'profesores'),
+    'Compactacion': ('horarios_salas',),
+    'Room_Eligibility': ('profesores', 'salas'),
+    'Room_Occupancy': ('horarios_salas',),
+    'Time_Slot_Eligibility': ('horarios_salas',),
+}
+
+def cache_key(cache, run, index_name):
+    """Clave de caché de un índice según el contenido de sus archivos de entrada."""
+    filenames = [run[name] for name in INDEX_INPUTS[index_name]]
+    return cache.make_key(index_name, INDEX_VERSIONS[index_name], filenames)
+
+def run_paths(platform, scenario, run='latest', root_dir=ROOT_DIR):
+    """
+    Rutas de los archivos de una ejecución.
+
+    `latest` es `<PLATAFORMA>_Output/<escenario>/`; cualquier otro
+    identificador es un subdirectorio de él.
+
+    Returns:
+        dict: Plataforma, escenario, run y rutas de los archivos.
+    """
+    platform = platform.upper()
+    scenario_dir = Path(root_dir) / f'{platform}_Output' / scenario
+    run_dir = scenario_dir if run == 'latest' else scenario_dir / run
+    input_dir = Path(root_dir) / 'dataset' / 'scenarios' / scenario
+    return {
+        'platform': platform,
+        'scenario': scenario,
+        'run': run,
+        'horarios_salas': str(run_dir / 'Horarios_salas.json'),
+        'horarios_asignados': str(run_dir / 'Horarios_asignados.json'),
+        'salas': str(input_dir / 'salas.json'),
+        'profesores': str(input_dir / 'profesores.json'),
+    }
+
+def escenarios_disponibles(root_dir=ROOT_DIR):
+    """
+    Escenarios con entradas en `dataset/scenarios/`: los de ESCENARIOS en
+    su orden y luego los demás (p. ej. los de `generate_scenario.py`).
+    """
+    scenarios_dir = Path(root_dir) / 'dataset' / 'scenarios'
+    if not scenarios_dir.is_dir():
+        return list(ESCENARIOS)
+    nombres = sorted(d.name for d in scenarios_dir.iterdir() if d.is_dir() and not d.name.startswith('.'))
+    return [e for e in ESCENARIOS if e in nombres] + [e for e in nombres if e not in ESCENARIOS]
+
+def discover_runs(platforms=PLATAFORMAS, scenarios=None, root_dir=ROOT_DIR):
+    """
+    Busca las ejecuciones disponibles de cada plataforma y escenario
+    (por defecto, todos los de `escenarios_disponibles`).
+
+    `<PLATAFORMA>_Output/<escenario>/` es la ejecución 'latest'; cada
+    subdirectorio que contenga un `Horarios_salas.json` se considera una
+    ejecución repetida con su nombre como identificador.
+
+    Returns:
+        list: Diccionarios con plataforma, escenario, run y rutas de los archivos.
+    """
+    root_dir = Path(root_dir)
+    runs = []
+    for platform in platforms:
+        for scenario in scenarios or escenarios_disponibles(root_dir):
+            scenario_dir = root_dir / f'{platform}_Output' / scenario
+            if not scenario_dir.is_dir():
+                print(f"No se encontraron resultados en {scenario_dir}")
+                continue
+
+            run_dirs = [('latest', scenario_dir)] + sorted(
+                (d.name, d) for d in scenario_dir.iterdir() if d.is_dir())
+            for run_id, run_dir in run_dirs:
+                if not (run_dir / 'Horarios_salas.json').exists():
+                    continue
+                runs.append(run_paths(platform, scenario, run_id, root_dir))
+    return runs
+
+def result_row(run, index_name, value=None, error=None):
+    """Fila de la tabla de resultados."""
+    return {
+        'platform': run['platform'],
+        'scenario': run['scenario'],
+        'run': run['run'],
+        'index': index_name,
+        'value': value,
+        'error': error,
+    }
+
+def evaluate_task(task):
+    """Calcula un índice para una ejecución; pensado para correr en un proceso hijo."""
+    run, index_name = task
+    try:
+        return result_row(run, index_name, value=float(INDICES[index_name](run)))
+    except Exception as e:
+        return result_row(run, index_name, error=f"{type(e).__name__}: {e}")
+
+@instrumentar
+def evaluate_runs(runs, indices=None, max_workers=None, cache=None):
+    """
+    Reparte la grilla (ejecución x índice) en un ProcessPoolExecutor.
+
+    Las tareas de una misma ejecución se envían juntas para que cada
+    proceso reutilice los JSON que ya cargó. Si se entrega un IndexCache,
+    solo se calculan los pares (ejecución, índice) cuyas entradas no están
+    en caché. Con la instrumentación activa (Instrumentacion.py) las
+    tareas se calculan en el proceso actual.
+
+    Returns:
+        pd.DataFrame: Tabla ordenada con una fila por (plataforma, escenario, run, índice).
+    """
+    import pandas as pd
+    from concurrent.futures import ProcessPoolExecutor
+
+    indices = list(indices or INDICES)
+    columns = ['platform', 'scenario', 'run', 'index', 'value', 'error']
+    rows = []
+    tasks = []
+    keys = []
+
+    for run in runs:
+        for index_name in indices:
+            key = None
+            if cache is not None:
+                try:
+                    key = cache_key(cache, run, index_name)
+                except OSError as e:
+                    rows.append(result_row(run, index_name, error=f"{type(e).__name__}: {e}"))
+                    continue
+                value = cache.get(key)
+                contar('cache.aciertos' if value is not None else 'cache.fallos')
+                if value is not None:
+                    rows.append(result_row(run, index_name, value=value))
+                    continue
+            tasks.append((run, index_name))
+            keys.append(key)
+
+    if tasks:
+        if activa():
+            # Las etapas de los procesos hijos no llegarían al reporte
+            computed = [evaluate_task(task) for task in tasks]
+        else:
+            workers = max_workers or os.cpu_count() or 1
+            chunksize = max(1, min(len(indices), len(tasks) // workers))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                computed = list(executor.map(evaluate_task, tasks, chunksize=chunksize))
+        rows.extend(computed)
+
+        if cache is not None:
+            cache.put_many([(key, row['value']) for key, row in zip(keys, computed)
+                            if row['error'] is None])
+
+    return pd.DataFrame(rows, columns=columns)
+
+@instrumentar
+def compute_run(run, indices=None, cache=None):
+    """
+    Calcula los índices de una ejecución en el proceso actual.
+
+    Returns:
+        dict: Índice -> valor.
+    """
+    results = {}
+    pending = []
+    for index_name in (indices or INDICES):
+        key = cache_key(cache, run, index_name) if cache is not None else None
+        value = cache.get(key) if key is not None else None
+        if key is not None:
+            contar('cache.aciertos' if value is not None else 'cache.fallos')
+        if value is None:
+            value = float(INDICES[index_name](run))
+            pending.append((key, value))
+        results[index_name] = value
+
+    if cache is not None and pending:
+        cache.put_many(pending)
+    return results
+
+def main(output_file='indices_por_ejecucion.csv', solo_validas=False, root_dir=ROOT_DIR):
+    """
+    Grilla de todas las ejecuciones bajo `root_dir`. Con `solo_validas`, las
+    ejecuciones con violaciones duras (Validacion.py) no entran en la grilla.
+    """
+    runs = discover_runs(root_dir=root_dir)
+    print(f"Ejecuciones encontradas: {len(runs)}")
+    if solo_validas:
+        runs = filtrar_validas(runs)
+        print(f"Ejecuciones válidas: {len(runs)}")
+
+    with IndexCache() as cache:
+        results = evaluate_runs(runs, cache=cache)
+    errores = results[results['error'].notna()]
+    for _, row in errores.iterrows():
+        print(f"Error en {row['platform']}/{row['scenario']}/{row['run']} ({row['index']}): {row['error']}")
+
+    if not results.empty:
+        print(results.pivot_table(index=['platform', 'scenario', 'run'],
+                                  columns='index', values='value').round(4))
+    results.to_csv(output_file, index=False)
+    print(f"\nResultados guardados en {output_file}")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
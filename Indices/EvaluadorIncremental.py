@@ -0,0 +1,228 @@
+if __package__:
+    from .MatrizHorario import DIAS, INDICE_DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from .SobreCapacidad import create_capacity_dict, create_vacancies_dict
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from MatrizHorario import DIAS, INDICE_DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from SobreCapacidad import create_capacity_dict, create_vacancies_dict
+    from Instrumentacion import instrumentar
+
+def huecos_mascara(mascara):
+    """Bloques libres entre el primer y el último bloque ocupado de un día (bit i = bloque i + 1)."""
+    if mascara == 0:
+        return 0
+    primero = (mascara & -mascara).bit_length() - 1
+    return mascara.bit_length() - primero - bin(mascara).count('1')
+
+# Huecos de cada una de las 2^9 combinaciones de bloques ocupados de un día
+HUECOS = [huecos_mascara(mascara) for mascara in range(1 << TOTAL_PERIODOS)]
+
+class IncrementalEvaluator:
+    """
+    Índices globales de un horario que se actualizan asignación por asignación.
+
+    Mantiene los mismos valores que `compute_run` (EvaluacionParalela.py)
+    para Compactacion, Room_Occupancy, Time_Slot_Eligibility y Ocupacion,
+    pero `assign` y `unassign` cuestan O(1): cada franja (sala, día, bloque)
+    lleva un contador de asignaciones, cada (sala, día) una máscara de 9
+    bits de bloques ocupados cuyos huecos se leen de la tabla HUECOS, y cada
+    evento (asignatura, sala) su número de franjas distintas.
+
+    Pensado para puntuar movimientos en una búsqueda local o reproducir una
+    negociación paso a paso: `move` aplica un cambio y `delta` lo evalúa y
+    lo deshace.
+
+    Como en `build_schedule_tensor`, dos asignaciones en la misma franja de
+    una sala ocupan la franja una sola vez; la franja se libera cuando se
+    quita la última.
+    """
+
+    def __init__(self, salas, capacidades=None, vacantes=None):
+        """
+        Args:
+            salas (list): Códigos de las salas del horario (definen el
+                denominador de Room_Occupancy).
+            capacidades (dict): Sala -> capacidad (`create_capacity_dict`).
+            vacantes (dict): '<asignatura>-<código>' -> vacantes (`create_vacancies_dict`).
+        """
+        self.salas = list(salas)
+        self.indice_salas = {codigo: idx for idx, codigo in enumerate(self.salas)}
+        self.capacidades = capacidades or {}
+        self.vacantes = vacantes or {}
+
+        self.conteo = [0] * (len(self.salas) * TOTAL_SLOTS)
+        self.mascaras = [0] * (len(self.salas) * len(DIAS))
+        self.periodos = 0
+        self.huecos = 0
+
+        # (asignatura, sala) -> franjas distintas; (asignatura, sala, franja) -> asignaciones
+        self.franjas_evento = {}
+        self.conteo_evento = {}
+        self.franjas_eventos = 0
+
+        self.suma_ocupacion = 0.0
+        self.asignaciones_ocupacion = 0
+        self.asignaciones = 0
+
+    @classmethod
+    @instrumentar
+    def desde_horarios(cls, horarios_salas, salas=None, profesores=None):
+        """
+        Evaluador con todas las asignaciones de `Horarios_salas.json`.
+
+        Args:
+            horarios_salas (list): Contenido de `Horarios_salas.json`.
+            salas (list): Contenido de `salas.json`, para las capacidades.
+            profesores (list): Contenido de `profesores.json`, para las vacantes.
+        """
+        evaluador = cls(
+            [sala['Codigo'] for sala in horarios_salas],
+            create_capacity_dict(salas) if salas is not None else None,
+            create_vacancies_dict(profesores) if profesores is not None else None,
+        )
+        for sala in horarios_salas:
+            for asignatura in sala['Asignaturas']:
+                evaluador.assign(sala['Codigo'], asignatura['Dia'], asignatura['Bloque'],
+                                 asignatura['Nombre'], asignatura.get('CodigoAsignatura', ''))
+        return evaluador
+
+    def franja(self, room, day, block):
+        """Posición de (sala, día, bloque) en `conteo`; `day` es el nombre del día (cualquier caja) o 0-4."""
+        dia = day if isinstance(day, int) else INDICE_DIAS[day.capitalize()]
+        if not 1 <= block <= TOTAL_PERIODOS:
+            raise ValueError(f"Bloque fuera de rango: {block}")
+        return (self.indice_salas[room] * len(DIAS) + dia) * TOTAL_PERIODOS + block - 1
+
+    def indice_ocupacion(self, room, course, code):
+        """Aporte de la asignación a Ocupacion, o None si la sala o la asignatura no tienen datos."""
+        capacidad = self.capacidades.get(room, 0)
+        vacantes = self.vacantes.get(f"{course}-{code}", 0)
+        if capacidad > 0 and vacantes > 0:
+            return vacantes / capacidad * 100
+        return None
+
+    def assign(self, room, day, block, course, code=''):
+        """
+        Agrega una asignación de la asignatura `course` (código `code`) a la
+        franja (`room`, `day`, `block`).
+        """
+        franja = self.franja(room, day, block)
+        self.asignaciones += 1
+
+        self.conteo[franja] += 1
+        if self.conteo[franja] == 1:
+            dia_sala, bloque = divmod(franja, TOTAL_PERIODOS)
+            mascara = self.mascaras[dia_sala]
+            nueva = mascara | (1 << bloque)
+            self.mascaras[dia_sala] = nueva
+            self.huecos += HUECOS[nueva] - HUECOS[mascara]
+            self.periodos += 1
+
+        evento = (course, room)
+        clave = (course, room, franja)
+        repeticiones = self.conteo_evento.get(clave, 0)
+        self.conteo_evento[clave] = repeticiones + 1
+        if repeticiones == 0:
+            self.franjas_evento[evento] = self.franjas_evento.get(evento, 0) + 1
+            self.franjas_eventos += 1
+
+        indice = self.indice_ocupacion(room, course, code)
+        if indice is not None:
+            self.suma_ocupacion += indice
+            self.asignaciones_ocupacion += 1
+
+    def unassign(self, room, day, block, course, code=''):
+        """Quita una asignación agregada antes con `assign`; ValueError si no existe."""
+        franja = self.franja(room, day, block)
+        evento = (course, room)
+        clave = (course, room, franja)
+        repeticiones = self.conteo_evento.get(clave, 0)
+        if repeticiones == 0:
+            raise ValueError(f"No hay una asignación de {course!r} en {room} {day} bloque {block}")
+        self.asignaciones -= 1
+
+        if repeticiones == 1:
+            del self.conteo_evento[clave]
+            self.franjas_eventos -= 1
+            if self.franjas_evento[evento] == 1:
+                del self.franjas_evento[evento]
+            else:
+                self.franjas_evento[evento] -= 1
+        else:
+            self.conteo_evento[clave] = repeticiones - 1
+
+        self.conteo[franja] -= 1
+        if self.conteo[franja] == 0:
+            dia_sala, bloque = divmod(franja, TOTAL_PERIODOS)
+            mascara = self.mascaras[dia_sala]
+            nueva = mascara & ~(1 << bloque)
+            self.mascaras[dia_sala] = nueva
+            self.huecos += HUECOS[nueva] - HUECOS[mascara]
+            self.periodos -= 1
+
+        indice = self.indice_ocupacion(room, course, code)
+        if indice is not None:
+            self.asignaciones_ocupacion -= 1
+            # Sin asignaciones la suma vuelve a cero exacto, sin arrastrar error de redondeo
+            self.suma_ocupacion = self.suma_ocupacion - indice if self.asignaciones_ocupacion else 0.0
+
+    def move(self, origen, destino, course, code=''):
+        """Mueve una asignación de `origen` a `destino`, ambos tuplas (sala, día, bloque)."""
+        self.unassign(*origen, course, code)
+        try:
+            self.assign(*destino, course, code)
+        except (KeyError, ValueError):
+            self.assign(*origen, course, code)
+            raise
+
+    def delta(self, origen, destino, course, code=''):
+        """
+        Cambio de cada índice si se moviera la asignación, sin modificar el horario.
+
+        Returns:
+            dict: Índice -> valor después del movimiento menos valor actual.
+        """
+        antes = self.indices()
+        self.move(origen, destino, course, code)
+        try:
+            despues = self.indices()
+        finally:
+            self.move(destino, origen, course, code)
+        return {nombre: despues[nombre] - antes[nombre] for nombre in antes}
+
+    @property
+    def compactacion(self):
+        if self.periodos <= 1:
+            return 1.0
+        return 1.0 - self.huecos / (self.periodos - 1)
+
+    @property
+    def room_occupancy(self):
+        if not self.salas:
+            return 0.0
+        return self.periodos / len(self.conteo)
+
+    @property
+    def time_slot_eligibility(self):
+        num_eventos = len(self.franjas_evento)
+        if num_eventos == 0:
+            return 0
+        return 1.0 - self.franjas_eventos / (num_eventos * TOTAL_SLOTS)
+
+    @property
+    def ocupacion(self):
+        if self.asignaciones_ocupacion == 0:
+            return 0
+        return round(self.suma_ocupacion / self.asignaciones_ocupacion, 2)
+
+    def indices(self):
+        """Valores actuales, con los mismos nombres que `INDICES` de EvaluacionParalela.py."""
+        return {
+            'Ocupacion': self.ocupacion,
+            'Compactacion': self.compactacion,
+            'Room_Occupancy': self.room_occupancy,
+            'Time_Slot_Eligibility': self.time_slot_eligibility,
+        }
+
+    def __len__(self):
+        return self.asignaciones
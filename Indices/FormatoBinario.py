@@ -0,0 +1,660 @@
+import os
+import sys
+import json
+import mmap
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+import numpy as np
+
+if __package__:
+    from .HorarioCompacto import StringTable, TablaAsignaciones, SIN_VALOR, cargar_tabla
+    from .MatrizHorario import INDICE_DIAS
+    from .Instrumentacion import instrumentar, etapa
+else:  # ejecutado como script desde Indices/
+    from HorarioCompacto import StringTable, TablaAsignaciones, SIN_VALOR, cargar_tabla
+    from MatrizHorario import INDICE_DIAS
+    from Instrumentacion import instrumentar, etapa
+
+MAGIC = b'MABSCHD1'
+VERSION = 1
+SUFIJO = '.bin'
+
+# Prefijo fijo: magic + largo del encabezado JSON
+PREFIJO = struct.Struct('<8sQ')
+ALINEACION = 8
+
+# Bajo este tamaño `leer_columnas` usa json.load (p. ej. salas.json, ~7 KB en full)
+TAMANO_MINIMO_COLUMNAS = 32 * 1024
+
+# Campos internos de cada registro además de las columnas de datos
+PLANTILLA, EXTRAS, PRIMERA_FILA, NUM_FILAS = '__plantilla', '__extras', '__primera_fila', '__num_filas'
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+# Los bool de JSON no son columnas enteras: type(True) es bool, no int
+TIPOS = {str: 'str', int: 'int', float: 'float'}
+
+def tipo_valor(valor):
+    """'str', 'int' o 'float' si el valor cabe en una columna tipada; None si no."""
+    tipo = TIPOS.get(type(valor))
+    if tipo == 'int' and not INT64_MIN <= valor <= INT64_MAX:
+        return None
+    return tipo
+
+def inferir_columnas(objetos, excluir=()):
+    """
+    Columnas tipadas de una lista de objetos JSON.
+
+    Cada clave toma el tipo más frecuente entre sus valores; las enteras
+    usan int32 si todos sus valores caben. Los valores de otro tipo se
+    guardan en los extras del registro.
+
+    Returns:
+        list: Tuplas (clave, tipo, dtype de NumPy).
+    """
+    conteos = {}
+    rangos = {}
+    for objeto in objetos:
+        for clave, valor in objeto.items():
+            if clave in excluir:
+                continue
+            tipo = tipo_valor(valor)
+            por_tipo = conteos.setdefault(clave, {})
+            por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+            if tipo == 'int':
+                minimo, maximo = rangos.get(clave, (valor, valor))
+                rangos[clave] = (min(minimo, valor), max(maximo, valor))
+
+    columnas = []
+    for clave, por_tipo in conteos.items():
+        tipos = {tipo: n for tipo, n in por_tipo.items() if tipo is not None}
+        if not tipos:
+            continue
+        tipo = max(tipos, key=tipos.get)
+        if tipo == 'str':
+            dtype = '<i4'
+        elif tipo == 'float':
+            dtype = '<f8'
+        else:
+            minimo, maximo = rangos[clave]
+            dtype = '<i4' if INT32_MIN <= minimo and maximo <= INT32_MAX else '<i8'
+        columnas.append((clave, tipo, dtype))
+    return columnas
+
+def dtype_registro(columnas, grupo=False):
+    campos = [(clave, dtype) for clave, _, dtype in columnas]
+    campos += [(PLANTILLA, '<i4'), (EXTRAS, '<i4')]
+    if grupo:
+        campos += [(PRIMERA_FILA, '<i8'), (NUM_FILAS, '<i4')]
+    return np.dtype(campos)
+
+def codificar_registros(objetos, columnas, dtype, strings, excluir=()):
+    """
+    Llena un arreglo de registros de ancho fijo.
+
+    El orden de las claves de cada objeto se guarda como plantilla (una
+    lista JSON internada) y los valores que no caben en su columna, como
+    un objeto JSON de extras; así la conversión a JSON es exacta.
+
+    Returns:
+        tuple: (registros, claves con valores en extras).
+    """
+    registros = np.zeros(len(objetos), dtype=dtype)
+    tipos = {clave: tipo for clave, tipo, _ in columnas}
+    int32 = {clave for clave, tipo, dtype_columna in columnas if dtype_columna == '<i4' and tipo == 'int'}
+    valores = {clave: [0] * len(objetos) for clave in tipos}
+    plantillas = [0] * len(objetos)
+    extras_ids = [SIN_VALOR] * len(objetos)
+    ids_plantilla = {}
+    desbordadas = set()
+    intern = strings.intern
+
+    for fila, objeto in enumerate(objetos):
+        extras = {}
+        for clave, valor in objeto.items():
+            if clave in excluir:
+                continue
+            tipo = tipos.get(clave)
+            if tipo is None or tipo_valor(valor) != tipo or (
+                    clave in int32 and not INT32_MIN <= valor <= INT32_MAX):
+                extras[clave] = valor
+                if tipo is not None:
+                    desbordadas.add(clave)
+            else:
+                valores[clave][fila] = intern(valor) if tipo == 'str' else valor
+        claves = tuple(objeto)
+        plantilla = ids_plantilla.get(claves)
+        if plantilla is None:
+            plantilla = ids_plantilla[claves] = intern(json.dumps(list(claves), ensure_ascii=False))
+        plantillas[fila] = plantilla
+        if extras:
+            extras_ids[fila] = intern(json.dumps(extras, ensure_ascii=False, separators=(',', ':')))
+
+    for clave, columna in valores.items():
+        # Las columnas de strings ausentes quedan en SIN_VALOR
+        if tipos[clave] == 'str':
+            columna = [v if clave in o else SIN_VALOR for v, o in zip(columna, objetos)]
+        registros[clave] = columna
+    registros[PLANTILLA] = plantillas
+    registros[EXTRAS] = extras_ids
+    return registros, desbordadas
+
+def padding(offset):
+    return -offset % ALINEACION
+
+def sha256_archivo(filename):
+    with open(filename, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def huella(stat, contenido):
+    """
+    Tamaño, mtime y SHA-256 de un JSON, para reconocer si cambió aunque
+    su mtime sea anterior al del binario (`cp -p`, `rsync -a`).
+    """
+    return {
+        'tamano': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': hashlib.sha256(contenido).hexdigest(),
+    }
+
+@instrumentar
+def escribir_binario(data, filename, anidada='Asignaturas', origen=None):
+    """
+    Convierte la lista de un archivo JSON de horarios o de escenario al formato binario.
+
+    Formato (little endian, secciones alineadas a 8 bytes):
+
+    - Prefijo: magic `MABSCHD1` y largo del encabezado.
+    - Encabezado JSON: columnas, dtypes, cantidades y offsets de las secciones.
+    - Grupos: un registro de ancho fijo por elemento de la lista (sala o
+      profesor), con la posición y cantidad de sus filas anidadas.
+    - Filas: un registro de ancho fijo por elemento de las listas
+      `anidada` (`Asignaturas`), en orden.
+    - Strings: offsets uint64 (n + 1) y los strings UTF-8 concatenados.
+
+    Todos los strings (valores, plantillas de claves y extras) van a la
+    tabla de strings, y las columnas guardan su id.
+
+    `origen` es la `huella` del JSON convertido; sin ella el binario no se
+    considera vigente para ningún JSON (`binario_vigente`).
+    """
+    if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+        raise ValueError("El formato binario solo admite una lista de objetos JSON")
+
+    filas = []
+    for item in data:
+        anidados = item.get(anidada, [])
+        if not isinstance(anidados, list) or not all(isinstance(fila, dict) for fila in anidados):
+            raise ValueError(f"'{anidada}' debe ser una lista de objetos JSON")
+        filas.extend(anidados)
+
+    strings = StringTable()
+    columnas_grupo = inferir_columnas(data, excluir=(anidada,))
+    columnas_fila = inferir_columnas(filas)
+    grupos, desbordadas_grupo = codificar_registros(
+        data, columnas_grupo, dtype_registro(columnas_grupo, grupo=True), strings, excluir=(anidada,))
+    registros_fila, desbordadas_fila = codificar_registros(
+        filas, columnas_fila, dtype_registro(columnas_fila), strings)
+
+    conteos = [len(item.get(anidada, [])) for item in data]
+    grupos[NUM_FILAS] = conteos
+    grupos[PRIMERA_FILA] = np.cumsum([0] + conteos[:-1]) if conteos else []
+
+    codificados = [s.encode('utf-8') for s in strings.strings]
+    offsets_strings = np.zeros(len(codificados) + 1, dtype='<u8')
+    offsets_strings[1:] = np.cumsum(np.array([len(b) for b in codificados], dtype='<u8'))
+    blob = b''.join(codificados)
+
+    # Offsets relativos al inicio de los datos (después del encabezado)
+    secciones = {}
+    posicion = 0
+    for nombre, tamano in (('grupos', grupos.nbytes), ('filas', registros_fila.nbytes),
+                           ('offsets_strings', offsets_strings.nbytes), ('strings', len(blob))):
+        secciones[nombre] = posicion
+        posicion += tamano + padding(tamano)
+
+    encabezado = json.dumps({
+        'version': VERSION,
+        'anidada': anidada,
+        'columnas_grupo': columnas_grupo,
+        'columnas_fila': columnas_fila,
+        'desbordadas_grupo': sorted(desbordadas_grupo),
+        'desbordadas_fila': sorted(desbordadas_fila),
+        'num_grupos': len(grupos),
+        'num_filas': len(registros_fila),
+        'num_strings': len(codificados),
+        'secciones': secciones,
+        'origen': origen,
+    }, ensure_ascii=False).encode('utf-8')
+
+    tmp = f"{filename}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as file:
+        file.write(PREFIJO.pack(MAGIC, len(encabezado)))
+        file.write(encabezado)
+        file.write(b'\0' * padding(PREFIJO.size + len(encabezado)))
+        for seccion in (grupos.tobytes(), registros_fila.tobytes(), offsets_strings.tobytes(), blob):
+            file.write(seccion)
+            file.write(b'\0' * padding(len(seccion)))
+    os.replace(tmp, filename)
+
+class TablaStringsBinaria:
+    """
+    Tabla de strings de un archivo binario, decodificada solo al leer cada id.
+
+    Tiene la misma interfaz que StringTable; los strings nuevos de
+    `intern` se agregan en memoria sin tocar el archivo.
+    """
+
+    __slots__ = ('offsets', 'blob', 'cache', 'ids', 'nuevos')
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+        self.cache = {}
+        self.ids = None
+        self.nuevos = []
+
+    def __len__(self):
+        return len(self.offsets) - 1 + len(self.nuevos)
+
+    def __getitem__(self, idx):
+        valor = self.cache.get(idx)
+        if valor is None:
+            base = len(self.offsets) - 1
+            if idx >= base:
+                return self.nuevos[idx - base]
+            inicio, fin = int(self.offsets[idx]), int(self.offsets[idx + 1])
+            valor = self.cache[idx] = str(self.blob[inicio:fin], 'utf-8')
+        return valor
+
+    def decodificar(self, ids):
+        """Strings de una lista de ids, sin pasar por la caché de `__getitem__`."""
+        base = len(self.offsets) - 1
+        offsets = self.offsets.tolist() if len(ids) > 64 else self.offsets
+        blob = self.blob
+        return [str(blob[int(offsets[i]):int(offsets[i + 1])], 'utf-8') if i < base else self.nuevos[i - base]
+                for i in ids]
+
+    def indice(self):
+        """Mapa string -> id; se construye la primera vez que se necesita."""
+        if self.ids is None:
+            self.ids = {self[idx]: idx for idx in range(len(self.offsets) - 1)}
+        return self.ids
+
+    def get(self, value, default=SIN_VALOR):
+        return self.indice().get(value, default)
+
+    def intern(self, value):
+        ids = self.indice()
+        idx = ids.get(value)
+        if idx is None:
+            idx = ids[value] = len(self)
+            self.nuevos.append(value)
+        return idx
+
+    @property
+    def strings(self):
+        return [self[idx] for idx in range(len(self))]
+
+class HorarioBinario:
+    """
+    Lector de un archivo binario mapeado en memoria.
+
+    `grupos` y `filas` son arreglos estructurados de NumPy sobre el mmap:
+    leer una columna solo trae a memoria las páginas que la contienen, y
+    nada se parsea hasta que se pide.
+    """
+
+    def __init__(self, filename):
+        self.filename = str(filename)
+        with open(self.filename, 'rb') as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, largo = PREFIJO.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.filename} no es un archivo de horario binario")
+        self.encabezado = json.loads(self.mm[PREFIJO.size:PREFIJO.size + largo].decode('utf-8'))
+        if self.encabezado['version'] != VERSION:
+            raise ValueError(f"Versión de formato no soportada: {self.encabezado['version']}")
+
+        inicio = PREFIJO.size + largo
+        inicio += padding(inicio)
+        secciones = {nombre: inicio + offset for nombre, offset in self.encabezado['secciones'].items()}
+        columnas_grupo = [tuple(c) for c in self.encabezado['columnas_grupo']]
+        columnas_fila = [tuple(c) for c in self.encabezado['columnas_fila']]
+        self.tipos_grupo = {clave: tipo for clave, tipo, _ in columnas_grupo}
+        self.tipos_fila = {clave: tipo for clave, tipo, _ in columnas_fila}
+        self.anidada = self.encabezado['anidada']
+
+        self.grupos = np.frombuffer(self.mm, dtype=dtype_registro(columnas_grupo, grupo=True),
+                                    count=self.encabezado['num_grupos'], offset=secciones['grupos'])
+        self.filas = np.frombuffer(self.mm, dtype=dtype_registro(columnas_fila),
+                                   count=self.encabezado['num_filas'], offset=secciones['filas'])
+        num_strings = self.encabezado['num_strings']
+        offsets = np.frombuffer(self.mm, dtype='<u8', count=num_strings + 1,
+                                offset=secciones['offsets_strings'])
+        blob_inicio = secciones['strings']
+        blob = memoryview(self.mm)[blob_inicio:blob_inicio + int(offsets[-1])]
+        self.strings = TablaStringsBinaria(offsets, blob)
+        self._plantillas = {}
+
+    def close(self):
+        self.grupos = self.filas = self.strings = None
+        try:
+            self.mm.close()
+        except BufferError:
+            # Alguna vista de NumPy sigue viva; el mmap se cierra cuando se libere
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.grupos)
+
+    def plantilla(self, idx):
+        """Claves, en orden, de la plantilla `idx`."""
+        return json.loads(self.strings[idx])
+
+    def plantillas(self, registros):
+        """(claves de cada plantilla distinta, plantilla de cada registro), calculado una vez por arreglo."""
+        nombre = 'grupos' if registros is self.grupos else 'filas'
+        resultado = self._plantillas.get(nombre)
+        if resultado is None:
+            ids, inversa = np.unique(registros[PLANTILLA], return_inverse=True)
+            resultado = self._plantillas[nombre] = ([set(self.plantilla(p)) for p in ids.tolist()], inversa)
+        return resultado
+
+    def presentes(self, clave, registros):
+        """Máscara de los registros cuya plantilla incluye `clave`."""
+        claves, inversa = self.plantillas(registros)
+        if all(clave in c for c in claves):
+            return np.ones(len(registros), dtype=bool)
+        tiene = np.array([clave in c for c in claves], dtype=bool)
+        return tiene[inversa]
+
+    def decodificar(self, registros, tipos, excluir=()):
+        """
+        Objetos JSON de un arreglo de registros, con sus claves en el orden original.
+
+        Las columnas se pasan a listas de Python de una vez y las
+        plantillas se decodifican una vez cada una.
+        """
+        strings = self.strings
+        columnas = {}
+        for clave, tipo in tipos.items():
+            valores = registros[clave].tolist()
+            if tipo == 'str':
+                valores = [strings[v] if v != SIN_VALOR else None for v in valores]
+            columnas[clave] = valores
+
+        plantillas = {}
+        objetos = []
+        for fila, (plantilla_id, extras_id) in enumerate(
+                zip(registros[PLANTILLA].tolist(), registros[EXTRAS].tolist())):
+            claves = plantillas.get(plantilla_id)
+            if claves is None:
+                claves = plantillas[plantilla_id] = self.plantilla(plantilla_id)
+            extras = json.loads(strings[extras_id]) if extras_id != SIN_VALOR else None
+            objeto = {}
+            for clave in claves:
+                if clave in excluir:
+                    objeto[clave] = None
+                elif extras is not None and clave in extras:
+                    objeto[clave] = extras[clave]
+                else:
+                    objeto[clave] = columnas[clave][fila]
+            objetos.append(objeto)
+        return objetos
+
+    @instrumentar
+    def to_json(self):
+        """Reconstruye exactamente la lista del JSON original."""
+        filas = self.decodificar(self.filas, self.tipos_fila)
+        data = self.decodificar(self.grupos, self.tipos_grupo, excluir=(self.anidada,))
+        for objeto, inicio, cantidad in zip(data, self.grupos[PRIMERA_FILA].tolist(),
+                                            self.grupos[NUM_FILAS].tolist()):
+            if self.anidada in objeto:
+                objeto[self.anidada] = filas[inicio:inicio + cantidad]
+        return data
+
+    def columna(self, clave, anidadas=True, defecto=None):
+        """
+        Valores de `clave` en cada fila anidada (o en cada elemento, sin
+        `anidadas`) como lista de Python, leyendo solo esa columna del mmap.
+
+        Los strings se decodifican una vez por id, los registros cuya
+        plantilla no tiene la clave dan `defecto` y los valores guardados
+        en extras se leen de ahí.
+        """
+        registros = self.filas if anidadas else self.grupos
+        tipo = (self.tipos_fila if anidadas else self.tipos_grupo).get(clave)
+        if tipo is None:
+            valores = [defecto] * len(registros)
+        else:
+            columna = registros[clave]
+            if tipo == 'str':
+                unicos, inversa = np.unique(columna, return_inverse=True)
+                ids = unicos.tolist()
+                ausente = ids[0] == SIN_VALOR if ids else False
+                decodificados = ([defecto] if ausente else []) + self.strings.decodificar(ids[ausente:])
+                valores = [decodificados[i] for i in inversa.tolist()]
+            else:
+                valores = columna.tolist()
+            presentes = self.presentes(clave, registros)
+            if not presentes.all():
+                for fila in np.flatnonzero(~presentes).tolist():
+                    valores[fila] = defecto
+
+        desbordadas = self.encabezado['desbordadas_fila' if anidadas else 'desbordadas_grupo']
+        if tipo is None or clave in desbordadas:
+            extras = registros[EXTRAS]
+            for fila in np.flatnonzero(extras != SIN_VALOR).tolist():
+                valores_extra = json.loads(self.strings[int(extras[fila])])
+                if clave in valores_extra:
+                    valores[fila] = valores_extra[clave]
+        return valores
+
+    def columna_strings(self, clave, vacio=''):
+        """Ids de la columna de strings `clave` de las filas, con `vacio` donde falta."""
+        if self.tipos_fila.get(clave) != 'str':
+            return np.full(len(self.filas), self.strings.intern(vacio), dtype=np.int32)
+        valores = self.filas[clave]
+        return np.where(valores == SIN_VALOR, self.strings.intern(vacio), valores).astype(np.int32)
+
+    @instrumentar
+    def tabla_asignaciones(self, es_sala):
+        """
+        TablaAsignaciones armada directo de las columnas, sin pasar por JSON.
+
+        Si alguna columna necesaria tiene valores fuera de su tipo se
+        reconstruye el JSON y se usa `TablaAsignaciones.desde_json`.
+        """
+        clave_grupo = 'Codigo' if es_sala else 'Nombre'
+        requeridas = ['Nombre', 'Dia', 'Bloque', 'Satisfaccion'] + ([] if es_sala else ['Sala'])
+        desbordadas = set(self.encabezado['desbordadas_fila']) | set(self.encabezado['desbordadas_grupo'])
+        directa = (
+            self.tipos_grupo.get(clave_grupo) == 'str'
+            and self.tipos_fila.get('Nombre') == 'str'
+            and self.tipos_fila.get('Dia') == 'str'
+            and self.tipos_fila.get('Bloque') == 'int'
+            and not desbordadas & set(requeridas + [clave_grupo])
+            and self.presentes(clave_grupo, self.grupos).all()
+            and all(self.presentes(clave, self.filas).all() for clave in ('Nombre', 'Dia', 'Bloque'))
+        )
+        if not directa:
+            return TablaAsignaciones.desde_json(self.to_json(), es_sala, self.strings)
+
+        tabla = TablaAsignaciones(self.strings)
+        filas = self.filas
+        tabla.grupos = self.grupos[clave_grupo].astype(np.int32)
+        tabla.grupo = np.repeat(np.arange(len(self.grupos), dtype=np.int32), self.grupos[NUM_FILAS])
+        tabla.nombre = filas['Nombre'].astype(np.int32)
+        tabla.sala = tabla.grupos[tabla.grupo] if es_sala else self.columna_strings('Sala')
+        tabla.codigo = self.columna_strings('CodigoAsignatura')
+        tabla.actividad = self.columna_strings('Actividad')
+
+        dias, inversa = np.unique(filas['Dia'], return_inverse=True)
+        indice_dia = np.array([INDICE_DIAS[self.strings[int(d)].capitalize()] for d in dias.tolist()],
+                              dtype=np.int8)
+        tabla.dia = indice_dia[inversa] if len(dias) else np.zeros(0, dtype=np.int8)
+        tabla.bloque = filas['Bloque'].astype(np.int8)
+
+        if self.tipos_fila.get('Satisfaccion') == 'int':
+            presentes = self.presentes('Satisfaccion', filas)
+            tabla.satisfaccion = np.where(presentes, filas['Satisfaccion'], SIN_VALOR).astype(np.int16)
+        else:
+            tabla.satisfaccion = np.full(len(filas), SIN_VALOR, dtype=np.int16)
+        return tabla
+
+def ruta_binaria(filename):
+    """`Horarios_salas.json` -> `Horarios_salas.bin`."""
+    return Path(filename).with_suffix(SUFIJO)
+
+def leer_encabezado(binario):
+    """Encabezado JSON de un archivo binario, sin mapear el resto."""
+    with open(binario, 'rb') as file:
+        magic, largo = PREFIJO.unpack(file.read(PREFIJO.size))
+        if magic != MAGIC:
+            raise ValueError(f"{binario} no es un archivo de horario binario")
+        return json.loads(file.read(largo).decode('utf-8'))
+
+def binario_vigente(filename):
+    """
+    Ruta del binario de un JSON si existe y fue generado desde el contenido
+    actual del JSON; si no, None.
+
+    Si el tamaño y el mtime del JSON coinciden con los guardados en el
+    encabezado basta con eso; si solo cambió el mtime se compara el SHA-256.
+    Sin el JSON al lado, el binario se usa tal cual.
+    """
+    binario = ruta_binaria(filename)
+    if not binario.exists():
+        return None
+    json_path = Path(filename)
+    if not json_path.exists():
+        return binario
+    try:
+        origen = leer_encabezado(binario).get('origen')
+    except (OSError, ValueError, struct.error):
+        return None
+    if not origen:
+        return None
+    stat = json_path.stat()
+    if stat.st_size != origen['tamano']:
+        return None
+    if stat.st_mtime_ns != origen['mtime_ns'] and sha256_archivo(json_path) != origen['sha256']:
+        return None
+    return binario
+
+@instrumentar
+def cargar_json(filename):
+    """
+    Contenido de un archivo JSON como objetos de Python.
+
+    Reconstruir los objetos desde el binario cuesta más que json.load, así
+    que el binario solo se usa si el JSON ya no está; para leer algunos
+    campos sin objetos está `leer_columnas`.
+    """
+    if not Path(filename).exists():
+        binario = binario_vigente(filename)
+        if binario is not None:
+            with HorarioBinario(binario) as horario:
+                return horario.to_json()
+    with open(filename, 'r', encoding='utf-8') as file, etapa('json.load'):
+        return json.load(file)
+
+@instrumentar
+def leer_columnas(filename, claves, anidadas=False, anidada='Asignaturas'):
+    """
+    Columnas de un JSON de escenario u horarios sin reconstruir sus objetos.
+
+    Con binario vigente cada columna sale del mmap (`HorarioBinario.columna`);
+    si no, del JSON. `claves` es un diccionario clave -> valor por defecto
+    para los objetos que no la tienen.
+
+    Returns:
+        dict: Clave -> lista de valores, uno por elemento de la lista o,
+        con `anidadas`, por elemento de sus listas `anidada`.
+    """
+    # Un JSON chico se parsea antes de lo que cuesta abrir y mapear su binario
+    json_path = Path(filename)
+    binario = None
+    if not json_path.exists() or json_path.stat().st_size >= TAMANO_MINIMO_COLUMNAS:
+        binario = binario_vigente(filename)
+    if binario is not None:
+        with HorarioBinario(binario) as horario:
+            return {clave: horario.columna(clave, anidadas, defecto) for clave, defecto in claves.items()}
+    with open(filename, 'r', encoding='utf-8') as file, etapa('json.load'):
+        data = json.load(file)
+    objetos = [fila for item in data for fila in item.get(anidada, [])] if anidadas else data
+    return {clave: [objeto.get(clave, defecto) for objeto in objetos] for clave, defecto in claves.items()}
+
+@instrumentar
+def cargar_tabla_preferente(filename, es_sala, strings=None):
+    """
+    TablaAsignaciones de un archivo de horarios, desde el binario si está vigente.
+
+    Con binario no se parsea JSON: las columnas se toman del mmap.
+    """
+    binario = binario_vigente(filename)
+    if binario is None:
+        return cargar_tabla(filename, es_sala, strings)
+    return HorarioBinario(binario).tabla_asignaciones(es_sala)
+
+@instrumentar
+def convertir(filename, destino=None, verificar=True):
+    """
+    Convierte un JSON al formato binario (por defecto junto al JSON, con extensión .bin).
+
+    Con `verificar` se relee el binario y se compara con el JSON original,
+    incluido el orden de las claves.
+    """
+    # El stat va antes de leer: si el JSON cambia mientras tanto, el binario queda desactualizado
+    stat = os.stat(filename)
+    with open(filename, 'rb') as file:
+        contenido = file.read()
+    origen = huella(stat, contenido)
+    data = json.loads(contenido.decode('utf-8'))
+    destino = Path(destino) if destino else ruta_binaria(filename)
+    escribir_binario(data, destino, origen=origen)
+    if verificar:
+        with HorarioBinario(destino) as horario:
+            original = json.dumps(data, ensure_ascii=False)
+            if json.dumps(horario.to_json(), ensure_ascii=False) != original:
+                raise ValueError(f"La conversión de {filename} no es exacta")
+    return destino
+
+def main():
+    parser = argparse.ArgumentParser(description='Conversión entre JSON y el formato binario de horarios.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    a_binario = subparsers.add_parser('convertir', help='JSON -> .bin (junto a cada JSON)')
+    a_binario.add_argument('archivos', nargs='+')
+    a_binario.add_argument('--sin-verificar', action='store_true')
+
+    a_json = subparsers.add_parser('a-json', help='.bin -> JSON')
+    a_json.add_argument('binario')
+    a_json.add_argument('salida')
+    a_json.add_argument('--indent', type=int, default=2)
+    args = parser.parse_args()
+
+    if args.command == 'convertir':
+        for filename in args.archivos:
+            destino = convertir(filename, verificar=not args.sin_verificar)
+            print(f"{filename} -> {destino} ({os.path.getsize(filename)} -> {os.path.getsize(destino)} bytes)")
+    else:
+        with HorarioBinario(args.binario) as horario:
+            data = horario.to_json()
+        with open(args.salida, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=args.indent)
+        print(f"{args.binario} -> {args.salida}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+import sys
+import json
+from array import array
+import numpy as np
+
+if __package__:
+    from .MatrizHorario import ScheduleTensor, DIAS, INDICE_DIAS, TOTAL_PERIODOS
+    from .Instrumentacion import instrumentar, etapa
+else:  # ejecutado como script desde Indices/
+    from MatrizHorario import ScheduleTensor, DIAS, INDICE_DIAS, TOTAL_PERIODOS
+    from Instrumentacion import instrumentar, etapa
+
+# Valor de las columnas numéricas cuando la asignación no trae el campo
+SIN_VALOR = -1
+
+class StringTable:
+    """
+    Tabla de strings internados: cada string distinto se guarda una vez y
+    las columnas solo guardan su id entero.
+    """
+
+    __slots__ = ('strings', 'ids')
+
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def intern(self, value):
+        """Id de `value`, agregándolo a la tabla si no existe."""
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = self.ids[value] = len(self.strings)
+            self.strings.append(sys.intern(value))
+        return idx
+
+    def get(self, value, default=SIN_VALOR):
+        """Id de `value` sin agregarlo, o `default` si no está en la tabla."""
+        return self.ids.get(value, default)
+
+    def __getitem__(self, idx):
+        return self.strings[idx]
+
+    def __len__(self):
+        return len(self.strings)
+
+class Asignacion:
+    """
+    Vista de una fila de una TablaAsignaciones.
+
+    No copia datos: cada atributo se lee de las columnas al accederlo.
+    """
+
+    __slots__ = ('tabla', 'fila')
+
+    def __init__(self, tabla, fila):
+        self.tabla = tabla
+        self.fila = fila
+
+    @property
+    def grupo(self):
+        """Código de la sala (Horarios_salas) o nombre del profesor (Horarios_asignados)."""
+        return self.tabla.strings[int(self.tabla.grupos[self.tabla.grupo[self.fila]])]
+
+    @property
+    def nombre(self):
+        return self.tabla.strings[int(self.tabla.nombre[self.fila])]
+
+    @property
+    def sala(self):
+        return self.tabla.strings[int(self.tabla.sala[self.fila])]
+
+    @property
+    def codigo(self):
+        return self.tabla.strings[int(self.tabla.codigo[self.fila])]
+
+    @property
+    def actividad(self):
+        return self.tabla.strings[int(self.tabla.actividad[self.fila])]
+
+    @property
+    def dia(self):
+        return DIAS[self.tabla.dia[self.fila]]
+
+    @property
+    def bloque(self):
+        return int(self.tabla.bloque[self.fila])
+
+    @property
+    def satisfaccion(self):
+        valor = int(self.tabla.satisfaccion[self.fila])
+        return None if valor == SIN_VALOR else valor
+
+    def __repr__(self):
+        return (f"Asignacion({self.grupo!r}, {self.nombre!r}, sala={self.sala!r}, "
+                f"dia={self.dia!r}, bloque={self.bloque})")
+
+class TablaAsignaciones:
+    """
+    Asignaciones de `Horarios_salas.json` o `Horarios_asignados.json` en columnas.
+
+    Cada asignación es una fila; las columnas son arreglos NumPy con los
+    strings (sala, asignatura, código, actividad) como ids de una
+    StringTable compartida, y día (0-4) y bloque (1-9) como enteros de un
+    byte. `grupo` es la posición de la sala o del profesor dueño de la fila
+    en `grupos`, que guarda el id de su código o nombre.
+
+    Una fila pesa 24 bytes frente a los cientos de bytes del diccionario
+    que produce `json.load`; el acceso por fila se hace con vistas
+    `Asignacion` (``tabla[i]`` o iterando la tabla).
+    """
+
+    __slots__ = ('strings', 'grupos', 'grupo', 'nombre', 'sala', 'codigo',
+                 'actividad', 'dia', 'bloque', 'satisfaccion')
+
+    # (columna, typecode de array, dtype de NumPy)
+    COLUMNAS = (
+        ('grupo', 'i', np.int32),
+        ('nombre', 'i', np.int32),
+        ('sala', 'i', np.int32),
+        ('codigo', 'i', np.int32),
+        ('actividad', 'i', np.int32),
+        ('dia', 'b', np.int8),
+        ('bloque', 'b', np.int8),
+        ('satisfaccion', 'h', np.int16),
+    )
+
+    def __init__(self, strings=None):
+        self.strings = strings if strings is not None else StringTable()
+        self.grupos = array('i')
+        for columna, typecode, _ in self.COLUMNAS:
+            setattr(self, columna, array(typecode))
+
+    @classmethod
+    @instrumentar
+    def desde_json(cls, data, es_sala, strings=None):
+        """
+        Construye la tabla desde la lista cargada de un archivo de horarios.
+
+        Args:
+            data (list): Contenido de `Horarios_salas.json` (`es_sala=True`)
+                o de `Horarios_asignados.json` (`es_sala=False`).
+            strings (StringTable): Tabla compartida, para comparar ids entre archivos.
+        """
+        tabla = cls(strings)
+        intern = tabla.strings.intern
+        grupos = tabla.grupos
+        grupo, nombre, sala, codigo = tabla.grupo, tabla.nombre, tabla.sala, tabla.codigo
+        actividad, dia, bloque, satisfaccion = tabla.actividad, tabla.dia, tabla.bloque, tabla.satisfaccion
+        clave_grupo = 'Codigo' if es_sala else 'Nombre'
+        dias = {}
+
+        for posicion, item in enumerate(data):
+            grupo_id = intern(item[clave_grupo])
+            grupos.append(grupo_id)
+            for asignatura in item.get('Asignaturas', []):
+                dia_raw = asignatura['Dia']
+                dia_idx = dias.get(dia_raw)
+                if dia_idx is None:
+                    dia_idx = dias[dia_raw] = INDICE_DIAS[dia_raw.capitalize()]
+                grupo.append(posicion)
+                nombre.append(intern(asignatura['Nombre']))
+                sala.append(grupo_id if es_sala else intern(asignatura.get('Sala', '')))
+                codigo.append(intern(asignatura.get('CodigoAsignatura', '')))
+                actividad.append(intern(asignatura.get('Actividad', '')))
+                dia.append(dia_idx)
+                bloque.append(asignatura['Bloque'])
+                valor = asignatura.get('Satisfaccion')
+                satisfaccion.append(valor if isinstance(valor, int) else SIN_VALOR)
+
+        return tabla.finalizar()
+
+    def finalizar(self):
+        """Expone las columnas como arreglos NumPy sin copiar los buffers."""
+        self.grupos = np.frombuffer(self.grupos, dtype=np.int32)
+        for columna, _, dtype in self.COLUMNAS:
+            setattr(self, columna, np.frombuffer(getattr(self, columna), dtype=dtype))
+        return self
+
+    def __len__(self):
+        return len(self.nombre)
+
+    def __getitem__(self, fila):
+        if not -len(self) <= fila < len(self):
+            raise IndexError(fila)
+        return Asignacion(self, fila % len(self))
+
+    def __iter__(self):
+        for fila in range(len(self)):
+            yield Asignacion(self, fila)
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados por las columnas (sin la tabla de strings)."""
+        return self.grupos.nbytes + sum(getattr(self, c).nbytes for c, _, _ in self.COLUMNAS)
+
+@instrumentar
+def cargar_tabla(filename, es_sala, strings=None):
+    """Carga un archivo de horarios como TablaAsignaciones; el JSON se descarta al terminar."""
+    with open(filename, 'r', encoding='utf-8') as file, etapa('json.load'):
+        data = json.load(file)
+    return TablaAsignaciones.desde_json(data, es_sala, strings)
+
+def cargar_horarios_salas(filename, strings=None):
+    return cargar_tabla(filename, True, strings)
+
+def cargar_horarios_asignados(filename, strings=None):
+    return cargar_tabla(filename, False, strings)
+
+@instrumentar
+def schedule_tensor(tabla):
+    """
+    ScheduleTensor de una tabla de `Horarios_salas.json`, igual al de
+    `build_schedule_tensor` pero sin recorrer diccionarios.
+    """
+    strings = tabla.strings
+    num_salas = len(tabla.grupos)
+    salas = [strings[idx] for idx in tabla.grupos.tolist()]
+
+    # Eventos (asignatura, sala) numerados en orden de primera aparición
+    claves = tabla.nombre.astype(np.int64) * num_salas + tabla.grupo
+    unicas, primera, inversa = np.unique(claves, return_index=True, return_inverse=True)
+    orden = np.argsort(primera, kind='stable')
+    rango = np.empty_like(orden)
+    rango[orden] = np.arange(len(orden))
+    evento_idx = rango[inversa].astype(np.int32)
+    eventos = [(strings[int(clave // num_salas)], salas[int(clave % num_salas)])
+               for clave in unicas[orden].tolist()]
+
+    fuera_de_rango = (tabla.bloque < 1) | (tabla.bloque > TOTAL_PERIODOS)
+    if fuera_de_rango.any():
+        fila = int(np.argmax(fuera_de_rango))
+        raise ValueError(f"Bloque fuera de rango en {salas[tabla.grupo[fila]]}: {int(tabla.bloque[fila])}")
+
+    sala_idx = tabla.grupo.copy()
+    dia_idx = tabla.dia.copy()
+    bloque_idx = (tabla.bloque - 1).astype(np.int8)
+
+    ocupacion = np.zeros((num_salas, len(DIAS), TOTAL_PERIODOS), dtype=bool)
+    ocupacion[sala_idx, dia_idx, bloque_idx] = True
+
+    return ScheduleTensor(
+        ocupacion=ocupacion,
+        salas=salas,
+        indice_salas={codigo: idx for idx, codigo in enumerate(salas)},
+        eventos=eventos,
+        sala_idx=sala_idx,
+        dia_idx=dia_idx,
+        bloque_idx=bloque_idx,
+        evento_idx=evento_idx
+    )
@@ -1,10 +1,14 @@
 import json
 from pathlib import Path
-from Compactacion import analyze_room_compactness, calculate_global_compactness
-from SobreCapacidad import calculate_occupation_index, create_capacity_dict, create_vacancies_dict
-from RE import get_unique_courses, calculate_room_eligibility
-from RO import create_occupancy_matrix, calculate_ro
-from TE import calculate_te
+
+if __package__:
+    from .EvaluacionParalela import compute_run
+    from .CacheIndices import IndexCache
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from EvaluacionParalela import compute_run
+    from CacheIndices import IndexCache
+    from Instrumentacion import instrumentar
 
 def load_json_file(filename):
     """Carga un archivo JSON y maneja posibles errores."""
@@ -21,53 +25,44 @@ def load_json_file(filename):
         print(f"Error inesperado al cargar {filename}: {str(e)}")
         return None
 
-def calculate_global_indices():
-    """Calcula todos los índices globales y retorna un diccionario con los resultados."""
+@instrumentar
+def calculate_global_indices(use_cache=True):
+    """
+    Calcula todos los índices globales y retorna un diccionario con los resultados.
+
+    Con `use_cache` los índices cuyos archivos de entrada no cambiaron se
+    leen de la caché persistente (ver CacheIndices.py) sin cargar los JSON.
+    """
     
     # Establecer rutas de archivos
     input_dir = Path('agent_input')
     output_dir = Path('agent_output')
     
-    # Cargar archivos necesarios
-    horarios_salas = load_json_file(output_dir / 'Horarios_salas.json')
-    input_salas = load_json_file(input_dir / 'InputOfSala.json')
-    input_profesores = load_json_file(input_dir / 'InputOfProfesores.json')
-    horarios_asignados = load_json_file(output_dir / 'Horarios_asignados.json')
+    run = {
+        'horarios_salas': str(output_dir / 'Horarios_salas.json'),
+        'horarios_asignados': str(output_dir / 'Horarios_asignados.json'),
+        'salas': str(input_dir / 'InputOfSala.json'),
+        'profesores': str(input_dir / 'InputOfProfesores.json'),
+    }
 
-    if not all([horarios_salas, input_salas, input_profesores, horarios_asignados]):
+    faltantes = [path for path in run.values() if not Path(path).exists()]
+    if faltantes:
+        for path in faltantes:
+            print(f"Error: No se encontró el archivo {path}")
         print("Error: No se pudieron cargar todos los archivos necesarios")
         return None
 
+    cache = IndexCache() if use_cache else None
     try:
-        # 1. Calcular índice de ocupación (SobreCapacidad.py)
-        capacidades = create_capacity_dict(input_salas)
-        vacantes = create_vacancies_dict(input_profesores)
-        ocupacion_results = calculate_occupation_index(horarios_asignados, capacidades, vacantes)
-        ocupacion = ocupacion_results['ocupacion_promedio']
-
-        # 2. Calcular índice de compactación (Compactacion.py)
-        compactness_stats = analyze_room_compactness(horarios_salas)
-        compactacion = calculate_global_compactness(compactness_stats)
-
-        # 3. Calcular Room Eligibility (RE.py)
-        courses = get_unique_courses(input_profesores)
-        re_value, _ = calculate_room_eligibility(courses, input_salas)
-
-        # 4. Calcular Room Occupancy (RO.py)
-        occupancy_matrix = create_occupancy_matrix(horarios_salas)
-        ro_value = calculate_ro(occupancy_matrix)
-
-        # 5. Calcular Time-slot Eligibility (TE.py)
-        te_value = calculate_te(horarios_salas)
+        # Ocupacion (SobreCapacidad.py), Compactacion (Compactacion.py),
+        # Room_Eligibility (RE.py), Room_Occupancy (RO.py) y
+        # Time_Slot_Eligibility (TE.py)
+        valores = compute_run(run, cache=cache)
 
         # Crear diccionario de resultados
         indices_globales = {
             "IndicesGlobal": {
-                "Ocupacion": round(ocupacion, 4),
-                "Compactacion": round(compactacion, 4),
-                "Room_Eligibility": round(re_value, 4),
-                "Room_Occupancy": round(ro_value, 4),
-                "Time_Slot_Eligibility": round(te_value, 4)
+                nombre: round(valor, 4) for nombre, valor in valores.items()
             }
         }
 
@@ -81,6 +76,9 @@ def calculate_global_indices():
     except Exception as e:
         print(f"Error al calcular índices globales: {str(e)}")
         return None
+    finally:
+        if cache is not None:
+            cache.close()
 
 def main():
     indices = calculate_global_indices()
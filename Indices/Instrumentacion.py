@@ -0,0 +1,261 @@
+"""
+Instrumentación de las etapas de carga y cálculo, sin dependencias.
+
+Desactivada por defecto: `etapa()` devuelve un contexto vacío compartido y
+las funciones decoradas con `@instrumentar` solo pagan la lectura de una
+variable global antes de llamar a la original. Se activa con
+
+    MAB_PROFILE=1 python -m Indices compute ...          # perfil.json y perfil.folded
+    MAB_PROFILE=salida/run1 python message_log.py ...    # salida/run1.json y .folded
+    MAB_PROFILE_MEMORY=1                                 # además, tracemalloc
+    python -m Indices --profile salida/run1 [--profile-memory] compute ...
+
+o llamando a `activar()` y luego a `escribir_reporte()`.
+
+Cada etapa se registra bajo su pila de etapas abiertas, así que el mismo
+`json.load` aparece por separado dentro de cada índice. El reporte JSON
+tiene por etapa llamadas, tiempo total y propio (sin las etapas hijas) y,
+con memoria, el pico de bytes asignados sobre lo que había al entrar. El
+archivo `.folded` tiene una línea `a;b;c <microsegundos propios>` por pila,
+el formato que leen flamegraph.pl y speedscope.
+
+Las mediciones son por proceso: con la instrumentación activa la grilla de
+EvaluacionParalela.py se calcula en el proceso actual.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import inspect
+import tracemalloc
+from contextlib import nullcontext
+from functools import wraps
+
+VARIABLE_ENTORNO = 'MAB_PROFILE'
+VARIABLE_MEMORIA = 'MAB_PROFILE_MEMORY'
+PREFIJO_POR_DEFECTO = 'perfil'
+
+_activo = False
+_memoria = False
+_inicio = None
+# Marcos abiertos: [nombre, inicio, tiempo de hijas, bytes al entrar, pico]
+_pila = []
+# Pila (tupla de nombres) -> [llamadas, total_s, propio_s, pico_bytes, neto_bytes]
+_etapas = {}
+_contadores = {}
+
+_SIN_ETAPA = nullcontext()
+
+def activa():
+    return _activo
+
+def activar(memoria=False):
+    """Empieza a registrar etapas y contadores (y asignaciones, con `memoria`)."""
+    global _activo, _memoria, _inicio
+    _activo = True
+    _memoria = memoria
+    _inicio = time.perf_counter()
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def desactivar():
+    global _activo
+    _activo = False
+    if _memoria and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+def reiniciar():
+    """Descarta lo registrado hasta ahora, sin cambiar si está activa."""
+    global _inicio
+    _pila.clear()
+    _etapas.clear()
+    _contadores.clear()
+    _inicio = time.perf_counter()
+
+def _entrar(nombre):
+    if _memoria:
+        actual, pico = tracemalloc.get_traced_memory()
+        if _pila:
+            # El pico global se reinicia en cada etapa; el del padre se guarda antes
+            _pila[-1][4] = max(_pila[-1][4], pico)
+        tracemalloc.reset_peak()
+    else:
+        actual = 0
+    _pila.append([nombre, time.perf_counter(), 0.0, actual, actual])
+
+def _salir(llamada=True):
+    nombre, inicio, hijas, al_entrar, pico = _pila[-1]
+    duracion = time.perf_counter() - inicio
+    clave = tuple(marco[0] for marco in _pila)
+    _pila.pop()
+
+    registro = _etapas.get(clave)
+    if registro is None:
+        registro = _etapas[clave] = [0, 0.0, 0.0, 0, 0]
+    registro[0] += llamada
+    registro[1] += duracion
+    registro[2] += duracion - hijas
+
+    if _memoria:
+        actual, pico_global = tracemalloc.get_traced_memory()
+        pico = max(pico, pico_global)
+        registro[3] = max(registro[3], pico - al_entrar)
+        registro[4] += actual - al_entrar
+        if _pila:
+            _pila[-1][4] = max(_pila[-1][4], pico)
+
+    if _pila:
+        _pila[-1][2] += duracion
+
+class _Etapa:
+    __slots__ = ('nombre',)
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        _entrar(self.nombre)
+        return self
+
+    def __exit__(self, *exc):
+        _salir()
+        return False
+
+def etapa(nombre):
+    """Contexto que mide el bloque como la etapa `nombre`; no hace nada si está desactivada."""
+    if not _activo:
+        return _SIN_ETAPA
+    return _Etapa(nombre)
+
+def contar(nombre, n=1):
+    """Suma `n` al contador `nombre`."""
+    if _activo:
+        _contadores[nombre] = _contadores.get(nombre, 0) + n
+
+def _iterar(generador, nombre):
+    """Mide solo el tiempo dentro del generador, no el del código que lo consume."""
+    elementos = 0
+    llamada = True
+    try:
+        while True:
+            _entrar(nombre)
+            try:
+                item = next(generador)
+            except StopIteration:
+                return
+            finally:
+                _salir(llamada)
+                llamada = False
+            elementos += 1
+            yield item
+    finally:
+        generador.close()
+        contar(f"{nombre}.elementos", elementos)
+
+def instrumentar(func=None, *, nombre=None):
+    """
+    Decorador que registra cada llamada a `func` como una etapa.
+
+    El nombre por defecto es `<módulo>.<función>`, sin el paquete. Los
+    generadores se miden solo mientras producen elementos y cuentan los
+    que entregan en `<nombre>.elementos`.
+    """
+    if func is None:
+        return lambda f: instrumentar(f, nombre=nombre)
+
+    nombre = nombre or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    if inspect.isgeneratorfunction(func):
+        @wraps(func)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return func(*args, **kwargs)
+            return _iterar(func(*args, **kwargs), nombre)
+    else:
+        @wraps(func)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return func(*args, **kwargs)
+            _entrar(nombre)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _salir()
+    return envoltura
+
+def reporte():
+    """
+    Desglose de lo registrado.
+
+    Returns:
+        dict: Tiempo total, etapas por pila (ordenadas por tiempo total),
+        totales por nombre de etapa y contadores.
+    """
+    etapas = []
+    por_nombre = {}
+    for clave, (llamadas, total, propio, pico, neto) in _etapas.items():
+        fila = {
+            'stage': ';'.join(clave),
+            'name': clave[-1],
+            'depth': len(clave),
+            'calls': llamadas,
+            'total_s': round(total, 6),
+            'self_s': round(propio, 6),
+        }
+        if _memoria:
+            fila['alloc_peak_bytes'] = pico
+            fila['alloc_net_bytes'] = neto
+        etapas.append(fila)
+
+        acumulado = por_nombre.setdefault(clave[-1], {'calls': 0, 'total_s': 0.0, 'self_s': 0.0})
+        acumulado['calls'] += llamadas
+        acumulado['self_s'] += propio
+        # Una etapa anidada en sí misma no suma su tiempo dos veces
+        if clave[-1] not in clave[:-1]:
+            acumulado['total_s'] += total
+
+    etapas.sort(key=lambda fila: fila['total_s'], reverse=True)
+    return {
+        'wall_s': round(time.perf_counter() - _inicio, 6) if _inicio is not None else None,
+        'memory': _memoria,
+        'stages': etapas,
+        'by_name': dict(sorted(
+            ((nombre, {k: round(v, 6) if isinstance(v, float) else v for k, v in valores.items()})
+             for nombre, valores in por_nombre.items()),
+            key=lambda item: item[1]['self_s'], reverse=True)),
+        'counters': dict(sorted(_contadores.items())),
+    }
+
+def lineas_folded():
+    """Una línea `a;b;c <microsegundos propios>` por pila, para flamegraph.pl o speedscope."""
+    return [f"{';'.join(clave)} {round(propio * 1e6)}"
+            for clave, (_, _, propio, _, _) in sorted(_etapas.items()) if round(propio * 1e6) > 0]
+
+def escribir_reporte(prefijo=PREFIJO_POR_DEFECTO):
+    """
+    Escribe `<prefijo>.json` y `<prefijo>.folded`.
+
+    Returns:
+        tuple: Rutas de los dos archivos.
+    """
+    carpeta = os.path.dirname(prefijo)
+    if carpeta:
+        os.makedirs(carpeta, exist_ok=True)
+    ruta_json, ruta_folded = f"{prefijo}.json", f"{prefijo}.folded"
+    with open(ruta_json, 'w', encoding='utf-8') as file:
+        json.dump(reporte(), file, ensure_ascii=False, indent=2)
+    with open(ruta_folded, 'w', encoding='utf-8') as file:
+        file.writelines(f"{linea}\n" for linea in lineas_folded())
+    print(f"Perfil escrito en {ruta_json} y {ruta_folded}", file=sys.stderr)
+    return ruta_json, ruta_folded
+
+def _desde_entorno():
+    valor = os.environ.get(VARIABLE_ENTORNO, '').strip()
+    if not valor or valor.lower() in ('0', 'false', 'no'):
+        return
+    prefijo = PREFIJO_POR_DEFECTO if valor.lower() in ('1', 'true', 'yes', 'si', 'sí') else valor
+    activar(memoria=os.environ.get(VARIABLE_MEMORIA, '').strip().lower() in ('1', 'true', 'yes', 'si', 'sí'))
+    atexit.register(escribir_reporte, prefijo)
+
+_desde_entorno()
@@ -0,0 +1,103 @@
+import numpy as np
+from typing import Dict, List, Any, NamedTuple
+
+if __package__:
+    from .Compactacion import load_json_file
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from Compactacion import load_json_file
+    from Instrumentacion import instrumentar
+
+DIAS = ['Lunes', 'Martes', 'Miercoles', 'Jueves', 'Viernes']
+TOTAL_PERIODOS = 9  # 9 bloques por día
+TOTAL_SLOTS = len(DIAS) * TOTAL_PERIODOS
+
+INDICE_DIAS = {dia: idx for idx, dia in enumerate(DIAS)}
+
+class ScheduleTensor(NamedTuple):
+    """
+    Horario de salas en forma matricial.
+
+    Attributes:
+        ocupacion: Arreglo booleano (salas x 5 días x 9 bloques).
+        salas: Códigos de sala en el orden de la primera dimensión.
+        indice_salas: Mapa código de sala -> índice.
+        eventos: Claves (asignatura, sala) en el orden de `evento_idx`.
+        sala_idx: Índice de sala de cada asignación.
+        dia_idx: Índice de día (0-4) de cada asignación.
+        bloque_idx: Índice de bloque (0-8) de cada asignación.
+        evento_idx: Índice de evento de cada asignación.
+    """
+    ocupacion: np.ndarray
+    salas: List[str]
+    indice_salas: Dict[str, int]
+    eventos: List[tuple]
+    sala_idx: np.ndarray
+    dia_idx: np.ndarray
+    bloque_idx: np.ndarray
+    evento_idx: np.ndarray
+
+@instrumentar
+def build_schedule_tensor(horarios_salas: List[Dict[str, Any]]) -> ScheduleTensor:
+    """
+    Convierte `Horarios_salas.json` en una matriz densa de ocupación.
+
+    Se recorre el JSON una sola vez para reunir las coordenadas
+    (sala, día, bloque) de cada asignación; la matriz se llena luego con
+    una única asignación indexada de NumPy.
+
+    Args:
+        horarios_salas (list): Lista de diccionarios con los horarios por sala.
+
+    Returns:
+        ScheduleTensor: Matriz de ocupación, mapas de índices y coordenadas.
+
+    Raises:
+        ValueError: Si un `Bloque` está fuera de 1-9.
+    """
+    salas = [sala['Codigo'] for sala in horarios_salas]
+    indice_salas = {codigo: idx for idx, codigo in enumerate(salas)}
+
+    indice_eventos = {}
+    sala_idx, dia_idx, bloque_idx, evento_idx = [], [], [], []
+
+    for idx, sala in enumerate(horarios_salas):
+        codigo = sala['Codigo']
+        for asignatura in sala['Asignaturas']:
+            evento_key = (asignatura['Nombre'], codigo)
+            evento = indice_eventos.get(evento_key)
+            if evento is None:
+                evento = indice_eventos[evento_key] = len(indice_eventos)
+            bloque = asignatura['Bloque']
+            if not 1 <= bloque <= TOTAL_PERIODOS:
+                raise ValueError(f"Bloque fuera de rango en {codigo}: {bloque}")
+            sala_idx.append(idx)
+            dia_idx.append(INDICE_DIAS[asignatura['Dia'].capitalize()])
+            bloque_idx.append(bloque - 1)
+            evento_idx.append(evento)
+
+    sala_idx = np.asarray(sala_idx, dtype=np.int32)
+    dia_idx = np.asarray(dia_idx, dtype=np.int8)
+    bloque_idx = np.asarray(bloque_idx, dtype=np.int8)
+    evento_idx = np.asarray(evento_idx, dtype=np.int32)
+
+    ocupacion = np.zeros((len(salas), len(DIAS), TOTAL_PERIODOS), dtype=bool)
+    ocupacion[sala_idx, dia_idx, bloque_idx] = True
+
+    return ScheduleTensor(
+        ocupacion=ocupacion,
+        salas=salas,
+        indice_salas=indice_salas,
+        eventos=list(indice_eventos),
+        sala_idx=sala_idx,
+        dia_idx=dia_idx,
+        bloque_idx=bloque_idx,
+        evento_idx=evento_idx
+    )
+
+def load_schedule_tensor(filename) -> ScheduleTensor:
+    """Carga `Horarios_salas.json` y lo convierte en un ScheduleTensor."""
+    horarios_salas = load_json_file(filename)
+    if horarios_salas is None:
+        return None
+    return build_schedule_tensor(horarios_salas)
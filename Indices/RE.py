@@ -1,8 +1,17 @@
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
+from bisect import bisect_left
+from collections import defaultdict
 from pathlib import Path
 
+if __package__:
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from Instrumentacion import instrumentar
+
+# pandas y matplotlib se importan dentro de las funciones que arman tablas o
+# gráficos, para que calcular el índice no pague su tiempo de carga
+
+@instrumentar
 def load_json_file(filename):
     """Carga un archivo JSON y maneja posibles errores."""
     try:
@@ -18,39 +27,67 @@ def load_json_file(filename):
         print(f"Error inesperado al cargar {filename}: {str(e)}")
         return None
 
+@instrumentar
 def get_unique_courses(profesores_data):
     """Extrae todos los cursos únicos con sus requisitos."""
     courses = []
+    vistos = set()
     for profesor in profesores_data:
         for asignatura in profesor['Asignaturas']:
-            course = {
+            key = (asignatura['Nombre'], asignatura['Vacantes'], asignatura['Campus'])
+            # Solo agregar si no existe ya la misma combinación
+            if key in vistos:
+                continue
+            vistos.add(key)
+            courses.append({
                 'nombre': asignatura['Nombre'],
                 'vacantes': asignatura['Vacantes'],
                 'campus': asignatura['Campus']
-            }
-            # Solo agregar si no existe ya la misma combinación
-            if course not in courses:
-                courses.append(course)
+            })
     return courses
 
+@instrumentar
+def build_room_index(salas):
+    """
+    Crea un índice de salas por campus con las capacidades ordenadas.
+
+    Returns:
+        dict: Campus -> lista ordenada de capacidades de sus salas.
+    """
+    room_index = defaultdict(list)
+    for sala in salas:
+        room_index[sala['Campus']].append(sala['Capacidad'])
+    for capacidades in room_index.values():
+        capacidades.sort()
+    return dict(room_index)
+
+def count_eligible_rooms(room_index, campus, vacantes):
+    """
+    Cuenta las salas del campus con capacidad suficiente mediante búsqueda binaria.
+
+    Returns:
+        tuple: (salas elegibles, total de salas del campus).
+    """
+    capacidades = room_index.get(campus)
+    if not capacidades:
+        return 0, 0
+    total_rooms = len(capacidades)
+    return total_rooms - bisect_left(capacidades, vacantes), total_rooms
+
+@instrumentar
 def calculate_room_eligibility(courses, salas):
     """Calcula el Room Eligibility (RE) y estadísticas relacionadas."""
     total_ratio = 0
     eligibility_data = []
+    room_index = build_room_index(salas)
     
     for course in courses:
-        # Filtrar salas del mismo campus
-        campus_rooms = [sala for sala in salas if sala['Campus'] == course['campus']]
-        total_rooms = len(campus_rooms)
+        # Salas del mismo campus y, de ellas, las que cumplen con la capacidad requerida
+        eligible_rooms, total_rooms = count_eligible_rooms(
+            room_index, course['campus'], course['vacantes'])
         
         if total_rooms == 0:
             continue
-            
-        # Contar salas elegibles (que cumplen con la capacidad requerida)
-        eligible_rooms = len([
-            sala for sala in campus_rooms 
-            if sala['Capacidad'] >= course['vacantes']
-        ])
         
         ratio = eligible_rooms / total_rooms
         total_ratio += ratio
@@ -69,6 +106,9 @@ def calculate_room_eligibility(courses, salas):
 
 def create_visualization(RE, eligibility_data, output_path):
     """Crea visualizaciones del análisis de Room Eligibility."""
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     # Convertir a DataFrame para facilitar el análisis
     df = pd.DataFrame(eligibility_data)
     
@@ -132,6 +172,8 @@ def main():
     #save_results(RE, eligibility_data, output_dir / 'room_eligibility.json')
     
     # 6. Mostrar estadísticas adicionales
+    import pandas as pd
+
     df = pd.DataFrame(eligibility_data)
     print("\nEstadísticas de elegibilidad por campus:")
     print(df.groupby('campus')['ratio'].agg(['mean', 'min', 'max']).round(4))
@@ -1,8 +1,16 @@
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 
+# pandas y matplotlib se importan dentro de las funciones que arman tablas o
+# gráficos, para que calcular el índice no pague su tiempo de carga
+if __package__:
+    from .MatrizHorario import build_schedule_tensor, DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from MatrizHorario import build_schedule_tensor, DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from Instrumentacion import instrumentar
+
+@instrumentar
 def load_json_file(filename):
     """Carga un archivo JSON y maneja posibles errores."""
     try:
@@ -18,33 +26,34 @@ def load_json_file(filename):
         print(f"Error inesperado al cargar {filename}: {str(e)}")
         return None
 
+@instrumentar
 def create_occupancy_matrix(horarios_salas):
     """
-    Crea una matriz de ocupación (períodos x salas)
-    donde 1 indica ocupado y 0 vacío
+    Crea una matriz de ocupación ((día, período) x salas)
+    donde 1 indica ocupado y 0 vacío.
+
+    Las coordenadas de cada asignación se reúnen en una sola pasada y la
+    matriz se construye de una vez, con las 45 franjas semanales como filas.
     """
-    # Definir períodos y salas
-    periodos = ['1', '2', '3', '4', '5', '6', '7', '8', '9']
-    salas = [sala['Codigo'] for sala in horarios_salas]
-    
-    # Crear matriz de ocupación inicializada en 0
-    occupancy_matrix = pd.DataFrame(0, 
-                                  index=periodos, 
-                                  columns=salas)
-    
-    # Llenar la matriz con datos de ocupación
-    for sala in horarios_salas:
-        codigo_sala = sala['Codigo']
-        for asignatura in sala['Asignaturas']:
-            bloque = str(asignatura['Bloque'])
-            occupancy_matrix.loc[bloque, codigo_sala] = 1
-            
-    return occupancy_matrix
+    import pandas as pd
+
+    schedule = build_schedule_tensor(horarios_salas)
+    num_salas = len(schedule.salas)
+
+    periodos = [str(bloque) for bloque in range(1, TOTAL_PERIODOS + 1)]
+    index = pd.MultiIndex.from_product([DIAS, periodos], names=['dia', 'bloque'])
+    valores = schedule.ocupacion.reshape(num_salas, TOTAL_SLOTS).T.astype(np.int8)
+
+    return pd.DataFrame(valores, index=index, columns=schedule.salas)
 
+@instrumentar
 def calculate_ro(occupancy_matrix):
     """
     Calcula el Room Occupancy (RO) metric
     RO = suma(ocupaciones) / (num_periodos * num_salas)
+
+    Con la matriz de `create_occupancy_matrix` num_periodos son las 45
+    franjas semanales (5 días x 9 bloques).
     """
     total_ocupaciones = occupancy_matrix.sum().sum()
     num_periodos = len(occupancy_matrix.index)
@@ -53,6 +62,19 @@ def calculate_ro(occupancy_matrix):
     ro = total_ocupaciones / (num_periodos * num_salas)
     return ro
 
+@instrumentar
+def calculate_ro_matrix(schedule):
+    """
+    Versión vectorizada de `calculate_ro` sobre un ScheduleTensor,
+    considerando las 45 franjas semanales de cada sala.
+    """
+    ocupacion = schedule.ocupacion
+    if ocupacion.size == 0:
+        return 0.0
+
+    return int(ocupacion.sum()) / ocupacion.size
+
+@instrumentar
 def calculate_room_occupancy(horarios_salas):
     """Calcula estadísticas de ocupación por sala."""
     stats = {}
@@ -72,8 +94,11 @@ def calculate_room_occupancy(horarios_salas):
     
     return stats
 
-def create_occupancy_chart(stats):
+def create_occupancy_chart(stats, output_path='ocupacion_salas.png'):
     """Crea un gráfico de barras de ocupación por sala."""
+    import pandas as pd
+    import matplotlib.pyplot as plt
+
     # Preparar datos
     df = pd.DataFrame.from_dict(stats, orient='index')
     df_sorted = df.sort_values('porcentaje_ocupacion', ascending=True)
@@ -97,11 +122,13 @@ def create_occupancy_chart(stats):
                 va='center')
     
     plt.tight_layout()
-    plt.savefig('ocupacion_salas.png')
+    plt.savefig(output_path)
     plt.close()
 
 def save_results(stats, ro_metric):
     """Guarda los resultados en archivos CSV y JSON."""
+    import pandas as pd
+
     # Guardar estadísticas por sala en CSV
     df_stats = pd.DataFrame.from_dict(stats, orient='index')
     #df_stats.to_csv('estadisticas_ocupacion.csv')
@@ -1,8 +1,14 @@
 import json
-import pandas as pd
-import numpy as np
 from typing import Dict, List, Any
 
+if __package__:
+    from .FormatoBinario import leer_columnas
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from FormatoBinario import leer_columnas
+    from Instrumentacion import instrumentar
+
+@instrumentar
 def load_json_file(filename: str) -> Dict:
     """Carga un archivo JSON y maneja posibles errores."""
     try:
@@ -18,10 +24,12 @@ def load_json_file(filename: str) -> Dict:
         print(f"Error inesperado al cargar {filename}: {str(e)}")
         return None
 
+@instrumentar
 def create_capacity_dict(input_salas: List[Dict[str, Any]]) -> Dict[str, int]:
     """Crea un diccionario con la capacidad de cada sala."""
     return {sala['Codigo']: sala['Capacidad'] for sala in input_salas}
 
+@instrumentar
 def create_vacancies_dict(input_profesores: List[Dict[str, Any]]) -> Dict[str, int]:
     """Crea un diccionario con las vacantes de cada asignatura."""
     vacancies = {}
@@ -33,6 +41,25 @@ def create_vacancies_dict(input_profesores: List[Dict[str, Any]]) -> Dict[str, i
             vacancies[key] = asignatura['Vacantes']
     return vacancies
 
+@instrumentar
+def load_capacity_dict(filename: str) -> Dict[str, int]:
+    """
+    `create_capacity_dict` de un `salas.json`, leyendo solo sus columnas.
+
+    Con un `.bin` vigente las columnas salen del mmap (FormatoBinario.py)
+    y no se construye un diccionario por sala.
+    """
+    columnas = leer_columnas(filename, {'Codigo': None, 'Capacidad': 0})
+    return dict(zip(columnas['Codigo'], columnas['Capacidad']))
+
+@instrumentar
+def load_vacancies_dict(filename: str) -> Dict[str, int]:
+    """`create_vacancies_dict` de un `profesores.json`, leyendo solo sus columnas."""
+    columnas = leer_columnas(filename, {'Nombre': None, 'CodigoAsignatura': '', 'Vacantes': 0}, anidadas=True)
+    return {f"{nombre}-{codigo}": vacantes for nombre, codigo, vacantes
+            in zip(columnas['Nombre'], columnas['CodigoAsignatura'], columnas['Vacantes'])}
+
+@instrumentar
 def calculate_occupation_index(horarios_asignados: List[Dict[str, Any]], 
                              capacidades: Dict[str, int],
                              vacantes: Dict[str, int]) -> Dict[str, float]:
@@ -104,6 +131,43 @@ def calculate_occupation_index(horarios_asignados: List[Dict[str, Any]],
     
     return results
 
+@instrumentar
+def calculate_occupation_mean_compact(tabla, capacidades: Dict[str, int],
+                                      vacantes: Dict[str, int]) -> float:
+    """
+    `ocupacion_promedio` de `calculate_occupation_index` sobre una
+    TablaAsignaciones de `Horarios_asignados.json` (ver HorarioCompacto.py).
+
+    Capacidades y vacantes se buscan una vez por sala y por par
+    (asignatura, código) distintos y se reparten a las filas con NumPy.
+    """
+    import numpy as np
+
+    if len(tabla) == 0:
+        return 0
+
+    strings = tabla.strings
+    capacidad_por_id = np.zeros(len(strings), dtype=float)
+    for sala, capacidad in capacidades.items():
+        idx = strings.get(sala)
+        if idx >= 0:
+            capacidad_por_id[idx] = capacidad
+    capacidad_sala = capacidad_por_id[tabla.sala]
+
+    claves = tabla.nombre.astype(np.int64) * len(strings) + tabla.codigo
+    unicas, inversa = np.unique(claves, return_inverse=True)
+    vacantes_unicas = np.array([
+        vacantes.get(f"{strings[int(clave // len(strings))]}-{strings[int(clave % len(strings))]}", 0)
+        for clave in unicas.tolist()
+    ], dtype=float)
+    vacantes_asignatura = vacantes_unicas[inversa]
+
+    validas = (capacidad_sala > 0) & (vacantes_asignatura > 0)
+    if not validas.any():
+        return 0
+    indices = vacantes_asignatura[validas] / capacidad_sala[validas] * 100
+    return round(float(indices.mean()), 2)
+
 def save_results(results: Dict, output_file: str = 'metricas_ocupacion.json') -> None:
     """Guarda los resultados en un archivo JSON."""
     try:
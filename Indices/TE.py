@@ -1,9 +1,13 @@
 import json
+import numpy as np
 from collections import defaultdict
-import os
 
-print(os.getcwd())
+if __package__:
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from Instrumentacion import instrumentar
 
+@instrumentar
 def load_json_file(filename):
     """Carga un archivo JSON y maneja posibles errores."""
     try:
@@ -19,6 +23,7 @@ def load_json_file(filename):
         print(f"Error inesperado al cargar {filename}: {str(e)}")
         return None
 
+@instrumentar
 def calculate_te(horarios_salas):
     """Calcula la métrica Time-slot Eligibility (TE)."""
     # Definir constantes
@@ -56,6 +61,25 @@ def calculate_te(horarios_salas):
     
     return te_promedio
 
+@instrumentar
+def calculate_te_matrix(schedule):
+    """
+    Versión vectorizada de `calculate_te` sobre un ScheduleTensor.
+
+    Cada evento (asignatura, sala) aporta (45 - períodos ocupados) / 45.
+    """
+    num_eventos = len(schedule.eventos)
+    if num_eventos == 0:
+        return 0
+
+    total_slots = schedule.ocupacion.shape[1] * schedule.ocupacion.shape[2]
+    periodo = schedule.dia_idx.astype(np.int64) * schedule.ocupacion.shape[2] + schedule.bloque_idx
+    claves = np.unique(schedule.evento_idx.astype(np.int64) * total_slots + periodo)
+    periodos_ocupados = np.bincount(claves // total_slots, minlength=num_eventos)
+
+    te_values = (total_slots - periodos_ocupados) / total_slots
+    return float(te_values.mean())
+
 def main():
     # Cargar datos
     horarios_salas = load_json_file('agent_output/Horarios_salas.json')
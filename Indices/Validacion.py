@@ -0,0 +1,272 @@
+"""
+Validación de restricciones duras de los horarios generados.
+
+Revisa cada ejecución contra las entradas del escenario:
+
+- sala_doble_reserva: dos asignaciones en la misma sala, día y bloque
+  (en `Horarios_salas.json` y, por su campo `Sala`, en `Horarios_asignados.json`).
+- choque_profesor: un profesor con dos asignaciones en el mismo día y bloque.
+- campus_distinto: la sala asignada no está en el campus de la asignatura.
+- sobre_capacidad: `Vacantes` de la asignatura > `Capacidad` de la sala.
+- sala_desconocida / asignatura_desconocida: la sala no está en
+  `salas.json` o la asignatura no está en `profesores.json`; esas filas no
+  se pueden revisar por campus ni capacidad.
+
+Las asignaciones se leen como TablaAsignaciones (del `.bin` si está
+vigente) y los duplicados se detectan ordenando una clave entera
+(grupo, día, bloque) con `np.unique`; los diccionarios del escenario solo
+se consultan una vez por sala o asignatura distinta.
+"""
+import csv
+import json
+from pathlib import Path
+import numpy as np
+
+if __package__:
+    from .MatrizHorario import DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from .FormatoBinario import leer_columnas, cargar_tabla_preferente
+    from .Instrumentacion import instrumentar
+else:  # ejecutado como script desde Indices/
+    from MatrizHorario import DIAS, TOTAL_PERIODOS, TOTAL_SLOTS
+    from FormatoBinario import leer_columnas, cargar_tabla_preferente
+    from Instrumentacion import instrumentar
+
+VIOLACIONES = [
+    'sala_doble_reserva', 'choque_profesor', 'campus_distinto', 'sobre_capacidad',
+    'sala_desconocida', 'asignatura_desconocida',
+]
+
+# Las filas sin datos del escenario se informan pero no invalidan la ejecución
+VIOLACIONES_DURAS = ['sala_doble_reserva', 'choque_profesor', 'campus_distinto', 'sobre_capacidad']
+
+NOMBRE_REPORTE = 'validacion.json'
+MAX_DETALLES = 20
+
+def claves_franja(grupo, tabla):
+    """Clave entera (grupo, día, bloque) de cada fila; `grupo` es un arreglo de ids por fila."""
+    return (grupo.astype(np.int64) * TOTAL_SLOTS + tabla.dia.astype(np.int64) * TOTAL_PERIODOS
+            + tabla.bloque.astype(np.int64) - 1)
+
+def duplicados(claves):
+    """
+    Claves repetidas, por ordenamiento.
+
+    Returns:
+        tuple: (claves repetidas, cuántas veces aparece cada una, filas de cada clave repetida
+        como lista de arreglos, solo para las primeras MAX_DETALLES).
+    """
+    orden = np.argsort(claves, kind='stable')
+    ordenadas = claves[orden]
+    if len(ordenadas) < 2:
+        vacio = np.zeros(0, dtype=np.int64)
+        return vacio, vacio, orden, np.zeros(0, dtype=np.int64)
+    # Inicio de cada tramo de claves iguales y su largo
+    inicios = np.flatnonzero(np.concatenate(([True], ordenadas[1:] != ordenadas[:-1])))
+    largos = np.diff(np.append(inicios, len(ordenadas)))
+    repetidos = largos > 1
+    return ordenadas[inicios[repetidos]], largos[repetidos], orden, inicios[repetidos]
+
+def franja(clave):
+    """(grupo, día, bloque) de una clave de `claves_franja`."""
+    grupo, resto = divmod(int(clave), TOTAL_SLOTS)
+    dia, bloque = divmod(resto, TOTAL_PERIODOS)
+    return grupo, DIAS[dia], bloque + 1
+
+def conflictos(tabla, grupo_por_fila, nombre_grupo, describir, max_detalles):
+    """Cantidad de asignaciones que comparten franja con otra y el detalle de las primeras."""
+    claves, conteos, orden, inicios = duplicados(claves_franja(grupo_por_fila, tabla))
+    detalles = []
+    for clave, conteo, inicio in zip(claves[:max_detalles].tolist(), conteos[:max_detalles].tolist(),
+                                     inicios[:max_detalles].tolist()):
+        grupo, dia, bloque = franja(clave)
+        filas = orden[inicio:inicio + conteo].tolist()
+        detalles.append({nombre_grupo: tabla.strings[grupo], 'dia': dia, 'bloque': bloque,
+                         'asignaciones': [describir(fila) for fila in filas]})
+    return int(conteos.sum()), len(claves), detalles
+
+def por_string(ids, strings, buscar):
+    """Aplica `buscar` una vez por id distinto y reparte el resultado a las filas."""
+    unicos, inversa = np.unique(ids, return_inverse=True)
+    valores = [buscar(strings[int(idx)]) for idx in unicos.tolist()]
+    return valores, inversa
+
+@instrumentar
+def validar_ejecucion(run, max_detalles=MAX_DETALLES):
+    """
+    Valida una ejecución (diccionario de `run_paths`).
+
+    Returns:
+        dict: Reporte con la cantidad de filas afectadas por tipo de
+        violación, los conflictos distintos y hasta `max_detalles`
+        ejemplos de cada uno. `valida` es False si hay alguna violación dura.
+    """
+    salas = leer_columnas(run['salas'], {'Codigo': None, 'Campus': None, 'Capacidad': 0})
+    asignaturas = leer_columnas(run['profesores'], {'Nombre': None, 'CodigoAsignatura': '', 'Campus': None,
+                                                    'Vacantes': 0}, anidadas=True)
+    horarios_salas = cargar_tabla_preferente(run['horarios_salas'], es_sala=True)
+    horarios_asignados = cargar_tabla_preferente(run['horarios_asignados'], es_sala=False)
+
+    datos_salas = {codigo: (campus, capacidad) for codigo, campus, capacidad
+                   in zip(salas['Codigo'], salas['Campus'], salas['Capacidad'])}
+    datos_asignaturas = {f"{nombre}-{codigo}": (campus, vacantes) for nombre, codigo, campus, vacantes
+                         in zip(asignaturas['Nombre'], asignaturas['CodigoAsignatura'],
+                                asignaturas['Campus'], asignaturas['Vacantes'])}
+
+    filas = {nombre: 0 for nombre in VIOLACIONES}
+    distintos = {nombre: 0 for nombre in VIOLACIONES}
+    detalles = {nombre: [] for nombre in VIOLACIONES}
+
+    # Doble reserva de salas, desde cada archivo
+    tabla = horarios_salas
+    filas['sala_doble_reserva'], distintos['sala_doble_reserva'], detalles['sala_doble_reserva'] = conflictos(
+        tabla, tabla.grupos[tabla.grupo], 'sala',
+        lambda fila, t=tabla: {'asignatura': t.strings[int(t.nombre[fila])], 'codigo': t.strings[int(t.codigo[fila])]},
+        max_detalles)
+
+    tabla = horarios_asignados
+    afectadas, conflictos_sala, ejemplos = conflictos(
+        tabla, tabla.sala, 'sala',
+        lambda fila, t=tabla: {'profesor': t.strings[int(t.grupos[t.grupo[fila]])],
+                               'asignatura': t.strings[int(t.nombre[fila])]},
+        max_detalles)
+    # Un horario consistente repite las mismas reservas en los dos archivos; se informa el peor
+    if afectadas > filas['sala_doble_reserva']:
+        filas['sala_doble_reserva'], distintos['sala_doble_reserva'] = afectadas, conflictos_sala
+        detalles['sala_doble_reserva'] = ejemplos
+
+    filas['choque_profesor'], distintos['choque_profesor'], detalles['choque_profesor'] = conflictos(
+        tabla, tabla.grupos[tabla.grupo], 'profesor',
+        lambda fila, t=tabla: {'asignatura': t.strings[int(t.nombre[fila])], 'sala': t.strings[int(t.sala[fila])]},
+        max_detalles)
+
+    # Campus y capacidad: una consulta por sala y por asignatura distintas
+    strings = tabla.strings
+    total_strings = len(strings)
+    por_sala, inversa_sala = por_string(tabla.sala, strings, lambda codigo: datos_salas.get(codigo))
+    # Cada nombre y código se decodifica una vez, aunque aparezca en muchas asignaturas
+    nombres = {idx: strings[idx] for idx in np.unique(tabla.nombre).tolist()}
+    codigos = {idx: strings[idx] for idx in np.unique(tabla.codigo).tolist()}
+    claves_asignatura = tabla.nombre.astype(np.int64) * total_strings + tabla.codigo
+    unicas, inversa_asignatura = np.unique(claves_asignatura, return_inverse=True)
+    por_asignatura = []
+    for clave in unicas.tolist():
+        nombre, codigo = divmod(clave, total_strings)
+        por_asignatura.append(datos_asignaturas.get(f"{nombres[nombre]}-{codigos[codigo]}"))
+
+    campus_ids = {}
+    def id_campus(campus):
+        return campus_ids.setdefault(campus, len(campus_ids))
+
+    sala_conocida = np.array([dato is not None for dato in por_sala], dtype=bool)[inversa_sala]
+    campus_sala = np.array([id_campus(dato[0]) if dato else -1 for dato in por_sala], dtype=np.int64)[inversa_sala]
+    capacidad = np.array([dato[1] if dato else 0 for dato in por_sala], dtype=np.int64)[inversa_sala]
+    asignatura_conocida = np.array([dato is not None for dato in por_asignatura], dtype=bool)[inversa_asignatura]
+    campus_asignatura = np.array([id_campus(dato[0]) if dato else -1 for dato in por_asignatura],
+                                 dtype=np.int64)[inversa_asignatura]
+    vacantes = np.array([dato[1] or 0 if dato else 0 for dato in por_asignatura], dtype=np.int64)[inversa_asignatura]
+
+    revisables = sala_conocida & asignatura_conocida
+    mascaras = {
+        'sala_desconocida': ~sala_conocida,
+        'asignatura_desconocida': ~asignatura_conocida,
+        'campus_distinto': revisables & (campus_sala != campus_asignatura),
+        'sobre_capacidad': revisables & (vacantes > capacidad),
+    }
+    nombres_campus = {idx: campus for campus, idx in campus_ids.items()}
+    for nombre, mascara in mascaras.items():
+        seleccion = np.flatnonzero(mascara)
+        filas[nombre] = len(seleccion)
+        if not len(seleccion):
+            continue
+        # Un ejemplo por combinación (asignatura, sala) distinta
+        combinaciones, primera, conteos = np.unique(
+            inversa_asignatura[seleccion].astype(np.int64) * len(por_sala) + inversa_sala[seleccion],
+            return_index=True, return_counts=True)
+        distintos[nombre] = len(combinaciones)
+        for fila, conteo in zip(seleccion[primera][:max_detalles].tolist(), conteos[:max_detalles].tolist()):
+            detalle = {
+                'profesor': strings[int(tabla.grupos[tabla.grupo[fila]])],
+                'asignatura': strings[int(tabla.nombre[fila])],
+                'codigo': strings[int(tabla.codigo[fila])],
+                'sala': strings[int(tabla.sala[fila])],
+                'filas': conteo,
+            }
+            if nombre == 'campus_distinto':
+                detalle['campus_sala'] = nombres_campus[int(campus_sala[fila])]
+                detalle['campus_asignatura'] = nombres_campus[int(campus_asignatura[fila])]
+            elif nombre == 'sobre_capacidad':
+                detalle['vacantes'] = int(vacantes[fila])
+                detalle['capacidad'] = int(capacidad[fila])
+            detalles[nombre].append(detalle)
+
+    return {
+        'platform': run.get('platform'),
+        'scenario': run.get('scenario'),
+        'run': run.get('run'),
+        'valida': not any(filas[nombre] for nombre in VIOLACIONES_DURAS),
+        'asignaciones_salas': len(horarios_salas),
+        'asignaciones_profesores': len(horarios_asignados),
+        'filas': filas,
+        'distintos': distintos,
+        'detalles': {nombre: valores for nombre, valores in detalles.items() if valores},
+    }
+
+def ruta_reporte(run, output_dir=None):
+    """`<directorio de la ejecución>/validacion.json`, o un archivo por ejecución en `output_dir`."""
+    if output_dir is None:
+        return Path(run['horarios_salas']).parent / NOMBRE_REPORTE
+    return Path(output_dir) / f"{run['platform']}_{run['scenario']}_{run['run']}_{NOMBRE_REPORTE}"
+
+def escribir_reporte(reporte, filename):
+    Path(filename).parent.mkdir(parents=True, exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(reporte, file, ensure_ascii=False, indent=2)
+
+def validar_ejecuciones(runs, output_dir=None, resumen=None, max_detalles=MAX_DETALLES, escribir=True):
+    """
+    Valida cada ejecución, escribe su reporte (salvo con `escribir=False`)
+    y, con `resumen`, un CSV con una fila por ejecución y la cantidad de
+    filas de cada violación.
+
+    Returns:
+        list: Los reportes, en el orden de `runs`.
+    """
+    reportes = []
+    for run in runs:
+        try:
+            reporte = validar_ejecucion(run, max_detalles)
+        except (OSError, ValueError, KeyError) as e:
+            reporte = {'platform': run['platform'], 'scenario': run['scenario'], 'run': run['run'],
+                       'valida': False, 'error': f"{type(e).__name__}: {e}"}
+        else:
+            if escribir:
+                escribir_reporte(reporte, ruta_reporte(run, output_dir))
+        reportes.append(reporte)
+
+    if resumen:
+        with open(resumen, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['platform', 'scenario', 'run', 'valida', 'asignaciones'] + VIOLACIONES + ['error'])
+            for reporte in reportes:
+                filas = reporte.get('filas', {})
+                writer.writerow([reporte['platform'], reporte['scenario'], reporte['run'], reporte['valida'],
+                                 reporte.get('asignaciones_profesores', '')]
+                                + [filas.get(nombre, '') for nombre in VIOLACIONES] + [reporte.get('error', '')])
+    return reportes
+
+def filtrar_validas(runs):
+    """
+    Las ejecuciones sin violaciones duras; informa las que se excluyen.
+
+    No escribe `validacion.json` en las carpetas de las ejecuciones; para
+    eso está `validar_ejecuciones` (comando `validate`).
+    """
+    validas = []
+    for run, reporte in zip(runs, validar_ejecuciones(runs, escribir=False)):
+        if reporte['valida']:
+            validas.append(run)
+            continue
+        motivo = reporte.get('error') or ', '.join(
+            f"{nombre}={reporte['filas'][nombre]}" for nombre in VIOLACIONES_DURAS if reporte['filas'][nombre])
+        print(f"Excluida {run['platform']}/{run['scenario']}/{run['run']}: {motivo}")
+    return validas
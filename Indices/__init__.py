@@ -0,0 +1,13 @@
+"""
+Índices de calidad de los horarios generados por JADE y SPADE.
+
+Uso desde la raíz del repositorio:
+
+    python -m Indices compute --platform SPADE --scenario full --run latest
+    python -m Indices convert    # JSON -> .bin mapeable (FormatoBinario.py)
+    python -m Indices grid
+    python -m Indices --profile perfil compute ...   # desglose por etapa (Instrumentacion.py)
+
+Los módulos no importan pandas ni matplotlib al cargarse; solo las
+funciones que arman tablas o gráficos lo hacen.
+"""
@@ -0,0 +1,188 @@
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from .EvaluacionParalela import (
+    ROOT_DIR, PLATAFORMAS, INDICES, INDEX_INPUTS, compute_run, run_paths, load_json_cached, escenarios_disponibles,
+)
+from .CacheIndices import IndexCache
+from . import Instrumentacion
+
+def compute(args):
+    """Calcula los índices de una ejecución y los imprime (JSON por defecto)."""
+    run = run_paths(args.platform, args.scenario, args.run, args.root)
+    indices = args.indices or list(INDICES)
+
+    requeridos = {name for index_name in indices for name in INDEX_INPUTS[index_name]}
+    faltantes = [run[name] for name in sorted(requeridos) if not Path(run[name]).exists()]
+    if faltantes:
+        for path in faltantes:
+            print(f"Error: No se encontró el archivo {path}", file=sys.stderr)
+        return 1
+
+    cache = None if args.no_cache else IndexCache()
+    try:
+        valores = compute_run(run, indices, cache=cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+    resultado = {
+        'platform': run['platform'],
+        'scenario': run['scenario'],
+        'run': run['run'],
+        'IndicesGlobal': {nombre: round(valor, 4) for nombre, valor in valores.items()},
+    }
+
+    if args.format == 'json':
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    elif args.format == 'csv':
+        print('platform,scenario,run,index,value')
+        for nombre, valor in valores.items():
+            print(f"{run['platform']},{run['scenario']},{run['run']},{nombre},{valor}")
+    else:
+        import pandas as pd
+
+        tabla = pd.DataFrame(list(valores.items()), columns=['index', 'value'])
+        print(f"{run['platform']} / {run['scenario']} / {run['run']}")
+        print(tabla.round(4).to_string(index=False))
+
+    if args.charts:
+        create_charts(run, Path(args.charts))
+    return 0
+
+def create_charts(run, output_dir):
+    """Gráficos de ocupación por sala (RO) y de elegibilidad por curso (RE)."""
+    from .RO import calculate_room_occupancy, create_occupancy_chart
+    from .RE import get_unique_courses, calculate_room_eligibility, create_visualization
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    prefijo = f"{run['platform']}_{run['scenario']}_{run['run']}"
+
+    stats = calculate_room_occupancy(load_json_cached(run['horarios_salas']))
+    create_occupancy_chart(stats, output_dir / f'{prefijo}_ocupacion_salas.png')
+
+    courses = get_unique_courses(load_json_cached(run['profesores']))
+    re_value, eligibility_data = calculate_room_eligibility(courses, load_json_cached(run['salas']))
+    create_visualization(re_value, eligibility_data, output_dir / f'{prefijo}_room_eligibility.png')
+    print(f"Gráficos guardados en {output_dir}", file=sys.stderr)
+
+def convert(args):
+    """Genera el `.bin` de cada JSON de las ejecuciones encontradas (FormatoBinario.py)."""
+    from .EvaluacionParalela import discover_runs
+    from .FormatoBinario import convertir, binario_vigente
+
+    archivos = []
+    for run in discover_runs(root_dir=args.root):
+        for clave in ('horarios_salas', 'horarios_asignados', 'salas', 'profesores'):
+            if run[clave] not in archivos and Path(run[clave]).exists():
+                archivos.append(run[clave])
+
+    convertidos = 0
+    for filename in archivos:
+        if not args.force and binario_vigente(filename) is not None:
+            continue
+        destino = convertir(filename)
+        convertidos += 1
+        print(f"{filename} -> {destino}")
+    print(f"{convertidos} archivos convertidos, {len(archivos) - convertidos} ya estaban al día")
+    return 0
+
+def grid(args):
+    """Calcula la grilla completa de ejecuciones x índices (EvaluacionParalela.py)."""
+    from .EvaluacionParalela import main as evaluar_grilla
+
+    evaluar_grilla(args.output, solo_validas=args.exclude_invalid, root_dir=args.root)
+    return 0
+
+def validate(args):
+    """Reporte de violaciones de cada ejecución (Validacion.py); termina con 1 si alguna no es válida."""
+    from .EvaluacionParalela import discover_runs
+    from .Validacion import VIOLACIONES, validar_ejecuciones, ruta_reporte
+
+    platforms = args.platform or PLATAFORMAS
+    scenarios = args.scenario or escenarios_disponibles(args.root)
+    if args.run != 'latest':
+        runs = [run_paths(platform, scenario, args.run, args.root) for platform in platforms for scenario in scenarios]
+    else:
+        runs = discover_runs(platforms, scenarios, args.root)
+
+    reportes = validar_ejecuciones(runs, args.output, args.summary, args.max_details)
+    for run, reporte in zip(runs, reportes):
+        nombre = f"{run['platform']}/{run['scenario']}/{run['run']}"
+        if 'error' in reporte:
+            print(f"{nombre}: ERROR {reporte['error']}")
+            continue
+        conteos = ', '.join(f"{violacion}={reporte['filas'][violacion]}"
+                            for violacion in VIOLACIONES if reporte['filas'][violacion])
+        estado = 'válida' if reporte['valida'] else 'NO válida'
+        print(f"{nombre}: {estado} ({conteos or 'sin violaciones'}) -> {ruta_reporte(run, args.output)}")
+    if args.summary:
+        print(f"Resumen guardado en {args.summary}")
+    return 0 if all(reporte['valida'] for reporte in reportes) else 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m Indices', description='Índices de calidad de los horarios.')
+    parser.add_argument('--profile', nargs='?', const=Instrumentacion.PREFIJO_POR_DEFECTO, metavar='PREFIJO',
+                        help="Desglose por etapa en PREFIJO.json y PREFIJO.folded (por defecto 'perfil')")
+    parser.add_argument('--profile-memory', action='store_true', help='Con --profile, medir asignaciones (tracemalloc)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    compute_parser = subparsers.add_parser('compute', help='Índices de una ejecución')
+    compute_parser.add_argument('--platform', required=True, type=str.upper, choices=PLATAFORMAS)
+    compute_parser.add_argument('--scenario', required=True, help='Directorio de dataset/scenarios/')
+    compute_parser.add_argument('--run', default='latest',
+                                help="Subdirectorio de <PLATAFORMA>_Output/<escenario>/ (por defecto 'latest')")
+    compute_parser.add_argument('--indices', nargs='+', choices=list(INDICES))
+    compute_parser.add_argument('--format', choices=['json', 'csv', 'table'], default='json',
+                                help="'table' usa pandas")
+    compute_parser.add_argument('--charts', metavar='DIR', help='Guardar gráficos RO/RE (usa matplotlib)')
+    compute_parser.add_argument('--no-cache', action='store_true')
+    compute_parser.add_argument('--root', default=ROOT_DIR, type=Path)
+    compute_parser.set_defaults(func=compute)
+
+    convert_parser = subparsers.add_parser('convert', help='JSON -> .bin de todas las ejecuciones')
+    convert_parser.add_argument('--force', action='store_true', help='Reconvertir aunque el .bin esté al día')
+    convert_parser.add_argument('--root', default=ROOT_DIR, type=Path)
+    convert_parser.set_defaults(func=convert)
+
+    grid_parser = subparsers.add_parser('grid', help='Todas las ejecuciones encontradas, en paralelo')
+    grid_parser.add_argument('--output', default='indices_por_ejecucion.csv')
+    grid_parser.add_argument('--root', default=ROOT_DIR, type=Path)
+    grid_parser.add_argument('--exclude-invalid', action='store_true',
+                             help='Omitir las ejecuciones con choques o violaciones de capacidad (ver validate)')
+    grid_parser.set_defaults(func=grid)
+
+    validate_parser = subparsers.add_parser('validate', help='Choques y violaciones de capacidad por ejecución')
+    validate_parser.add_argument('--platform', nargs='+', type=str.upper, choices=PLATAFORMAS)
+    validate_parser.add_argument('--scenario', nargs='+', help='Directorios de dataset/scenarios/ (por defecto todos)')
+    validate_parser.add_argument('--run', default='latest',
+                                 help="Subdirectorio de <PLATAFORMA>_Output/<escenario>/ (por defecto 'latest')")
+    validate_parser.add_argument('--output', metavar='DIR',
+                                 help='Carpeta de los reportes (por defecto validacion.json junto a cada ejecución)')
+    validate_parser.add_argument('--summary', metavar='CSV', help='Una fila por ejecución con los conteos')
+    validate_parser.add_argument('--max-details', type=int, default=20, help='Ejemplos por tipo de violación')
+    validate_parser.add_argument('--root', default=ROOT_DIR, type=Path)
+    validate_parser.set_defaults(func=validate)
+
+    args = parser.parse_args(argv)
+    # Los escenarios dependen de --root, así que se validan después de leerlo
+    scenario = getattr(args, 'scenario', None)
+    if scenario:
+        disponibles = escenarios_disponibles(args.root)
+        desconocidos = [e for e in ([scenario] if isinstance(scenario, str) else scenario) if e not in disponibles]
+        if desconocidos:
+            parser.error(f"escenario desconocido: {', '.join(desconocidos)} "
+                         f"(en {Path(args.root) / 'dataset' / 'scenarios'}: {', '.join(disponibles)})")
+    if not args.profile:
+        return args.func(args)
+
+    Instrumentacion.activar(memoria=args.profile_memory)
+    try:
+        return args.func(args)
+    finally:
+        Instrumentacion.escribir_reporte(args.profile)
+
+if __name__ == "__main__":
+    sys.exit(main())
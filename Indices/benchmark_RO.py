@@ -0,0 +1,68 @@
+import sys
+import time
+import pandas as pd
+
+if __package__:
+    from .RO import load_json_file, create_occupancy_matrix, calculate_ro
+else:  # ejecutado como script desde Indices/
+    from RO import load_json_file, create_occupancy_matrix, calculate_ro
+
+def create_occupancy_matrix_loc(horarios_salas):
+    """
+    Construcción anterior de la matriz de ocupación, celda por celda con
+    `.loc` (períodos x salas, sin dimensión de día). Se mantiene solo como
+    referencia para el benchmark.
+    """
+    periodos = ['1', '2', '3', '4', '5', '6', '7', '8', '9']
+    salas = [sala['Codigo'] for sala in horarios_salas]
+
+    occupancy_matrix = pd.DataFrame(0, index=periodos, columns=salas)
+
+    for sala in horarios_salas:
+        codigo_sala = sala['Codigo']
+        for asignatura in sala['Asignaturas']:
+            bloque = str(asignatura['Bloque'])
+            occupancy_matrix.loc[bloque, codigo_sala] = 1
+
+    return occupancy_matrix
+
+def replicate_schedule(horarios_salas, factor):
+    """Genera un campus sintético repitiendo cada sala `factor` veces."""
+    return [
+        {**sala, 'Codigo': f"{sala['Codigo']}_{copia}"}
+        for copia in range(factor)
+        for sala in horarios_salas
+    ]
+
+def time_call(func, *args, repeat=3):
+    """Retorna el mejor tiempo (en segundos) y el resultado de `func`."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def benchmark(nombre, horarios_salas):
+    """Compara la construcción celda por celda con la construcción en bloque."""
+    num_asignaciones = sum(len(sala['Asignaturas']) for sala in horarios_salas)
+
+    t_loc, matriz_loc = time_call(create_occupancy_matrix_loc, horarios_salas)
+    t_bulk, matriz_bulk = time_call(create_occupancy_matrix, horarios_salas)
+
+    print(f"\n{nombre}: {len(horarios_salas)} salas, {num_asignaciones} asignaciones")
+    print(f"  .loc (9 períodos):   {t_loc * 1000:10.2f} ms  RO = {calculate_ro(matriz_loc):.4f}")
+    print(f"  bloque (45 franjas): {t_bulk * 1000:10.2f} ms  RO = {calculate_ro(matriz_bulk):.4f}")
+    print(f"  Aceleración: {t_loc / t_bulk:.1f}x")
+
+def main(filename='SPADE_Output/full/Horarios_salas.json'):
+    horarios_salas = load_json_file(filename)
+    if horarios_salas is None:
+        return
+
+    benchmark('full', horarios_salas)
+    benchmark('full x10 (sintético)', replicate_schedule(horarios_salas, 10))
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,525 @@
+import os
+import gc
+import sys
+import csv
+import glob
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+import numpy as np
+
+from rtt_reader import parse_rtt_csv
+from message_log import reconstruct_conversations
+from perfmon_reader import load_process_counters
+from Indices.Compactacion import analyze_room_compactness
+from Indices.RO import create_occupancy_matrix, calculate_ro
+from Indices.TE import calculate_te
+from Indices.RE import get_unique_courses, calculate_room_eligibility
+from Indices.SobreCapacidad import calculate_occupation_index, create_capacity_dict, create_vacancies_dict
+from Indices.EvaluacionParalela import run_paths
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS_DIR = os.path.join(CURRENT_DIR, "dataset", "scenarios")
+
+SCENARIOS = ["small", "medium", "full"]
+DEFAULT_SCALES = [10, 100]
+
+# Process whose counters each platform's Perfmon capture is read for
+PERFMON_PROCESSES = {"JADE": "java", "SPADE": "python"}
+
+SCHEDULE_BENCHMARKS = ["compactness", "ro", "te", "re", "ocupacion"]
+LOADER_BENCHMARKS = ["rtt", "message_log", "perfmon"]
+BENCHMARKS = SCHEDULE_BENCHMARKS + LOADER_BENCHMARKS
+
+DIAS = ["LUNES", "MARTES", "MIERCOLES", "JUEVES", "VIERNES"]
+BLOQUES = range(1, 10)
+
+# Candidate cost models for the empirical complexity fit
+COMPLEXITY_MODELS = {
+    "O(1)": lambda n: np.ones_like(n),
+    "O(log n)": lambda n: np.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * np.log(n),
+    "O(n^2)": lambda n: n ** 2,
+}
+
+# Relative timing noise below which two fits count as equally good
+FIT_NOISE_FLOOR = 0.05
+# A log-log slope under this (or within two standard errors of 0) is reported as O(1)
+FLAT_EXPONENT = 0.05
+
+
+class Case:
+    """One function timed on one input; ``n`` is the input size the complexity fit uses."""
+
+    __slots__ = ("benchmark", "input", "n", "func")
+
+    def __init__(self, benchmark, input, n, func):
+        self.benchmark = benchmark
+        self.input = input
+        self.n = n
+        self.func = func
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def synthesize_schedule(profesores, salas, seed=0):
+    """
+    Build ``Horarios_salas`` / ``Horarios_asignados`` lists for a scenario without running the agents.
+
+    Every subject gets ``Horas`` blocks, each in a random free slot of a room
+    of its campus with enough capacity (any room of the campus, or any room
+    at all, when none fits), without double-booking rooms or professors.
+    Blocks that find no free slot are left unassigned, as in a real run.
+    """
+    rng = random.Random(seed)
+    slots = [(dia, bloque) for dia in DIAS for bloque in BLOQUES]
+
+    by_campus = defaultdict(list)
+    for sala in salas:
+        by_campus[sala["Campus"]].append(sala)
+    ocupadas = {sala["Codigo"]: set() for sala in salas}
+    horarios_salas = {sala["Codigo"]: {"Codigo": sala["Codigo"], "Campus": sala["Campus"], "Asignaturas": []}
+                      for sala in salas}
+    horarios_asignados = []
+
+    for profesor in profesores:
+        ocupado = set()
+        asignadas = []
+        for asignatura in profesor["Asignaturas"]:
+            campus = by_campus.get(asignatura["Campus"], salas)
+            candidatas = [s for s in campus if s["Capacidad"] >= asignatura["Vacantes"]] or campus
+            for _ in range(asignatura["Horas"]):
+                sala = rng.choice(candidatas)
+                libres = [slot for slot in slots if slot not in ocupado and slot not in ocupadas[sala["Codigo"]]]
+                if not libres:
+                    continue
+                dia, bloque = rng.choice(libres)
+                ocupado.add((dia, bloque))
+                ocupadas[sala["Codigo"]].add((dia, bloque))
+                satisfaccion = rng.randint(1, 10)
+                horarios_salas[sala["Codigo"]]["Asignaturas"].append({
+                    "Nombre": asignatura["Nombre"], "Dia": dia, "Bloque": bloque,
+                    "Satisfaccion": satisfaccion, "CodigoAsignatura": asignatura["CodigoAsignatura"],
+                    "Vacantes": asignatura["Vacantes"], "Capacidad": 0,
+                })
+                asignadas.append({
+                    "Nombre": asignatura["Nombre"], "Sala": sala["Codigo"], "Dia": dia, "Bloque": bloque,
+                    "Satisfaccion": satisfaccion, "CodigoAsignatura": asignatura["CodigoAsignatura"],
+                    "Actividad": asignatura.get("Actividad", ""),
+                })
+        horarios_asignados.append({"Nombre": profesor["Nombre"], "Asignaturas": asignadas})
+
+    return list(horarios_salas.values()), horarios_asignados
+
+
+def replicate_inputs(inputs, factor):
+    """
+    Synthetic campus made of ``factor`` renamed copies of a scenario.
+
+    Rooms, professors and subject names get a ``_<copy>`` suffix so every
+    index sees ``factor`` times more distinct rooms, events and courses,
+    not the same ones repeated.
+    """
+    if factor == 1:
+        return inputs
+
+    def sufijo(value, copia):
+        return f"{value}_{copia}"
+
+    out = {"profesores": [], "salas": [], "horarios_salas": [], "horarios_asignados": []}
+    for copia in range(factor):
+        out["salas"] += [{**sala, "Codigo": sufijo(sala["Codigo"], copia)} for sala in inputs["salas"]]
+        out["profesores"] += [
+            {**profesor, "Nombre": sufijo(profesor["Nombre"], copia),
+             "Asignaturas": [{**a, "Nombre": sufijo(a["Nombre"], copia)} for a in profesor["Asignaturas"]]}
+            for profesor in inputs["profesores"]
+        ]
+        out["horarios_salas"] += [
+            {**sala, "Codigo": sufijo(sala["Codigo"], copia),
+             "Asignaturas": [{**a, "Nombre": sufijo(a["Nombre"], copia)} for a in sala["Asignaturas"]]}
+            for sala in inputs["horarios_salas"]
+        ]
+        out["horarios_asignados"] += [
+            {**profesor, "Nombre": sufijo(profesor["Nombre"], copia),
+             "Asignaturas": [{**a, "Nombre": sufijo(a["Nombre"], copia), "Sala": sufijo(a["Sala"], copia)}
+                             for a in profesor["Asignaturas"]]}
+            for profesor in inputs["horarios_asignados"]
+        ]
+    return out
+
+
+def load_schedule_inputs(platform_name, scenario, run="latest", seed=0):
+    """
+    Scenario inputs plus the schedules of a recorded run.
+
+    When ``<PLATFORM>_Output/<scenario>/<run>`` has no schedules the
+    schedules are synthesized from the scenario instead, so the suite runs
+    on a fresh checkout.
+    """
+    paths = run_paths(platform_name, scenario, run)
+    inputs = {
+        "profesores": load_json(os.path.join(SCENARIOS_DIR, scenario, "profesores.json")),
+        "salas": load_json(os.path.join(SCENARIOS_DIR, scenario, "salas.json")),
+        "source": "recorded",
+    }
+    if os.path.exists(paths["horarios_salas"]) and os.path.exists(paths["horarios_asignados"]):
+        inputs["horarios_salas"] = load_json(paths["horarios_salas"])
+        inputs["horarios_asignados"] = load_json(paths["horarios_asignados"])
+    else:
+        inputs["horarios_salas"], inputs["horarios_asignados"] = synthesize_schedule(
+            inputs["profesores"], inputs["salas"], seed)
+        inputs["source"] = "synthesized"
+    return inputs
+
+
+def schedule_cases(inputs, label, benchmarks):
+    """Cases for the index functions, timed on already loaded inputs."""
+    horarios_salas = inputs["horarios_salas"]
+    horarios_asignados = inputs["horarios_asignados"]
+    asignaciones_salas = sum(len(sala["Asignaturas"]) for sala in horarios_salas)
+    asignaciones_profesores = sum(len(p["Asignaturas"]) for p in horarios_asignados)
+    capacidades = create_capacity_dict(inputs["salas"])
+    vacantes = create_vacancies_dict(inputs["profesores"])
+    courses = get_unique_courses(inputs["profesores"])
+
+    cases = {
+        "compactness": Case("compactness", label, asignaciones_salas,
+                            lambda: analyze_room_compactness(horarios_salas)),
+        "ro": Case("ro", label, asignaciones_salas,
+                   lambda: calculate_ro(create_occupancy_matrix(horarios_salas))),
+        "te": Case("te", label, asignaciones_salas, lambda: calculate_te(horarios_salas)),
+        "re": Case("re", label, len(courses), lambda: calculate_room_eligibility(courses, inputs["salas"])),
+        "ocupacion": Case("ocupacion", label, asignaciones_profesores,
+                          lambda: calculate_occupation_index(horarios_asignados, capacidades, vacantes)),
+    }
+    return [cases[name] for name in SCHEDULE_BENCHMARKS if name in benchmarks]
+
+
+def count_rows(path):
+    """Data rows of a CSV without quoted newlines (RTT and Perfmon exports)."""
+    with open(path, "rb") as f:
+        return max(sum(block.count(b"\n") for block in iter(lambda: f.read(1 << 20), b"")) - 1, 0)
+
+
+def count_log_rows(path):
+    """Data rows of a message log, whose content column may hold quoted newlines."""
+    with open(path, "r", encoding="latin-1", newline="") as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+def replicate_csv(path, factor, output):
+    """Write the header of ``path`` once followed by its data rows ``factor`` times, byte for byte."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        body = f.read()
+    if body and not body.endswith(b"\n"):
+        body += b"\n"
+    with open(output, "wb") as f:
+        f.write(header)
+        for _ in range(factor):
+            f.write(body)
+    return output
+
+
+def replicate_message_log(path, factor, output):
+    """
+    Replicate a message log ``factor`` times with a ``_<copy>`` suffix on ``conversationId``.
+
+    Without the suffix the copies would be merged into the same
+    conversations and pairing would not scale like a bigger run. The file
+    is read and written as latin-1 so undecodable bytes survive unchanged.
+
+    Returns:
+        int: Data rows written.
+    """
+    with open(path, "r", encoding="latin-1", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = list(reader)
+    i_conv = header.index("conversationId")
+
+    with open(output, "w", encoding="latin-1", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for copia in range(factor):
+            for row in rows:
+                if len(row) > i_conv:
+                    row = row[:i_conv] + [f"{row[i_conv]}_{copia}"] + row[i_conv + 1:]
+                writer.writerow(row)
+    return len(rows) * factor
+
+
+def perfmon_path(platform_name, scenario):
+    matches = sorted(glob.glob(os.path.join(
+        CURRENT_DIR, "Perfmon", f"{platform_name}-{scenario.upper()}-NEW", "Procesos_*.csv")))
+    return matches[0] if matches else None
+
+
+def loader_cases(platform_name, scenarios, scales, benchmarks, workdir):
+    """
+    Cases for the log loaders on the recorded files of each scenario and on
+    copies of the largest one replicated ``scales`` times into ``workdir``.
+    """
+    name = platform_name.lower()
+    process = PERFMON_PROCESSES[platform_name]
+    sources = {
+        "rtt": {s: os.path.join(CURRENT_DIR, "rtt", s, f"{name}.csv") for s in scenarios},
+        "message_log": {s: os.path.join(CURRENT_DIR, "message_logs", s, f"{name}.csv") for s in scenarios},
+        "perfmon": {s: perfmon_path(platform_name, s) for s in scenarios},
+    }
+    loaders = {
+        "rtt": parse_rtt_csv,
+        "message_log": lambda path: sum(1 for _ in reconstruct_conversations(path)),
+        "perfmon": lambda path: load_process_counters(path, process=process),
+    }
+
+    cases = []
+    for benchmark in LOADER_BENCHMARKS:
+        if benchmark not in benchmarks:
+            continue
+        found = {s: path for s, path in sources[benchmark].items() if path and os.path.exists(path)}
+        if not found:
+            print(f"Skipping {benchmark}: no {name} files for {', '.join(scenarios)}", file=sys.stderr)
+            continue
+
+        inputs = [(scenario, path) for scenario, path in found.items()]
+        base_scenario, base_path = inputs[-1]
+        for factor in scales:
+            output = os.path.join(workdir, f"{benchmark}_{name}_{base_scenario}_x{factor}.csv")
+            if benchmark == "message_log":
+                replicate_message_log(base_path, factor, output)
+            else:
+                replicate_csv(base_path, factor, output)
+            inputs.append((f"{base_scenario} x{factor}", output))
+
+        for label, path in inputs:
+            n = count_log_rows(path) if benchmark == "message_log" else count_rows(path)
+            cases.append(Case(benchmark, label, n, lambda path=path, load=loaders[benchmark]: load(path)))
+    return cases
+
+
+def measure(case, repeat, budget_s, memory=True):
+    """
+    Best wall time of ``case`` over up to ``repeat`` runs, and its peak traced memory.
+
+    Runs stop early once ``budget_s`` seconds have been spent (at least one
+    always runs). Peak memory comes from a separate run under tracemalloc,
+    which slows execution, so it never overlaps the timed runs. It covers
+    Python and NumPy allocations, not buffers private to pandas' C parser.
+    """
+    times = []
+    spent = 0.0
+    while len(times) < repeat and (not times or spent < budget_s):
+        gc.collect()
+        start = time.perf_counter()
+        case.func()
+        elapsed = time.perf_counter() - start
+        times.append(elapsed)
+        spent += elapsed
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            case.func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "benchmark": case.benchmark,
+        "input": case.input,
+        "n": case.n,
+        "best_s": min(times),
+        "median_s": float(np.median(times)),
+        "runs": len(times),
+        "peak_bytes": peak,
+    }
+
+
+def fit_complexity(sizes, times):
+    """
+    Empirical complexity of a benchmark from its (size, time) points.
+
+    Each candidate in COMPLEXITY_MODELS is fitted as ``a + c * f(n)``, the
+    constant ``a`` absorbing fixed costs such as imports or header parsing,
+    and the one with the lowest BIC on the relative residuals wins: every
+    fitted parameter costs ``log(points)``, and errors under
+    FIT_NOISE_FLOOR are treated as noise, so a scaling model has to beat
+    the constant clearly and ties go to the simpler model. ``exponent`` is
+    the slope of log(time) against log(size) over all points and
+    ``tail_exponent`` the slope between the two largest inputs, where fixed
+    costs matter least; when ``exponent`` is about 0 the model is O(1)
+    whatever fits best. Needs at least three distinct sizes.
+    """
+    n = np.asarray(sizes, dtype=float)
+    t = np.asarray(times, dtype=float)
+    keep = (n > 1) & (t > 0)
+    n, t = n[keep], t[keep]
+    if len(np.unique(n)) < 3:
+        return None
+
+    order = np.argsort(n)
+    n, t = n[order], t[order]
+    log_n, log_t = np.log(n), np.log(t)
+    (exponent, intercept), cov = np.polyfit(log_n, log_t, 1, cov="unscaled")
+    residuals = log_t - (exponent * log_n + intercept)
+    exponent_stderr = np.sqrt(np.sum(residuals ** 2) / (len(n) - 2) * cov[0, 0])
+    tail_exponent = float(np.log(t[-1] / t[-2]) / np.log(n[-1] / n[-2])) if n[-1] > n[-2] else exponent
+
+    errors = {}
+    scores = {}
+    for model, cost in COMPLEXITY_MODELS.items():
+        # Least squares on relative residuals: minimize sum(((a + c * f(n)) - t) / t)^2
+        design = np.column_stack([np.ones_like(n), cost(n)]) / t[:, None]
+        if model == "O(1)":
+            design = design[:, :1]
+        coef = np.linalg.lstsq(design, np.ones_like(n), rcond=None)[0]
+        if (coef < 0).any():
+            # A negative constant or slope is not a cost; keep only the scaling term
+            design = design[:, -1:]
+            coef = np.linalg.lstsq(design, np.ones_like(n), rcond=None)[0]
+        mean_square = float(np.mean((design @ coef - 1) ** 2))
+        errors[model] = np.sqrt(mean_square)
+        scores[model] = (len(n) * np.log(max(mean_square, FIT_NOISE_FLOOR ** 2))
+                         + design.shape[1] * np.log(len(n)))
+    # On equal scores min keeps the first, i.e. simplest, model
+    model = min(scores, key=scores.get)
+    if abs(exponent) < max(FLAT_EXPONENT, 2 * exponent_stderr):
+        model = "O(1)"
+
+    return {"model": model, "exponent": round(float(exponent), 3), "tail_exponent": round(tail_exponent, 3),
+            "rms_relative_error": round(float(errors[model]), 4), "points": int(len(n))}
+
+
+def compare_with_baseline(results, baseline, threshold):
+    """
+    Time ratio of every (benchmark, input) against a previous results file.
+
+    Returns:
+        list: One row per case present in both, with ``regression`` set when
+        the best time grew by more than ``threshold`` times.
+    """
+    previous = {(r["benchmark"], r["input"]): r for r in baseline["results"]}
+    rows = []
+    for result in results:
+        old = previous.get((result["benchmark"], result["input"]))
+        if old is None:
+            continue
+        ratio = result["best_s"] / old["best_s"] if old["best_s"] else float("inf")
+        memory_ratio = (result["peak_bytes"] / old["peak_bytes"]
+                        if result.get("peak_bytes") and old.get("peak_bytes") else None)
+        rows.append({"benchmark": result["benchmark"], "input": result["input"],
+                     "baseline_s": old["best_s"], "current_s": result["best_s"],
+                     "ratio": ratio, "memory_ratio": memory_ratio, "regression": ratio > threshold})
+    return rows
+
+
+def format_bytes(value):
+    return "-" if value is None else f"{value / (1024 * 1024):.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the Indices and log loaders across input sizes.")
+    parser.add_argument("--platform", type=str.upper, choices=sorted(PERFMON_PROCESSES), default="SPADE")
+    parser.add_argument("--run", default="latest", help="Run of <PLATFORM>_Output/<scenario>/ to take schedules from")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES,
+                        help="Synthetic inputs: the last scenario replicated this many times")
+    parser.add_argument("--benchmarks", nargs="+", choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (best is reported)")
+    parser.add_argument("--budget", type=float, default=10.0,
+                        help="Stop repeating a case after this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthesized schedules")
+    parser.add_argument("--workdir", help="Keep the replicated log files here (default: a temporary directory)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Time ratio over the baseline reported as a regression")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="benchmark_suite_")
+    os.makedirs(workdir, exist_ok=True)
+
+    results = []
+    sources = {}
+    try:
+        cases = []
+        if any(name in SCHEDULE_BENCHMARKS for name in args.benchmarks):
+            inputs = None
+            for scenario in args.scenarios:
+                inputs = load_schedule_inputs(args.platform, scenario, args.run, args.seed)
+                sources[scenario] = inputs["source"]
+                cases += schedule_cases(inputs, scenario, args.benchmarks)
+            for factor in args.scales:
+                label = f"{args.scenarios[-1]} x{factor}"
+                cases += schedule_cases(replicate_inputs(inputs, factor), label, args.benchmarks)
+        cases += loader_cases(args.platform, args.scenarios, args.scales, args.benchmarks, workdir)
+
+        # Group by benchmark so the output reads as one scaling curve each
+        cases.sort(key=lambda case: BENCHMARKS.index(case.benchmark))
+        for case in cases:
+            result = measure(case, args.repeat, args.budget, memory=not args.no_memory)
+            results.append(result)
+            print(f"{case.benchmark:<12} {case.input:<12} n={case.n:>9}  "
+                  f"best {result['best_s'] * 1000:10.2f} ms  peak {format_bytes(result['peak_bytes']):>10}")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    fits = {}
+    for benchmark in BENCHMARKS:
+        points = [r for r in results if r["benchmark"] == benchmark]
+        fit = fit_complexity([r["n"] for r in points], [r["best_s"] for r in points])
+        if fit is not None:
+            fits[benchmark] = fit
+            print(f"{benchmark:<12} ~ {fit['model']:<11} (log-log slope {fit['exponent']:.2f}, "
+                  f"{fit['tail_exponent']:.2f} at the largest inputs, "
+                  f"RMS relative error {fit['rms_relative_error']:.1%})")
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "machine": platform.platform(),
+        "platform": args.platform,
+        "schedules": sources,
+        "repeat": args.repeat,
+        "results": results,
+        "complexity": fits,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        comparison = compare_with_baseline(results, baseline, args.threshold)
+        report["baseline"] = {"file": args.baseline, "threshold": args.threshold, "comparison": comparison}
+        print(f"\nAgainst {args.baseline} ({baseline.get('created', '?')}):")
+        for row in comparison:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"{row['benchmark']:<12} {row['input']:<12} {row['baseline_s'] * 1000:10.2f} ms -> "
+                  f"{row['current_s'] * 1000:10.2f} ms  x{row['ratio']:.2f}{flag}")
+        if any(row["regression"] for row in comparison):
+            status = 1
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
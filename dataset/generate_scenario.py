@@ -0,0 +1,183 @@
+import json
+import random
+import argparse
+from pathlib import Path
+
+SCENARIOS_DIR = Path(__file__).resolve().parent / "scenarios"
+
+# Subject fields sampled independently from their empirical distribution
+SUBJECT_FIELDS = ["Nivel", "Horas", "Vacantes", "Campus", "Actividad"]
+
+
+class EmpiricalDistributions:
+    """
+    Empirical distributions of a reference scenario.
+
+    Each field keeps the raw list of observed values, so ``rng.choice``
+    reproduces the observed frequencies exactly. Room capacities are kept
+    per campus so a generated room keeps a realistic campus/capacity pair.
+    """
+
+    def __init__(self, profesores, salas):
+        self.subjects_per_professor = [len(p["Asignaturas"]) for p in profesores]
+        subjects = [a for p in profesores for a in p["Asignaturas"]]
+        self.subject_values = {field: [a[field] for a in subjects] for field in SUBJECT_FIELDS}
+        self.subject_names = sorted({a["Nombre"] for a in subjects})
+        self.room_campus = [s["Campus"] for s in salas]
+        self.capacity_by_campus = {}
+        for sala in salas:
+            self.capacity_by_campus.setdefault(sala["Campus"], []).append(sala["Capacidad"])
+        self.rooms_per_professor = len(salas) / len(profesores)
+
+    @classmethod
+    def from_scenario(cls, scenario="full", scenarios_dir=SCENARIOS_DIR):
+        scenario_dir = Path(scenarios_dir) / scenario
+        with open(scenario_dir / "profesores.json", "r", encoding="utf-8") as f:
+            profesores = json.load(f)
+        with open(scenario_dir / "salas.json", "r", encoding="utf-8") as f:
+            salas = json.load(f)
+        return cls(profesores, salas)
+
+
+def rut_check_digit(number):
+    """Chilean RUT verification digit (modulo 11)."""
+    total = 0
+    factor = 2
+    while number:
+        total += (number % 10) * factor
+        number //= 10
+        factor = factor + 1 if factor < 7 else 2
+    digit = 11 - total % 11
+    return {11: "0", 10: "K"}.get(digit, str(digit))
+
+
+def generate_professors(dist, count, rng):
+    """
+    Yield ``count`` professors one at a time.
+
+    Args:
+        dist (EmpiricalDistributions): Reference distributions.
+        count (int): Number of professors.
+        rng (random.Random): Seeded generator.
+    """
+    values = dist.subject_values
+    subject_id = 0
+    for turno in range(count):
+        rut = 10_000_000 + turno
+        asignaturas = []
+        for _ in range(rng.choice(dist.subjects_per_professor)):
+            asignaturas.append({
+                "CodigoAsignatura": f"(SYN{subject_id:06d}-A)",
+                "Nombre": rng.choice(dist.subject_names),
+                "Nivel": rng.choice(values["Nivel"]),
+                "Paralelo": "A",
+                "Horas": rng.choice(values["Horas"]),
+                "Vacantes": rng.choice(values["Vacantes"]),
+                "Campus": rng.choice(values["Campus"]),
+                "Actividad": rng.choice(values["Actividad"]),
+            })
+            subject_id += 1
+        yield {
+            "RUT": f"{rut}-{rut_check_digit(rut)}",
+            # Names are truncated to 18 characters in the original data
+            "Nombre": f"PROFESOR {turno:06d}"[:18],
+            "Turno": turno,
+            "Asignaturas": asignaturas,
+        }
+
+
+def generate_rooms(dist, count, rng):
+    """
+    Yield ``count`` rooms; ``Turno`` is a random permutation as in ``salas.json``.
+    """
+    turnos = list(range(count))
+    rng.shuffle(turnos)
+    for i, turno in enumerate(turnos):
+        campus = rng.choice(dist.room_campus)
+        yield {
+            "Turno": turno,
+            "Codigo": f"SYN{i:06d}",
+            "Capacidad": rng.choice(dist.capacity_by_campus[campus]),
+            "Campus": campus,
+        }
+
+
+def write_json_array(items, output_file, indent=2):
+    """
+    Write an iterable as a JSON array one element at a time.
+
+    The output has the same layout as ``json.dump(..., indent=2)`` but only
+    one element is held in memory at a time.
+
+    Returns:
+        int: Number of elements written.
+    """
+    count = 0
+    pad = " " * indent
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write("[")
+        for item in items:
+            f.write(",\n" if count else "\n")
+            encoded = json.dumps(item, indent=indent, ensure_ascii=False)
+            f.write(pad + encoded.replace("\n", "\n" + pad))
+            count += 1
+        f.write("\n]" if count else "]")
+    return count
+
+
+def generate_scenario(name, professors, rooms=None, seed=0, reference="full",
+                      scenarios_dir=SCENARIOS_DIR, reference_dir=None):
+    """
+    Build ``profesores.json``, ``salas.json`` and ``scenario_info.json`` for a synthetic scenario.
+
+    Args:
+        name (str): Scenario directory name under ``scenarios_dir``.
+        professors (int): Number of professors.
+        rooms (int): Number of rooms; defaults to the reference rooms/professor ratio.
+        seed (int): Seed; the same seed and sizes give byte-identical files.
+        reference (str): Scenario whose distributions are sampled.
+        scenarios_dir (str): Directory the new scenario is written into.
+        reference_dir (str): Directory holding ``reference``; defaults to ``scenarios_dir``.
+
+    Returns:
+        dict: The scenario_info written.
+    """
+    dist = EmpiricalDistributions.from_scenario(reference, reference_dir or scenarios_dir)
+    if rooms is None:
+        rooms = max(1, round(professors * dist.rooms_per_professor))
+
+    output_dir = Path(scenarios_dir) / name
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Separate streams so the professors don't change when only the room count does
+    write_json_array(generate_professors(dist, professors, random.Random(f"{seed}:profesores")),
+                     output_dir / "profesores.json")
+    write_json_array(generate_rooms(dist, rooms, random.Random(f"{seed}:salas")),
+                     output_dir / "salas.json")
+
+    info = {
+        "name": name,
+        "professor_count": professors,
+        "classroom_count": rooms,
+        "description": f"Synthetic scenario sampled from '{reference}' (seed {seed})",
+    }
+    with open(output_dir / "scenario_info.json", "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+    return info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic scenario at arbitrary scale.")
+    parser.add_argument("professors", type=int, help="Number of professors (e.g. 1000, 10000, 100000)")
+    parser.add_argument("--name", help="Scenario name (default: synthetic_<professors>)")
+    parser.add_argument("--rooms", type=int, help="Number of rooms (default: same ratio as the reference)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reference", default="full", help="Scenario to sample distributions from")
+    parser.add_argument("--scenarios-dir", default=SCENARIOS_DIR, help="Directory to write the scenario into")
+    parser.add_argument("--reference-dir", help="Directory holding the reference (default: --scenarios-dir)")
+    args = parser.parse_args()
+
+    info = generate_scenario(args.name or f"synthetic_{args.professors}", args.professors,
+                             args.rooms, args.seed, args.reference, args.scenarios_dir, args.reference_dir)
+    print(f"Generated {info['name']}: {info['professor_count']} professors, "
+          f"{info['classroom_count']} rooms")
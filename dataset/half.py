@@ -1,63 +1,45 @@
 import json
 import math
 
+from stream_json import JsonArrayReader, JsonArrayWriter, FirstN, detect_encoding, known_count, sample_json_file
+
 def split_json_file(input_file, output_file):
     """
     Splits a JSON file in half and saves the first half to a new file.
     Handles UTF-8 and other character encodings.
-    
+
+    The file is streamed (see stream_json.py), so only one element is in
+    memory at a time; the encoding is detected once from the first bytes.
+
     Args:
         input_file (str): Path to the input JSON file
         output_file (str): Path where the output JSON file will be saved
     """
     try:
-        # Read the input JSON file with UTF-8 encoding
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Handle different JSON structures
-        if isinstance(data, list):
-            # If it's a list, split by length
-            halfway = math.ceil(len(data) / 2)
-            first_half = data[:halfway]
-        elif isinstance(data, dict):
+        encoding = detect_encoding(input_file)
+        reader = JsonArrayReader(input_file, encoding)
+
+        total = known_count(input_file)
+        if total is None:
+            total = sum(1 for _ in reader)
+        halfway = math.ceil(total / 2)
+
+        if reader.kind is dict:
             # If it's a dictionary, split by number of keys
-            keys = list(data.keys())
-            halfway = math.ceil(len(keys) / 2)
-            first_half = {k: data[k] for k in keys[:halfway]}
-        else:
-            raise ValueError("JSON must contain either a list or dictionary")
-            
-        # Write the first half to the output file with UTF-8 encoding
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(first_half, f, indent=4, ensure_ascii=False)
-            
-        print(f"Successfully split JSON file. First half saved to {output_file}")
-        
-    except UnicodeDecodeError:
-        # If UTF-8 fails, try with a different encoding
-        try:
-            with open(input_file, 'r', encoding='latin-1') as f:
-                data = json.load(f)
-                
-            if isinstance(data, list):
-                halfway = math.ceil(len(data) / 2)
-                first_half = data[:halfway]
-            elif isinstance(data, dict):
-                keys = list(data.keys())
-                halfway = math.ceil(len(keys) / 2)
-                first_half = {k: data[k] for k in keys[:halfway]}
-            else:
-                raise ValueError("JSON must contain either a list or dictionary")
-                
+            first_half = {}
+            for index, (key, value) in enumerate(reader):
+                if index >= halfway:
+                    break
+                first_half[key] = value
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(first_half, f, indent=4, ensure_ascii=False)
-                
-            print(f"Successfully split JSON file using latin-1 encoding. First half saved to {output_file}")
-            
-        except Exception as e:
-            print(f"Error: Failed to process file with both UTF-8 and latin-1 encodings: {str(e)}")
-            
+        else:
+            # If it's a list, split by length
+            with JsonArrayWriter(output_file, indent=4) as writer:
+                sample_json_file(input_file, [FirstN(writer, halfway)], encoding)
+
+        print(f"Successfully split JSON file using {encoding} encoding. First half saved to {output_file}")
+
     except FileNotFoundError:
         print(f"Error: Could not find input file '{input_file}'")
     except json.JSONDecodeError:
@@ -68,4 +50,4 @@ def split_json_file(input_file, output_file):
 # Example usage
 if __name__ == "__main__":
     split_json_file("inputOfProfesores.json", "last_half_profesores.json")
-    split_json_file("inputOfSala.json", "last_half_salas.json")
\ No newline at end of file
+    split_json_file("inputOfSala.json", "last_half_salas.json")
@@ -0,0 +1,363 @@
+import re
+import json
+import codecs
+import random
+import argparse
+from collections import Counter, deque
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 20
+ENCODING_PREFIX_SIZE = 1 << 16
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that can extend a number raw_decode already accepted (``1`` -> ``1.5``, ``7`` -> ``7e5``)
+NUMBER_CONTINUATION = frozenset("0123456789.eE+-")
+
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def detect_encoding(input_file, prefix_size=ENCODING_PREFIX_SIZE):
+    """
+    Detect the encoding of a JSON file from its first bytes.
+
+    A BOM wins; otherwise the prefix is decoded as UTF-8 (a multi-byte
+    character cut at the end of the prefix is fine) and anything that is not
+    valid UTF-8 is treated as latin-1, which the old half.py fell back to.
+    """
+    with open(input_file, "rb") as f:
+        prefix = f.read(prefix_size)
+    for bom, encoding in BOMS:
+        if prefix.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+class JsonArrayReader:
+    """
+    Incremental reader of a top-level JSON array or object.
+
+    The file is decoded in chunks and each element is parsed with
+    ``JSONDecoder.raw_decode`` as soon as it is complete, so memory is
+    bounded by the chunk size plus the largest single element.
+
+    Iterating yields the array elements, or ``(key, value)`` pairs for an object.
+    """
+
+    def __init__(self, input_file, encoding=None, chunk_size=CHUNK_SIZE):
+        self.input_file = input_file
+        self.encoding = encoding or detect_encoding(input_file)
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.kind = self.detect_kind()
+
+    def detect_kind(self):
+        """``list`` or ``dict`` from the first non-blank character of the file."""
+        with open(self.input_file, "r", encoding=self.encoding) as f:
+            while True:
+                chunk = f.read(4096)
+                if not chunk:
+                    return None
+                stripped = chunk.lstrip()
+                if stripped:
+                    return {"[": list, "{": dict}.get(stripped[0])
+
+    def __iter__(self):
+        with open(self.input_file, "rb") as f:
+            text_decoder = codecs.getincrementaldecoder(self.encoding)()
+            self.file = f
+            self.text_decoder = text_decoder
+            self.buffer = ""
+            self.pos = 0
+            self.eof = False
+
+            opening = self.next_char()
+            if opening not in "[{":
+                raise ValueError("JSON must contain either a list or dictionary")
+            closing = "]" if opening == "[" else "}"
+
+            if self.peek_char() == closing:
+                return
+            while True:
+                if self.kind is dict:
+                    key = self.decode_value()
+                    if self.next_char() != ":":
+                        raise ValueError(f"Expected ':' after key {key!r}")
+                    yield key, self.decode_value()
+                else:
+                    yield self.decode_value()
+
+                separator = self.next_char()
+                if separator == closing:
+                    return
+                if separator != ",":
+                    raise ValueError(f"Expected ',' or '{closing}', found {separator!r}")
+
+    def fill(self):
+        """Append the next chunk to the buffer; returns False at end of file."""
+        if self.eof:
+            return False
+        data = self.file.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            self.buffer += self.text_decoder.decode(b"", final=True)
+            return False
+        # Drop what was already consumed before growing the buffer
+        self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(data)
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def peek_char(self):
+        self.skip_whitespace()
+        if self.pos >= len(self.buffer):
+            raise ValueError("Unexpected end of JSON input")
+        return self.buffer[self.pos]
+
+    def next_char(self):
+        char = self.peek_char()
+        self.pos += 1
+        return char
+
+    def decode_value(self):
+        self.skip_whitespace()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Element cut by the chunk boundary
+                if not self.fill():
+                    raise
+                continue
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                # A number cut by the chunk boundary decodes as its prefix (``1.`` -> 1, ``7e`` -> 7)
+                if (end == len(self.buffer) or self.buffer[end] in NUMBER_CONTINUATION) and self.fill():
+                    continue
+            elif end == len(self.buffer) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+class JsonArrayWriter:
+    """
+    Write a JSON array one element at a time with the layout of ``json.dump(..., indent=indent)``.
+    """
+
+    def __init__(self, output_file, indent=2):
+        self.output_file = output_file
+        self.indent = indent
+        self.count = 0
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.output_file, "w", encoding="utf-8")
+        self.file.write("[")
+        return self
+
+    def __exit__(self, *exc):
+        self.file.write("\n]" if self.count else "]")
+        self.file.close()
+
+    def write(self, item):
+        pad = " " * self.indent
+        encoded = json.dumps(item, indent=self.indent, ensure_ascii=False)
+        self.file.write(",\n" if self.count else "\n")
+        self.file.write(pad + encoded.replace("\n", "\n" + pad))
+        self.count += 1
+
+
+def campus_of(item):
+    """Campus of a room, or the most common campus among a professor's subjects."""
+    if "Campus" in item:
+        return item["Campus"]
+    campuses = Counter(a.get("Campus") for a in item.get("Asignaturas", []))
+    return campuses.most_common(1)[0][0] if campuses else None
+
+
+class FirstN:
+    """Keep the first ``n`` elements, streaming them straight to the output."""
+
+    def __init__(self, writer, n):
+        self.writer = writer
+        self.n = n
+
+    def offer(self, index, item):
+        if index < self.n:
+            self.writer.write(item)
+
+    def finish(self):
+        pass
+
+
+class LastN:
+    """Keep the last ``n`` elements; memory is bounded by ``n``."""
+
+    def __init__(self, writer, n):
+        self.writer = writer
+        self.items = deque(maxlen=n)
+
+    def offer(self, index, item):
+        self.items.append(item)
+
+    def finish(self):
+        for item in self.items:
+            self.writer.write(item)
+
+
+class Stratified:
+    """
+    Keep ``fraction`` of the elements of each campus, in input order.
+
+    Systematic sampling per stratum: the i-th element of a campus is kept
+    when ``floor((i + 1) * fraction)`` increases, so each campus keeps
+    exactly its proportional share without buffering anything.
+    """
+
+    def __init__(self, writer, fraction, key=campus_of):
+        self.writer = writer
+        self.fraction = fraction
+        self.key = key
+        self.seen = Counter()
+
+    def offer(self, index, item):
+        stratum = self.key(item)
+        i = self.seen[stratum]
+        self.seen[stratum] = i + 1
+        if int((i + 1) * self.fraction) > int(i * self.fraction):
+            self.writer.write(item)
+
+    def finish(self):
+        pass
+
+
+class RandomK:
+    """Uniform random sample of ``k`` elements (reservoir sampling), written in input order."""
+
+    def __init__(self, writer, k, seed=None):
+        self.writer = writer
+        self.k = k
+        self.rng = random.Random(seed)
+        self.reservoir = []
+
+    def offer(self, index, item):
+        if len(self.reservoir) < self.k:
+            self.reservoir.append((index, item))
+            return
+        j = self.rng.randint(0, index)
+        if j < self.k:
+            self.reservoir[j] = (index, item)
+
+    def finish(self):
+        for _, item in sorted(self.reservoir, key=lambda pair: pair[0]):
+            self.writer.write(item)
+
+
+def count_elements(input_file, encoding=None):
+    """Number of elements in a top-level array (one streaming pass)."""
+    return sum(1 for _ in JsonArrayReader(input_file, encoding))
+
+
+def known_count(input_file):
+    """
+    Element count from the ``scenario_info.json`` next to the file, if any.
+
+    Lets ``first-half`` run in a single pass on generated scenarios.
+    """
+    input_file = Path(input_file)
+    info_file = input_file.parent / "scenario_info.json"
+    field = {"profesores.json": "professor_count", "salas.json": "classroom_count"}.get(input_file.name)
+    if field is None or not info_file.exists():
+        return None
+    with open(info_file, "r", encoding="utf-8") as f:
+        return json.load(f).get(field)
+
+
+def sample_json_file(input_file, samplers, encoding=None):
+    """
+    Feed every element of a JSON array to several samplers in a single pass.
+
+    Args:
+        input_file (str): Path to the input JSON array.
+        samplers (list): Objects with ``offer(index, item)`` and ``finish()``.
+
+    Returns:
+        int: Number of elements read.
+    """
+    reader = JsonArrayReader(input_file, encoding)
+    if reader.kind is not list:
+        raise ValueError("Sampling needs a top-level JSON array")
+    count = 0
+    for index, item in enumerate(reader):
+        for sampler in samplers:
+            sampler.offer(index, item)
+        count += 1
+    for sampler in samplers:
+        sampler.finish()
+    return count
+
+
+def first_half_size(input_file, encoding=None):
+    total = known_count(input_file)
+    if total is None:
+        total = count_elements(input_file, encoding)
+    return (total + 1) // 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Cut profesores.json/salas.json into subsets in one streaming pass.")
+    parser.add_argument("input_file")
+    parser.add_argument("--first-half", metavar="OUTPUT")
+    parser.add_argument("--first", nargs=2, metavar=("N", "OUTPUT"))
+    parser.add_argument("--last", nargs=2, metavar=("N", "OUTPUT"))
+    parser.add_argument("--stratified", nargs=2, metavar=("FRACTION", "OUTPUT"),
+                        help="Keep FRACTION of each campus")
+    parser.add_argument("--random", nargs=2, metavar=("K", "OUTPUT"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--indent", type=int, default=2)
+    args = parser.parse_args()
+
+    encoding = detect_encoding(args.input_file)
+    writers = []
+    samplers = []
+
+    def add(sampler_class, output, *params):
+        writer = JsonArrayWriter(output, args.indent).__enter__()
+        writers.append(writer)
+        samplers.append(sampler_class(writer, *params))
+
+    if args.first_half:
+        add(FirstN, args.first_half, first_half_size(args.input_file, encoding))
+    if args.first:
+        add(FirstN, args.first[1], int(args.first[0]))
+    if args.last:
+        add(LastN, args.last[1], int(args.last[0]))
+    if args.stratified:
+        add(Stratified, args.stratified[1], float(args.stratified[0]))
+    if args.random:
+        add(RandomK, args.random[1], int(args.random[0]), args.seed)
+    if not samplers:
+        parser.error("Choose at least one subset")
+
+    try:
+        total = sample_json_file(args.input_file, samplers, encoding)
+    finally:
+        for writer in writers:
+            writer.__exit__(None, None, None)
+    print(f"Read {total} elements ({encoding})")
+    for writer in writers:
+        print(f"  {writer.count} -> {writer.output_file}")
@@ -0,0 +1,218 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+import argparse
+from datetime import datetime
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE = os.path.join(CURRENT_DIR, "runs")
+
+PLATFORMS = ["JADE", "SPADE"]
+SCENARIOS = ["small", "medium", "full"]
+
+# kind -> (subdirectory inside <PLATFORM>_Output, file prefix)
+KINDS = {
+    "rtt": ("rtt_logs", "rtt_measurements"),
+    "message_logs": ("message_logs", "agent_messages"),
+}
+
+RUN_ID_PATTERN = re.compile(r"(\d{8}_\d{6})")
+RUN_ID_FORMAT = "%Y%m%d_%H%M%S"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def run_id_for(filename, digest):
+    """Run id from the ``YYYYMMDD_HHMMSS`` part of the file name, or the hash if missing."""
+    match = RUN_ID_PATTERN.search(filename)
+    return match.group(1) if match else digest[:16]
+
+
+class Manifest:
+    """
+    Append-only record of every ingested run file.
+
+    Each line of ``manifest.jsonl`` holds the source path, size, mtime,
+    hash and where the file was stored. The last line for a path wins, so
+    updates are appended instead of rewriting the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.hashes = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._remember(json.loads(line))
+
+    def _remember(self, entry):
+        self.entries[entry["source"]] = entry
+        self.hashes[entry["sha256"]] = entry
+
+    def is_unchanged(self, source, stat):
+        entry = self.entries.get(source)
+        return (entry is not None
+                and entry["size"] == stat.st_size
+                and entry["mtime_ns"] == stat.st_mtime_ns)
+
+    def add(self, entry):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._remember(entry)
+
+
+def iter_run_files(source_root, kind, platforms=PLATFORMS, scenarios=SCENARIOS):
+    """Yield (platform, scenario, DirEntry) for every run file of a kind."""
+    subdir, prefix = KINDS[kind]
+    for platform in platforms:
+        for scenario in scenarios:
+            directory = os.path.join(source_root, f"{platform}_Output", subdir, scenario)
+            if not os.path.isdir(directory):
+                continue
+            name_prefix = f"{prefix}_{scenario}_"
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.startswith(name_prefix) and entry.name.endswith(".csv") and entry.is_file():
+                        yield platform, scenario, entry
+
+
+def ingest(kind, source_root=CURRENT_DIR, store=DEFAULT_STORE,
+           platforms=PLATFORMS, scenarios=SCENARIOS):
+    """
+    Copy new run files of one kind into the partitioned store.
+
+    Files are stored as
+    ``<store>/<kind>/platform=<P>/scenario=<s>/run_id=<id>/<file>``. Files
+    whose size and mtime match the manifest are skipped without reading
+    them, so re-running over an unchanged archive only costs a directory
+    listing.
+
+    Returns:
+        list: Manifest entries for the files ingested in this call.
+    """
+    manifest = Manifest(os.path.join(store, "manifest.jsonl"))
+    ingested = []
+
+    for platform, scenario, entry in iter_run_files(source_root, kind, platforms, scenarios):
+        source = os.path.abspath(entry.path)
+        stat = entry.stat()
+        if manifest.is_unchanged(source, stat):
+            continue
+
+        digest = file_hash(source)
+        previous = manifest.entries.get(source)
+        duplicate = manifest.hashes.get(digest)
+
+        if previous is not None and previous["sha256"] == digest:
+            # Only the metadata changed (e.g. touched), keep the stored copy
+            target = previous["stored_as"]
+        elif duplicate is not None and duplicate["kind"] == kind:
+            # Same content already ingested from another path
+            target = duplicate["stored_as"]
+        else:
+            run_id = run_id_for(entry.name, digest)
+            partition = os.path.join(kind, f"platform={platform}", f"scenario={scenario}", f"run_id={run_id}")
+            target = os.path.join(partition, entry.name)
+            os.makedirs(os.path.join(store, partition), exist_ok=True)
+            shutil.copy2(source, os.path.join(store, target))
+            print(f"Ingested {source} -> {target}")
+
+        record = {
+            "source": source,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": digest,
+            "kind": kind,
+            "platform": platform,
+            "scenario": scenario,
+            "stored_as": target,
+        }
+        manifest.add(record)
+        ingested.append(record)
+
+    return ingested
+
+
+def stored_runs(kind, store=DEFAULT_STORE, platform=None, scenario=None):
+    """List stored run files of a kind as (platform, scenario, run_id, path) tuples."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown run kind {kind!r}; expected one of {', '.join(KINDS)}")
+    runs = []
+    base = os.path.join(store, kind)
+    if not os.path.isdir(base):
+        return runs
+
+    for platform_dir in sorted(os.listdir(base)):
+        p = platform_dir.split("=", 1)[-1]
+        if platform is not None and p != platform.upper():
+            continue
+        for scenario_dir in sorted(os.listdir(os.path.join(base, platform_dir))):
+            s = scenario_dir.split("=", 1)[-1]
+            if scenario is not None and s != scenario:
+                continue
+            scenario_path = os.path.join(base, platform_dir, scenario_dir)
+            for run_dir in sorted(os.listdir(scenario_path)):
+                run_path = os.path.join(scenario_path, run_dir)
+                for name in sorted(os.listdir(run_path)):
+                    runs.append((p, s, run_dir.split("=", 1)[-1], os.path.join(run_path, name)))
+    return runs
+
+
+def latest_run(kind, store=DEFAULT_STORE, platform=None, scenario=None):
+    """
+    Most recent stored run file of a kind, or None.
+
+    Runs whose id is a ``YYYYMMDD_HHMMSS`` timestamp are ordered by it
+    (local time, as the platforms write it), since copying or touching a
+    file changes its mtime but not when the run happened. Runs with a hash
+    id fall back to the source file's mtime recorded in the manifest.
+    """
+    runs = stored_runs(kind, store, platform, scenario)
+    if not runs:
+        return None
+
+    manifest = Manifest(os.path.join(store, "manifest.jsonl"))
+    recorded = {}
+    for entry in manifest.entries.values():
+        path = os.path.normpath(os.path.join(store, entry["stored_as"]))
+        recorded[path] = max(recorded.get(path, 0), entry["mtime_ns"])
+
+    def recency(run):
+        if RUN_ID_PATTERN.fullmatch(run[2]):
+            return datetime.strptime(run[2], RUN_ID_FORMAT).timestamp() * 1e9
+        path = os.path.normpath(run[3])
+        mtime_ns = recorded.get(path)
+        return mtime_ns if mtime_ns is not None else os.stat(path).st_mtime_ns
+
+    return max(runs, key=recency)[3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally ingest JADE/SPADE run files.")
+    parser.add_argument("--kind", choices=[*KINDS, "all"], default="all")
+    parser.add_argument("--source-root", default=CURRENT_DIR,
+                        help="Directory containing JADE_Output/ and SPADE_Output/")
+    parser.add_argument("--store", default=DEFAULT_STORE)
+    args = parser.parse_args()
+
+    kinds = list(KINDS) if args.kind == "all" else [args.kind]
+    for kind in kinds:
+        ingested = ingest(kind, args.source_root, args.store)
+        print(f"{kind}: {len(ingested)} new or changed files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+import csv
+import sys
+import argparse
+from collections import deque
+from datetime import date
+
+from Indices.Instrumentacion import instrumentar
+
+MESSAGE_LOG_COLUMNS = [
+    "timestamp", "agent", "agentAction", "sender", "receivers",
+    "performative", "conversationId", "content", "sequenceId",
+]
+
+CONVERSATION_COLUMNS = [
+    "conversation_id", "initiator", "start", "end", "duration_ms",
+    "sent", "received", "matched", "unmatched_sends", "unmatched_receives",
+    "latency_mean_ms", "latency_max_ms", "fan_out",
+    "cfp", "propose", "accept_proposal", "refuse", "inform",
+    "rounds", "completed_rounds",
+]
+
+
+class AgentNames:
+    """
+    Interned agent name normalization shared by both platforms.
+
+    JADE logs local names (``SalaCM3``) while SPADE logs JIDs
+    (``salacm3@localhost``) in sender/receivers and local names in ``agent``.
+    Names are keyed by the lowercase local part, and each raw spelling is
+    resolved once and then served from a dict. The canonical name is the
+    first spelling with upper case letters, so both logs use ``SalaCM3``.
+
+    The canonical spelling of a name can change partway through a log (a
+    ``salacm3@localhost`` seen before any ``SalaCM3``), so anything joined
+    or grouped across rows must use ``key``; ``canonical`` is for output.
+    """
+
+    def __init__(self):
+        self.by_raw = {}
+        self.by_key = {}
+        self.keys = {}
+
+    def key(self, raw):
+        """Stable lowercase local part of a raw name."""
+        key = self.keys.get(raw)
+        if key is None:
+            self.canonical(raw)
+            key = self.keys[raw]
+        return key
+
+    def spelling(self, key):
+        """Current canonical spelling of a ``key``."""
+        return self.by_key[key]
+
+    def canonical(self, raw):
+        name = self.by_raw.get(raw)
+        if name is not None:
+            return name
+
+        local = raw.strip().split("@", 1)[0]
+        key = sys.intern(local.lower())
+        self.keys[raw] = key
+        previous = self.by_key.get(key)
+        if previous is None:
+            name = self.by_key[key] = sys.intern(local)
+        elif previous == key and local != key:
+            # Prefer a cased spelling (SalaCM3) over a lowercase JID part seen first,
+            # and re-point the spellings already resolved to it
+            name = self.by_key[key] = sys.intern(local)
+            for r, n in self.by_raw.items():
+                if n == previous:
+                    self.by_raw[r] = name
+        else:
+            name = previous
+        self.by_raw[raw] = name
+        return name
+
+
+def normalize_performative(performative):
+    """``accept-proposal`` (SPADE) and ``ACCEPT_PROPOSAL`` (JADE) -> ``ACCEPT_PROPOSAL``."""
+    return performative.strip().upper().replace("-", "_")
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+MS_PER_DAY = 86_400_000
+
+# "YYYY-MM-DD" -> epoch milliseconds of its midnight; a run spans a handful of dates
+_day_start_ms = {}
+
+
+def parse_timestamp_ms(timestamp):
+    """
+    ``2025-05-29 10:52:58.353`` -> milliseconds since the Unix epoch.
+
+    The log's wall-clock time is taken as-is (no time zone). The date is
+    converted once per distinct day and cached, and the time is sliced
+    from the fixed-width string, which is much cheaper than
+    datetime.strptime per row.
+    """
+    day = timestamp[:10]
+    start = _day_start_ms.get(day)
+    if start is None:
+        start = _day_start_ms[day] = (date.fromisoformat(day).toordinal() - EPOCH_ORDINAL) * MS_PER_DAY
+    hours, minutes, seconds = timestamp[11:].split(":")
+    return start + (int(hours) * 60 + int(minutes)) * 60_000 + float(seconds) * 1000
+
+
+class Conversation:
+    """Running aggregates of one conversation."""
+
+    __slots__ = (
+        "conversation_id", "initiator", "start", "end", "sent", "received",
+        "matched", "latency_sum", "latency_max", "receivers", "counts",
+        "rounds", "completed_rounds", "in_cfp", "round_accepted",
+        "start_text", "end_text",
+    )
+
+    def __init__(self, conversation_id, ts, ts_text):
+        self.conversation_id = conversation_id
+        self.initiator = None
+        self.start = ts
+        self.end = ts
+        self.start_text = ts_text
+        self.end_text = ts_text
+        self.sent = 0
+        self.received = 0
+        self.matched = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.receivers = set()
+        self.counts = {}
+        self.rounds = 0
+        self.completed_rounds = 0
+        self.in_cfp = False
+        self.round_accepted = False
+
+    def on_send(self, sender, receiver, performative):
+        self.sent += 1
+        self.counts[performative] = self.counts.get(performative, 0) + 1
+        if performative == "CFP":
+            if self.initiator is None:
+                self.initiator = sender
+            self.receivers.add(receiver)
+            if not self.in_cfp:
+                # A CFP after any other performative opens a new CFP->PROPOSE->ACCEPT round
+                self.rounds += 1
+                self.in_cfp = True
+                self.round_accepted = False
+        else:
+            self.in_cfp = False
+            if performative == "ACCEPT_PROPOSAL" and not self.round_accepted and self.rounds:
+                self.completed_rounds += 1
+                self.round_accepted = True
+
+    def on_match(self, latency):
+        self.matched += 1
+        self.latency_sum += latency
+        if latency > self.latency_max:
+            self.latency_max = latency
+
+    def record(self, unmatched_sends=0, unmatched_receives=0):
+        return {
+            "conversation_id": self.conversation_id,
+            "initiator": self.initiator or "",
+            "start": self.start_text,
+            "end": self.end_text,
+            "duration_ms": round(self.end - self.start, 3),
+            "sent": self.sent,
+            "received": self.received,
+            "matched": self.matched,
+            "unmatched_sends": unmatched_sends,
+            "unmatched_receives": unmatched_receives,
+            "latency_mean_ms": round(self.latency_sum / self.matched, 3) if self.matched else "",
+            "latency_max_ms": round(self.latency_max, 3) if self.matched else "",
+            "fan_out": len(self.receivers),
+            "cfp": self.counts.get("CFP", 0),
+            "propose": self.counts.get("PROPOSE", 0),
+            "accept_proposal": self.counts.get("ACCEPT_PROPOSAL", 0),
+            "refuse": self.counts.get("REFUSE", 0),
+            "inform": self.counts.get("INFORM", 0),
+            "rounds": self.rounds,
+            "completed_rounds": self.completed_rounds,
+        }
+
+
+def iter_events(path):
+    """Stream the rows of a JADE or SPADE message log without loading it."""
+    # The content column holds serialized Java objects and latin-1 text;
+    # undecodable bytes are replaced consistently, which is all pairing needs
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        index = {name: header.index(name) for name in MESSAGE_LOG_COLUMNS if name in header}
+        i_ts, i_action, i_sender = index["timestamp"], index["agentAction"], index["sender"]
+        i_receivers, i_perf, i_conv = index["receivers"], index["performative"], index["conversationId"]
+        for row in reader:
+            if len(row) <= i_conv:
+                continue
+            yield row[i_ts], row[i_action], row[i_sender], row[i_receivers], row[i_perf], row[i_conv]
+
+
+# Items of _reconstruct: a matched message or a finished conversation
+PAIR, CONVERSATION = 0, 1
+
+
+def _reconstruct(path, names, idle_timeout_ms, with_pairs):
+    """Shared pass of reconstruct_conversations and iter_pairs, yielding (PAIR | CONVERSATION, item)."""
+    names = names or AgentNames()
+    name_key, spelling = names.key, names.spelling
+    perf_cache = {}
+
+    conversations = {}
+    pending_sends = {}
+    pending_receives = {}
+    # Per conversation, the join keys that currently hold pending events
+    open_keys = {}
+    last_flush = None
+
+    def close(conversation_id):
+        conversation = conversations.pop(conversation_id)
+        lost_sends = lost_receives = 0
+        for key in open_keys.pop(conversation_id, ()):
+            lost_sends += len(pending_sends.pop(key, ()))
+            lost_receives += len(pending_receives.pop(key, ()))
+        record = conversation.record(lost_sends, lost_receives)
+        if record["initiator"]:
+            record["initiator"] = spelling(record["initiator"])
+        return record
+
+    for ts_text, action, sender, receiver, performative, conversation_id in iter_events(path):
+        try:
+            ts = parse_timestamp_ms(ts_text)
+        except ValueError:
+            continue
+        # Join on the lowercase keys: the canonical spelling may still change
+        sender = name_key(sender)
+        receiver = name_key(receiver)
+        perf = perf_cache.get(performative)
+        if perf is None:
+            perf = perf_cache[performative] = normalize_performative(performative)
+
+        conversation = conversations.get(conversation_id)
+        if conversation is None:
+            conversation = conversations[conversation_id] = Conversation(conversation_id, ts, ts_text)
+        if ts < conversation.start:
+            conversation.start, conversation.start_text = ts, ts_text
+        if ts > conversation.end:
+            conversation.end, conversation.end_text = ts, ts_text
+
+        key = (conversation_id, perf, sender, receiver)
+        if action == "SEND":
+            conversation.on_send(sender, receiver, perf)
+            waiting, mine = pending_receives, pending_sends
+        elif action == "RECEIVE":
+            conversation.received += 1
+            waiting, mine = pending_sends, pending_receives
+        else:
+            continue
+
+        queue = waiting.get(key)
+        if queue:
+            other_ts = queue.popleft()
+            if not queue:
+                del waiting[key]
+            received = ts if action == "RECEIVE" else other_ts
+            latency = received - (other_ts if action == "RECEIVE" else ts)
+            conversation.on_match(latency)
+            if with_pairs:
+                yield PAIR, (conversation_id, perf, spelling(sender), spelling(receiver), latency, received)
+        else:
+            queue = mine.get(key)
+            if queue is None:
+                queue = mine[key] = deque()
+                open_keys.setdefault(conversation_id, set()).add(key)
+            queue.append(ts)
+
+        if idle_timeout_ms is not None:
+            if last_flush is None:
+                last_flush = ts
+            elif ts - last_flush >= idle_timeout_ms:
+                last_flush = ts
+                idle = [cid for cid, c in conversations.items() if ts - c.end > idle_timeout_ms]
+                for cid in idle:
+                    yield CONVERSATION, close(cid)
+
+    for conversation_id in list(conversations):
+        yield CONVERSATION, close(conversation_id)
+
+
+@instrumentar
+def reconstruct_conversations(path, names=None, idle_timeout_ms=None, pairs=None):
+    """
+    Pair every SEND with its RECEIVE and aggregate each conversation in one pass.
+
+    SEND and RECEIVE rows are joined on (conversationId, performative,
+    sender, receiver), with names reduced to their lowercase
+    ``AgentNames.key``; output uses the canonical spelling. Within a key, pending
+    events are matched FIFO, so repeated CFP rounds under the same SPADE
+    conversationId pair up in order; a RECEIVE logged before its SEND is
+    held until the SEND shows up.
+
+    Memory is bounded by the open conversations and the unmatched events.
+    With ``idle_timeout_ms``, conversations with no event for that long are
+    emitted and dropped (their unmatched events are counted as lost), so
+    arbitrarily long logs run in bounded memory.
+
+    Args:
+        path (str): ``message_logs/<scenario>/<platform>.csv``.
+        names (AgentNames): Shared name mapping, so several logs use the same names.
+        idle_timeout_ms (float): Flush conversations idle for this long.
+        pairs (callable): Optional ``pairs(conversation_id, performative, sender,
+            receiver, latency_ms, received_ms)`` callback for every matched message;
+            ``received_ms`` is on the ``parse_timestamp_ms`` scale.
+
+    Yields:
+        dict: One record per conversation with the CONVERSATION_COLUMNS keys.
+    """
+    for kind, item in _reconstruct(path, names, idle_timeout_ms, pairs is not None):
+        if kind == PAIR:
+            pairs(*item)
+        else:
+            yield item
+
+
+@instrumentar
+def iter_pairs(path, names=None, idle_timeout_ms=None):
+    """
+    Stream every matched SEND/RECEIVE of a log as soon as it is matched.
+
+    Same pairing as ``reconstruct_conversations``, but the consumer gets
+    control after each pair instead of only when a conversation closes.
+
+    Yields:
+        tuple: ``(conversation_id, performative, sender, receiver, latency_ms,
+        received_ms)``, with ``received_ms`` on the ``parse_timestamp_ms`` scale.
+    """
+    for kind, item in _reconstruct(path, names, idle_timeout_ms, True):
+        if kind == PAIR:
+            yield item
+
+
+@instrumentar
+def write_conversations(path, output, **kwargs):
+    """Reconstruct the conversations of a log and stream them to a CSV."""
+    count = 0
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CONVERSATION_COLUMNS)
+        writer.writeheader()
+        for record in reconstruct_conversations(path, **kwargs):
+            writer.writerow(record)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstruct conversations from a JADE/SPADE message log.")
+    parser.add_argument("log", help="Path to message_logs/<scenario>/<platform>.csv")
+    parser.add_argument("--output", default="conversations.csv")
+    parser.add_argument("--idle-timeout-ms", type=float,
+                        help="Flush conversations idle for this long to bound memory")
+    args = parser.parse_args()
+
+    count = write_conversations(args.log, args.output, idle_timeout_ms=args.idle_timeout_ms)
+    print(f"Wrote {count} conversations to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
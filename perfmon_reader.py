@@ -0,0 +1,240 @@
+import re
+import csv
+import numpy as np
+import pandas as pd
+
+from Indices.Instrumentacion import instrumentar
+
+# Logical processors of the machine the Perfmon captures were taken on; only
+# used when the file has no Process(_Total) column to infer it from
+LOGICAL_PROCESSORS = 16
+
+DEFAULT_COUNTERS = ["% Processor Time", "Private Bytes", "Working Set", "ID Process"]
+
+# \\HOST\Object(instance)\Counter
+COUNTER_PATTERN = re.compile(r"^\\\\(?P<host>[^\\]+)\\(?P<object>[^\\(]+)(?:\((?P<instance>.*)\))?\\(?P<counter>[^\\]+)$")
+
+TIMESTAMP_FORMAT = "%m/%d/%Y %H:%M:%S.%f"
+MB = 1024 * 1024
+
+METRICS_COLUMNS = [
+    "Platform", "Scenario", "CPU_Avg (%)", "CPU_Max (%)", "CPU_StdDev",
+    "Mem_Private_Avg (MB)", "Mem_Private_Max (MB)",
+    "Mem_WorkingSet_Avg (MB)", "Mem_WorkingSet_Max (MB)", "Duration (sec)",
+]
+
+
+@instrumentar
+def read_header(path, encoding="latin-1"):
+    """Read only the header row of a PDH-CSV export."""
+    with open(path, "r", encoding=encoding, newline="") as f:
+        return next(csv.reader(f))
+
+
+def parse_counter(column):
+    """Split a PDH column into (host, object, instance, counter), or None for the timestamp column."""
+    match = COUNTER_PATTERN.match(column)
+    if match is None:
+        return None
+    return match.group("host"), match.group("object"), match.group("instance"), match.group("counter")
+
+
+def instance_base_name(instance):
+    """``python#3`` -> ``python``; Perfmon numbers repeated process names."""
+    return instance.split("#", 1)[0]
+
+
+def process_columns(header):
+    """
+    Index the Process counters in a header.
+
+    Returns:
+        dict: instance -> {counter: column position}
+    """
+    instances = {}
+    for position, column in enumerate(header):
+        parsed = parse_counter(column)
+        if parsed is None or parsed[1] != "Process":
+            continue
+        _, _, instance, counter = parsed
+        instances.setdefault(instance, {})[counter] = position
+    return instances
+
+
+@instrumentar
+def read_positions(path, positions, dtypes, encoding="latin-1"):
+    """
+    Read a subset of columns by position, labelled by position.
+
+    PDH headers can repeat a column name, so the header row is skipped and
+    columns are addressed by their index instead.
+    """
+    return pd.read_csv(
+        path,
+        encoding=encoding,
+        header=None,
+        skiprows=1,
+        usecols=positions,
+        na_values=[" ", ""],
+        keep_default_na=False,
+        dtype=dtypes,
+    )
+
+
+def read_columns(path, positions, encoding="latin-1"):
+    """
+    Read only the given column positions as float64; PDH writes blanks as ``" "``.
+
+    Returns:
+        dict: column position -> pd.Series
+    """
+    positions = sorted(set(positions))
+    df = read_positions(path, positions, {p: "float64" for p in positions}, encoding)
+    return {position: df[position] for position in positions}
+
+
+def instances_for_pid(path, instances, pid, encoding="latin-1"):
+    """Find the process instances whose ``ID Process`` counter took the given PID."""
+    id_columns = {instance: counters["ID Process"]
+                  for instance, counters in instances.items() if "ID Process" in counters}
+    if not id_columns:
+        return []
+
+    ids = read_columns(path, id_columns.values(), encoding)
+    return [instance for instance, position in id_columns.items() if (ids[position] == pid).any()]
+
+
+@instrumentar
+def resolve_instances(path, header, process=None, pid=None, encoding="latin-1"):
+    """
+    Resolve which Process instances to read.
+
+    Args:
+        process (str): Process name or regular expression matched against the
+            instance name without its ``#N`` suffix (e.g. ``"java"``, ``"python"``).
+        pid (int): PID to match against the ``ID Process`` counter.
+    """
+    instances = process_columns(header)
+    selected = list(instances)
+
+    if process is not None:
+        pattern = re.compile(process, re.IGNORECASE)
+        selected = [i for i in selected if pattern.fullmatch(instance_base_name(i))]
+    if pid is not None:
+        by_pid = set(instances_for_pid(path, {i: instances[i] for i in selected}, pid, encoding))
+        selected = [i for i in selected if i in by_pid]
+
+    return {instance: instances[instance] for instance in selected}
+
+
+def logical_processors_from_total(values):
+    """
+    Infer the logical processor count from ``Process(_Total)\\% Processor Time``.
+
+    The total over all processes (including Idle) is about 100% per logical
+    processor, so the median sample divided by 100 gives the core count.
+    """
+    values = values.dropna()
+    if values.empty:
+        return LOGICAL_PROCESSORS
+    return max(1, int(round(float(values.median()) / 100)))
+
+
+def detect_logical_processors(path, header, encoding="latin-1"):
+    """Logical processor count of the machine a PDH-CSV export was captured on."""
+    total = process_columns(header).get("_Total", {}).get("% Processor Time")
+    if total is None:
+        return LOGICAL_PROCESSORS
+    return logical_processors_from_total(read_columns(path, [total], encoding)[total])
+
+
+@instrumentar
+def load_process_counters(path, process=None, pid=None, counters=DEFAULT_COUNTERS,
+                          logical_processors=None, encoding="latin-1"):
+    """
+    Load the counters of the selected process(es) from a Perfmon PDH-CSV export.
+
+    Only the header is parsed up front; the data is then read restricted to
+    the timestamp and the matching columns, so the hundreds of unrelated
+    process columns are never converted.
+
+    Args:
+        path (str): Path to ``Procesos_*.csv``.
+        process (str): Process name pattern (e.g. ``"java"``).
+        pid (int): Process id, matched through the ``ID Process`` counter.
+        counters (list): Counters to load for each instance.
+        logical_processors (int): CPU count used to normalize ``% Processor Time``.
+            Inferred from the file when None.
+
+    Returns:
+        pd.DataFrame: ``Timestamp`` plus one ``<instance>\\<counter>`` column per
+        counter, the per-row sums ``CPU (%)``, ``Private Bytes``, ``Working Set``
+        over all selected instances and ``CPU_Normalized (%)``.
+    """
+    header = read_header(path, encoding)
+    instances = resolve_instances(path, header, process, pid, encoding)
+
+    wanted = {}
+    for instance, available in instances.items():
+        for counter in counters:
+            if counter in available:
+                wanted[available[counter]] = f"{instance}\\{counter}"
+
+    # Read _Total in the same pass when the core count has to be inferred
+    total = None
+    if logical_processors is None:
+        total = process_columns(header).get("_Total", {}).get("% Processor Time")
+    numeric = sorted(set(wanted) | ({total} if total is not None else set()))
+
+    raw = read_positions(path, [0] + numeric, {0: str, **{p: "float64" for p in numeric}}, encoding)
+
+    if logical_processors is None:
+        logical_processors = (logical_processors_from_total(raw[total])
+                              if total is not None else LOGICAL_PROCESSORS)
+
+    df = pd.DataFrame({"Timestamp": pd.to_datetime(raw[0], format=TIMESTAMP_FORMAT)})
+    for position in sorted(wanted):
+        df[wanted[position]] = raw[position]
+
+    for counter, total_column in [("% Processor Time", "CPU (%)"),
+                                  ("Private Bytes", "Private Bytes"),
+                                  ("Working Set", "Working Set")]:
+        columns = [name for name in wanted.values() if name.endswith(f"\\{counter}")]
+        if columns:
+            # min_count=1 keeps rows where every instance is blank as NaN
+            df[total_column] = df[columns].sum(axis=1, min_count=1)
+
+    if "CPU (%)" in df:
+        df["CPU_Normalized (%)"] = df["CPU (%)"] / logical_processors
+
+    df.attrs["instances"] = list(instances)
+    df.attrs["logical_processors"] = logical_processors
+    return df
+
+
+@instrumentar
+def summarize(df, platform, scenario, normalized=False):
+    """
+    Summarize a process time series with the ``jade_vs_spade_performance_metrics.csv`` schema.
+
+    Args:
+        normalized (bool): Report CPU normalized by the logical processor count.
+    """
+    cpu = df["CPU_Normalized (%)" if normalized else "CPU (%)"].dropna()
+    private = df["Private Bytes"].dropna() / MB
+    working = df["Working Set"].dropna() / MB
+    timestamps = df["Timestamp"].dropna()
+    duration = (timestamps.iloc[-1] - timestamps.iloc[0]).total_seconds() if len(timestamps) else 0.0
+
+    return {
+        "Platform": platform,
+        "Scenario": scenario,
+        "CPU_Avg (%)": float(cpu.mean()) if len(cpu) else np.nan,
+        "CPU_Max (%)": float(cpu.max()) if len(cpu) else np.nan,
+        "CPU_StdDev": float(cpu.std()) if len(cpu) else np.nan,
+        "Mem_Private_Avg (MB)": float(private.mean()) if len(private) else np.nan,
+        "Mem_Private_Max (MB)": float(private.max()) if len(private) else np.nan,
+        "Mem_WorkingSet_Avg (MB)": float(working.mean()) if len(working) else np.nan,
+        "Mem_WorkingSet_Max (MB)": float(working.max()) if len(working) else np.nan,
+        "Duration (sec)": duration,
+    }
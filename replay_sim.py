@@ -0,0 +1,415 @@
+import os
+import csv
+import time
+import heapq
+import argparse
+import numpy as np
+
+from rtt_reader import iter_rtt_chunks
+from message_log import AgentNames, iter_events, normalize_performative, parse_timestamp_ms
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_SCALES = [1, 2, 10, 100]
+
+SERVICE_KINDS = ["empirical", "constant", "exponential"]
+
+# Random draws are taken from NumPy in blocks and consumed as Python floats
+SAMPLE_BLOCK = 1 << 16
+
+RESULT_COLUMNS = [
+    "Platform", "Scenario", "scale", "mode", "professors", "rooms", "rounds",
+    "messages", "duration_ms", "recorded_duration_ms", "messages_per_s",
+    "queue_wait_mean_ms", "queue_wait_p95_ms", "queue_wait_max_ms",
+    "broker_wait_mean_ms", "wall_s", "agents_per_s",
+]
+
+# Event kinds of the simulator; every ARRIVAL is followed by its DONE
+ROOM_ARRIVAL, ROOM_DONE, PROF_ARRIVAL, PROF_DONE = range(4)
+
+
+class Round:
+    """One CFP round of a professor: who was asked, how many refused, how many were accepted."""
+
+    __slots__ = ("targets", "refusals", "accepted")
+
+    def __init__(self):
+        self.targets = []
+        self.refusals = 0
+        self.accepted = 0
+
+
+class Trace:
+    """
+    Negotiation structure of a recorded run, independent of its timing.
+
+    Professors are kept in the order they started negotiating (both
+    platforms hand the turn from one professor to the next), each with its
+    CFP rounds. Professors and rooms are identified by their lowercase
+    ``AgentNames.key``, so JIDs and local names of an agent are one agent.
+
+    The processing gaps between an agent receiving a message and sending
+    its answer are kept as the empirical service times.
+    """
+
+    def __init__(self):
+        self.professors = []
+        self.rounds = {}
+        self.rooms = {}
+        self.service_ms = []
+        self.duration_ms = 0.0
+
+    @property
+    def round_count(self):
+        return sum(len(rounds) for rounds in self.rounds.values())
+
+    @classmethod
+    def from_message_log(cls, path):
+        """
+        Extract the rounds of every professor from a JADE or SPADE message log.
+
+        A professor's CFPs form one round until it sends anything else
+        (ACCEPT_PROPOSAL, INFORM) or asks a room a second time; PROPOSE and
+        REFUSE sent back to it count toward its current round.
+        """
+        trace = cls()
+        names = AgentNames()
+        perf_cache = {}
+        in_cfp = {}
+        received = {}
+        first = last = None
+
+        for ts_text, action, sender, receiver, performative, _ in iter_events(path):
+            try:
+                ts = parse_timestamp_ms(ts_text)
+            except ValueError:
+                continue
+            first = ts if first is None else min(first, ts)
+            last = ts if last is None else max(last, ts)
+            # Lowercase keys: the canonical spelling can change partway through a log
+            sender = names.key(sender)
+            receiver = names.key(receiver)
+            perf = perf_cache.get(performative)
+            if perf is None:
+                perf = perf_cache[performative] = normalize_performative(performative)
+
+            if action == "RECEIVE":
+                received[(receiver, sender)] = ts
+                continue
+            if action != "SEND":
+                continue
+
+            # Time the sender spent on the last message it got from this peer
+            received_at = received.pop((sender, receiver), None)
+            if received_at is not None:
+                trace.service_ms.append(ts - received_at)
+
+            if perf == "CFP":
+                rounds = trace.rounds.get(sender)
+                if rounds is None:
+                    trace.professors.append(sender)
+                    rounds = trace.rounds[sender] = []
+                room = trace.rooms.setdefault(receiver, len(trace.rooms))
+                if not in_cfp.get(sender) or room in rounds[-1].targets:
+                    rounds.append(Round())
+                    in_cfp[sender] = True
+                rounds[-1].targets.append(room)
+            elif perf in ("PROPOSE", "REFUSE"):
+                rounds = trace.rounds.get(receiver)
+                if rounds and perf == "REFUSE":
+                    rounds[-1].refusals += 1
+            elif sender in trace.rounds:
+                in_cfp[sender] = False
+                if perf == "ACCEPT_PROPOSAL":
+                    trace.rounds[sender][-1].accepted += 1
+
+        trace.duration_ms = (last - first) if first is not None else 0.0
+        return trace
+
+
+def load_rtt_samples(path, encoding=None):
+    """Every RTT_ms of an RTT CSV (either dialect) as a float array."""
+    parts = [chunk["RTT_ms"].dropna().to_numpy("float64") for chunk in iter_rtt_chunks(path, encoding)]
+    return np.concatenate(parts) if parts else np.empty(0)
+
+
+class Sampler:
+    """Draws from a distribution in NumPy blocks and hands them out one float at a time."""
+
+    def __init__(self, draw):
+        self.draw = draw
+        self.values = []
+
+    def next(self):
+        if not self.values:
+            # Reversed so pop() returns the block in draw order
+            self.values = self.draw(SAMPLE_BLOCK)[::-1].tolist()
+        return self.values.pop()
+
+
+def service_sampler(kind, rng, mean_ms=None, samples=None):
+    """
+    Service-time model of an agent or of the broker.
+
+    - ``empirical``: resample the recorded processing gaps.
+    - ``constant``: always ``mean_ms``.
+    - ``exponential``: exponential with mean ``mean_ms``.
+
+    ``mean_ms`` defaults to the mean of ``samples``.
+    """
+    if kind not in SERVICE_KINDS:
+        raise ValueError(f"Unknown service model {kind!r}, expected one of {SERVICE_KINDS}")
+    samples = np.asarray(samples if samples is not None else [], dtype="float64")
+    if mean_ms is None:
+        mean_ms = float(samples.mean()) if len(samples) else 0.0
+
+    if kind == "empirical":
+        if not len(samples):
+            raise ValueError("The empirical service model needs recorded samples")
+        return Sampler(lambda n: rng.choice(samples, n))
+    if kind == "constant":
+        return Sampler(lambda n: np.full(n, mean_ms))
+    return Sampler(lambda n: rng.exponential(mean_ms, n))
+
+
+class ReplaySimulator:
+    """
+    Discrete-event replay of a recorded negotiation at a larger agent count.
+
+    At ``scale`` k every professor and room of the trace is cloned k times.
+    Each professor clone replays its original rounds; every CFP target is
+    the same room in a randomly chosen clone, so the load per room stays the
+    same on average while clones compete for rooms and for the broker.
+
+    Each message is delayed by half a recorded RTT (drawn from the RTT CSV)
+    and, with ``broker_servers``, first queues at a shared broker with that
+    many servers. Every agent handles its mailbox one message at a time
+    with a service time from ``service``; a round ends when the professor
+    has handled all replies and, if it accepted any, their INFORMs.
+
+    With ``mode="sequential"`` professors take turns as in the recorded
+    platforms; ``"concurrent"`` starts all of them at once.
+
+    Single-server queues are resolved with the Lindley recursion in event
+    order, so the event heap holds only arrivals and completions.
+    """
+
+    def __init__(self, trace, rtt_samples, service, broker_service=None, broker_servers=0,
+                 mode="sequential", seed=0):
+        if mode not in ("sequential", "concurrent"):
+            raise ValueError("mode must be 'sequential' or 'concurrent'")
+        if not len(rtt_samples):
+            raise ValueError("No RTT samples to draw network delays from")
+        self.trace = trace
+        self.rng = np.random.default_rng(seed)
+        half_rtt = np.asarray(rtt_samples, dtype="float64") / 2
+        self.transit = Sampler(lambda n: self.rng.choice(half_rtt, n))
+        self.service = service
+        self.broker_service = broker_service
+        self.broker_servers = broker_servers
+        self.mode = mode
+
+    def run(self, scale=1):
+        trace = self.trace
+        room_count = len(trace.rooms)
+        # Turn order of the clones: each original professor's clones follow it
+        professors = [(professor, clone) for professor in trace.professors for clone in range(scale)]
+
+        transit = self.transit.next
+        service = self.service.next
+        broker_service = self.broker_service.next if self.broker_service else None
+        broker_free = [0.0] * self.broker_servers
+        room_free = [0.0] * (room_count * scale)
+        prof_free = [0.0] * len(professors)
+        clone_of = Sampler(lambda n: self.rng.integers(0, scale, n)).next
+
+        waits = []
+        broker_waits = []
+        events = []
+        sequence = 0
+        messages = 0
+        end_time = 0.0
+
+        # Per professor: index of the current round, replies and INFORMs still expected
+        round_index = [0] * len(professors)
+        pending = [0] * len(professors)
+        proposers = [[] for _ in professors]
+        accepting = [False] * len(professors)
+
+        def send(now, kind, agent, payload):
+            nonlocal sequence, messages
+            messages += 1
+            if broker_service is not None:
+                # Broker servers are taken in send order, which is time order here
+                free = heapq.heappop(broker_free)
+                start = free if free > now else now
+                broker_waits.append(start - now)
+                now = start + broker_service()
+                heapq.heappush(broker_free, now)
+            sequence += 1
+            heapq.heappush(events, (now + transit(), sequence, kind, agent, payload))
+
+        def start_round(now, p):
+            rounds = trace.rounds[professors[p][0]]
+            if round_index[p] >= len(rounds):
+                if self.mode == "sequential" and p + 1 < len(professors):
+                    start_round(now, p + 1)
+                return
+            current = rounds[round_index[p]]
+            pending[p] = len(current.targets)
+            proposers[p] = []
+            accepting[p] = False
+            for position, room in enumerate(current.targets):
+                refuse = position >= len(current.targets) - current.refusals
+                send(now, ROOM_ARRIVAL, clone_of() * room_count + room, (p, "CFP", refuse))
+
+        if self.mode == "sequential":
+            start_round(0.0, 0)
+        else:
+            for p in range(len(professors)):
+                start_round(0.0, p)
+
+        while events:
+            now, _, kind, agent, payload = heapq.heappop(events)
+            if kind == ROOM_ARRIVAL or kind == PROF_ARRIVAL:
+                free = room_free if kind == ROOM_ARRIVAL else prof_free
+                start = free[agent] if free[agent] > now else now
+                waits.append(start - now)
+                done = start + service()
+                free[agent] = done
+                sequence += 1
+                heapq.heappush(events, (done, sequence, kind + 1, agent, payload))
+            elif kind == ROOM_DONE:
+                p, performative, refuse = payload
+                if performative == "CFP":
+                    send(now, PROF_ARRIVAL, p, (agent, "REFUSE" if refuse else "PROPOSE"))
+                else:
+                    send(now, PROF_ARRIVAL, p, (agent, "INFORM"))
+            else:
+                end_time = now if now > end_time else end_time
+                room, performative = payload
+                p = agent
+                if performative == "PROPOSE":
+                    proposers[p].append(room)
+                pending[p] -= 1
+                if pending[p]:
+                    continue
+                current = trace.rounds[professors[p][0]][round_index[p]]
+                accepted = proposers[p][:current.accepted] if not accepting[p] else []
+                if accepted:
+                    accepting[p] = True
+                    pending[p] = len(accepted)
+                    for room in accepted:
+                        send(now, ROOM_ARRIVAL, room, (p, "ACCEPT_PROPOSAL", False))
+                else:
+                    round_index[p] += 1
+                    start_round(now, p)
+
+        waits = np.asarray(waits) if waits else np.zeros(1)
+        return {
+            "scale": scale,
+            "mode": self.mode,
+            "professors": len(professors),
+            "rooms": room_count * scale,
+            "rounds": trace.round_count * scale,
+            "messages": messages,
+            "duration_ms": end_time,
+            "messages_per_s": messages / (end_time / 1000) if end_time else 0.0,
+            "queue_wait_mean_ms": float(waits.mean()),
+            "queue_wait_p95_ms": float(np.percentile(waits, 95)),
+            "queue_wait_max_ms": float(waits.max()),
+            "broker_wait_mean_ms": float(np.mean(broker_waits)) if broker_waits else 0.0,
+        }
+
+
+def simulate(platform, scenario="small", scales=DEFAULT_SCALES, service="empirical", service_ms=None,
+             broker_servers=0, broker_service_ms=None, mode="sequential", seed=0,
+             trace_path=None, rtt_path=None):
+    """
+    Replay one platform's recorded run at several scales.
+
+    Reads ``message_logs/<scenario>/<platform>.csv`` for the structure and
+    ``rtt/<scenario>/<platform>.csv`` for the network delays unless paths
+    are given.
+
+    Returns:
+        list: One RESULT_COLUMNS row per scale.
+    """
+    platform = platform.lower()
+    trace_path = trace_path or os.path.join(CURRENT_DIR, "message_logs", scenario, f"{platform}.csv")
+    rtt_path = rtt_path or os.path.join(CURRENT_DIR, "rtt", scenario, f"{platform}.csv")
+
+    trace = Trace.from_message_log(trace_path)
+    rtt_samples = load_rtt_samples(rtt_path)
+
+    rows = []
+    for scale in scales:
+        # Same seed per scale so runs differ only by the agent count
+        rng = np.random.default_rng(seed)
+        agent_service = service_sampler(service, rng, service_ms, trace.service_ms)
+        broker = None
+        if broker_servers:
+            broker = service_sampler("exponential" if service == "empirical" else service, rng,
+                                     broker_service_ms or 0.0)
+        simulator = ReplaySimulator(trace, rtt_samples, agent_service, broker, broker_servers, mode, seed)
+
+        started = time.perf_counter()
+        row = simulator.run(scale)
+        wall = time.perf_counter() - started
+
+        row.update({
+            "Platform": platform.upper(),
+            "Scenario": scenario,
+            "recorded_duration_ms": trace.duration_ms,
+            "wall_s": wall,
+            "agents_per_s": (row["professors"] + row["rooms"]) / wall if wall else 0.0,
+        })
+        rows.append(row)
+    return rows
+
+
+def write_results(rows, output):
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: round(value, 3) if isinstance(value, float) else value
+                             for key, value in row.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="What-if scaling by replaying a recorded negotiation.")
+    parser.add_argument("--scenario", default="small")
+    parser.add_argument("--platform", nargs="+", default=["jade", "spade"])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--mode", choices=["sequential", "concurrent"], default="sequential",
+                        help="Professors take turns (as recorded) or all start at once")
+    parser.add_argument("--service", choices=SERVICE_KINDS, default="empirical",
+                        help="Agent service-time model")
+    parser.add_argument("--service-ms", type=float,
+                        help="Mean agent service time (default: mean of the recorded processing gaps)")
+    parser.add_argument("--broker-servers", type=int, default=0,
+                        help="Servers of a shared broker every message goes through (0: none)")
+    parser.add_argument("--broker-service-ms", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Default: replay_sim_<scenario>.csv")
+    args = parser.parse_args()
+
+    rows = []
+    for platform in args.platform:
+        rows += simulate(platform, args.scenario, args.scales, args.service, args.service_ms,
+                         args.broker_servers, args.broker_service_ms, args.mode, args.seed)
+        for row in rows[-len(args.scales):]:
+            print(f"{row['Platform']} x{row['scale']}: {row['professors'] + row['rooms']} agents, "
+                  f"{row['messages']} messages, {row['duration_ms']:.1f} ms simulated "
+                  f"(recorded x1: {row['recorded_duration_ms']:.1f} ms), "
+                  f"queue wait mean {row['queue_wait_mean_ms']:.3f} ms, "
+                  f"{row['agents_per_s']:.0f} agents/s")
+
+    output = args.output or f"replay_sim_{args.scenario}.csv"
+    write_results(rows, output)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
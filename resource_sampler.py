@@ -0,0 +1,362 @@
+import os
+import sys
+import csv
+import time
+import argparse
+import subprocess
+from datetime import datetime
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+LOGICAL_PROCESSORS = os.cpu_count() or 1
+
+# How often (in samples) the process tree is re-scanned for new children
+TREE_REFRESH_EVERY = 10
+
+# "Private Bytes" and "Working Set" keep the Perfmon names so that
+# perfmon_reader.summarize() works on both sources; on Linux they hold USS and RSS
+SAMPLE_COLUMNS = [
+    "Timestamp", "Processes", "CPU (%)", "CPU_Normalized (%)",
+    "Working Set", "Private Bytes", "Threads",
+    "CtxSwitches_Voluntary", "CtxSwitches_Involuntary",
+    "IO_Read_Bytes", "IO_Write_Bytes",
+]
+
+
+class ProcFile:
+    """A /proc file kept open and re-read with pread, avoiding an open() per sample."""
+
+    def __init__(self, path):
+        self.fd = os.open(path, os.O_RDONLY)
+
+    def read(self, size=8192):
+        return os.pread(self.fd, size, 0)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ProcessProbe:
+    """Counters of one process read straight from /proc/<pid>."""
+
+    def __init__(self, pid, uss=True):
+        self.pid = pid
+        self.stat = ProcFile(f"/proc/{pid}/stat")
+        self.status = ProcFile(f"/proc/{pid}/status")
+        self.io = self._optional(f"/proc/{pid}/io")
+        self.smaps = self._optional(f"/proc/{pid}/smaps_rollup") if uss else None
+
+    @staticmethod
+    def _optional(path):
+        # io and smaps_rollup need ptrace access and may be missing on older kernels
+        try:
+            return ProcFile(path)
+        except OSError:
+            return None
+
+    def close(self):
+        for f in (self.stat, self.status, self.io, self.smaps):
+            if f is not None:
+                f.close()
+
+    def sample(self):
+        """Return a dict of raw counters, or None if the process is gone."""
+        try:
+            stat = self.stat.read()
+        except OSError:
+            return None
+        if not stat:
+            return None
+
+        # The command name may contain spaces, so split after its closing parenthesis
+        fields = stat[stat.rindex(b")") + 2:].split()
+        counters = {
+            "cpu_ticks": int(fields[11]) + int(fields[12]),
+            "threads": int(fields[17]),
+            "rss": int(fields[21]) * PAGE_SIZE,
+            "ctx_voluntary": 0,
+            "ctx_involuntary": 0,
+            "read_bytes": 0,
+            "write_bytes": 0,
+            "uss": None,
+        }
+
+        try:
+            for line in self.status.read().splitlines():
+                if line.startswith(b"voluntary_ctxt_switches"):
+                    counters["ctx_voluntary"] = int(line.split()[1])
+                elif line.startswith(b"nonvoluntary_ctxt_switches"):
+                    counters["ctx_involuntary"] = int(line.split()[1])
+        except OSError:
+            return None
+
+        if self.io is not None:
+            try:
+                for line in self.io.read().splitlines():
+                    if line.startswith(b"read_bytes"):
+                        counters["read_bytes"] = int(line.split()[1])
+                    elif line.startswith(b"write_bytes"):
+                        counters["write_bytes"] = int(line.split()[1])
+            except OSError:
+                pass
+
+        if self.smaps is not None:
+            try:
+                uss = 0
+                for line in self.smaps.read().splitlines():
+                    if line.startswith((b"Private_Clean", b"Private_Dirty")):
+                        uss += int(line.split()[1]) * 1024
+                counters["uss"] = uss
+            except OSError:
+                pass
+
+        return counters
+
+
+def children_of(pid):
+    """Direct children of a process, using /proc/<pid>/task/*/children when available."""
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children", "rb") as f:
+                children.extend(int(child) for child in f.read().split())
+        return children
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return children
+
+    # Kernels without CONFIG_PROC_CHILDREN: scan every process for its parent
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+            if int(stat[stat.rindex(b")") + 2:].split()[1]) == pid:
+                children.append(int(entry))
+        except (OSError, ValueError):
+            continue
+    return children
+
+
+def process_tree(root_pid):
+    """The root PID and all of its descendants."""
+    pids = [root_pid]
+    index = 0
+    while index < len(pids):
+        pids.extend(children_of(pids[index]))
+        index += 1
+    return pids
+
+
+class TreeSampler:
+    """
+    Samples a process tree (e.g. a JADE JVM or the SPADE Python process and its children).
+
+    CPU is reported like Perfmon's ``% Processor Time``: 100% per fully used
+    logical processor, so it can exceed 100%; ``CPU_Normalized (%)`` divides
+    it by the logical processor count. Counters of processes that exit are
+    kept so the cumulative totals never go backwards.
+    """
+
+    def __init__(self, root_pid, uss=True):
+        self.root_pid = root_pid
+        self.uss = uss
+        self.probes = {}
+        self.last = {}
+        self.exited = {"cpu_ticks": 0, "ctx_voluntary": 0, "ctx_involuntary": 0,
+                       "read_bytes": 0, "write_bytes": 0}
+        self.samples_taken = 0
+        self.prev_ticks = None
+        self.prev_time = None
+
+    def refresh(self):
+        for pid in process_tree(self.root_pid):
+            if pid not in self.probes:
+                try:
+                    probe = ProcessProbe(pid, self.uss)
+                except OSError:
+                    continue
+                self.probes[pid] = probe
+                if self.prev_ticks is None:
+                    continue
+                # A child found between samples brings the ticks it used before
+                # discovery; add them to the baseline so only later ticks count
+                counters = probe.sample()
+                if counters is not None:
+                    self.last[pid] = counters
+                    self.prev_ticks += counters["cpu_ticks"]
+
+    def close(self):
+        for probe in self.probes.values():
+            probe.close()
+        self.probes.clear()
+
+    def alive(self):
+        return os.path.exists(f"/proc/{self.root_pid}")
+
+    def sample(self):
+        """Take one sample of the whole tree; returns a row for SAMPLE_COLUMNS or None."""
+        if self.samples_taken % TREE_REFRESH_EVERY == 0:
+            self.refresh()
+        self.samples_taken += 1
+
+        now = time.monotonic()
+        totals = {"cpu_ticks": 0, "threads": 0, "rss": 0, "uss": 0,
+                  "ctx_voluntary": 0, "ctx_involuntary": 0, "read_bytes": 0, "write_bytes": 0}
+        uss_available = False
+
+        for pid, probe in list(self.probes.items()):
+            counters = probe.sample()
+            if counters is None:
+                # Process exited: fold its last cumulative counters into the baseline
+                for key in self.exited:
+                    self.exited[key] += self.last.get(pid, {}).get(key, 0)
+                self.last.pop(pid, None)
+                probe.close()
+                del self.probes[pid]
+                continue
+            self.last[pid] = counters
+            for key in totals:
+                if key == "uss":
+                    if counters["uss"] is not None:
+                        totals["uss"] += counters["uss"]
+                        uss_available = True
+                else:
+                    totals[key] += counters[key]
+
+        if not self.probes:
+            return None
+
+        for key, value in self.exited.items():
+            totals[key] += value
+
+        cpu = float("nan")
+        if self.prev_ticks is not None and now > self.prev_time:
+            cpu = (totals["cpu_ticks"] - self.prev_ticks) / CLK_TCK / (now - self.prev_time) * 100
+        self.prev_ticks = totals["cpu_ticks"]
+        self.prev_time = now
+
+        return [
+            datetime.now().isoformat(timespec="microseconds"),
+            len(self.probes),
+            cpu,
+            cpu / LOGICAL_PROCESSORS,
+            totals["rss"],
+            totals["uss"] if uss_available else totals["rss"],
+            totals["threads"],
+            totals["ctx_voluntary"],
+            totals["ctx_involuntary"],
+            totals["read_bytes"],
+            totals["write_bytes"],
+        ]
+
+
+def sample_tree(root_pid, output, interval=0.1, duration=None, uss=True, process=None):
+    """
+    Sample a process tree until it exits (or ``duration`` seconds pass) into a CSV.
+
+    Args:
+        root_pid (int): PID of the platform process to attach to.
+        output (str): Path of the per-sample CSV.
+        interval (float): Seconds between samples.
+        duration (float): Optional maximum sampling time.
+        uss (bool): Read USS from smaps_rollup; costs more per sample than RSS.
+        process (subprocess.Popen): Child started by us, polled so it can be reaped.
+
+    Returns:
+        int: Number of samples written.
+    """
+    sampler = TreeSampler(root_pid, uss)
+    written = 0
+    start = time.monotonic()
+    next_tick = start
+
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SAMPLE_COLUMNS)
+        try:
+            while True:
+                if process is not None and process.poll() is not None:
+                    break
+                if process is None and not sampler.alive():
+                    break
+                row = sampler.sample()
+                if row is None:
+                    break
+                writer.writerow(row)
+                written += 1
+
+                if duration is not None and time.monotonic() - start >= duration:
+                    break
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind; don't try to catch up with a burst of samples
+                    next_tick = time.monotonic()
+        finally:
+            sampler.close()
+
+    return written
+
+
+def append_summary(samples_csv, summary_csv, platform, scenario):
+    """Append one row with the jade_vs_spade_performance_metrics.csv schema."""
+    import pandas as pd
+    from perfmon_reader import METRICS_COLUMNS, summarize
+
+    df = pd.read_csv(samples_csv)
+    df["Timestamp"] = pd.to_datetime(df["Timestamp"])
+    row = summarize(df, platform, scenario)
+
+    exists = os.path.exists(summary_csv) and os.path.getsize(summary_csv) > 0
+    with open(summary_csv, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=METRICS_COLUMNS)
+        if not exists:
+            writer.writeheader()
+        writer.writerow(row)
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Sample CPU, memory, threads, context switches and I/O of a process tree from /proc.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--pid", type=int, help="Attach to a running process")
+    target.add_argument("--command", nargs=argparse.REMAINDER, help="Start and sample a command")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between samples")
+    parser.add_argument("--duration", type=float, help="Stop after this many seconds")
+    parser.add_argument("--no-uss", action="store_true", help="Skip smaps_rollup (lower overhead)")
+    parser.add_argument("--output", default="samples.csv")
+    parser.add_argument("--summary", help="Append a summary row to this CSV")
+    parser.add_argument("--platform", default="")
+    parser.add_argument("--scenario", default="")
+    args = parser.parse_args()
+
+    if sys.platform != "linux":
+        parser.error("resource_sampler reads /proc and only works on Linux")
+
+    process = None
+    if args.command:
+        process = subprocess.Popen(args.command)
+        root_pid = process.pid
+    else:
+        root_pid = args.pid
+
+    written = sample_tree(root_pid, args.output, args.interval, args.duration,
+                          uss=not args.no_uss, process=process)
+    print(f"Wrote {written} samples to {args.output}")
+
+    if process is not None:
+        process.wait()
+
+    if args.summary and written:
+        row = append_summary(args.output, args.summary, args.platform, args.scenario)
+        print(f"Appended summary to {args.summary}: {row}")
+
+
+if __name__ == "__main__":
+    main()
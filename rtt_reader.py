@@ -0,0 +1,225 @@
+import io
+import os
+import codecs
+import hashlib
+import pandas as pd
+
+from Indices.Instrumentacion import instrumentar, contar
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # pyarrow is optional, without it the cache is skipped
+    pa = None
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(CURRENT_DIR, "rtt", ".cache")
+
+# Bump when the normalization below changes so stale caches are ignored
+CACHE_VERSION = 1
+
+CHUNK_SIZE = 50_000
+HASH_BLOCK_SIZE = 1 << 20
+
+RTT_COLUMNS = [
+    "Timestamp", "Sender", "Receiver", "ConversationID", "Performative",
+    "RTT_ms", "MessageSize_bytes", "Success", "AdditionalInfo", "Ontology",
+]
+
+# Everything is read as text first; RTT_ms and Success need per-dialect cleanup
+RAW_DTYPES = {column: str for column in RTT_COLUMNS}
+RAW_DTYPES["MessageSize_bytes"] = "int64"
+
+CATEGORY_COLUMNS = ["Sender", "Receiver", "Performative", "Ontology"]
+
+
+def fingerprint_blocks(blocks):
+    """
+    SHA-256 and encoding of a file given as a sequence of byte blocks.
+
+    JADE writes UTF-8 while SPADE writes latin-1, so the blocks are fed to
+    an incremental UTF-8 decoder while hashing and the encoding falls back
+    to latin-1 as soon as it sees an invalid byte.
+    """
+    digest = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    encoding = "utf-8"
+
+    for block in blocks:
+        digest.update(block)
+        if encoding == "utf-8":
+            try:
+                decoder.decode(block)
+            except UnicodeDecodeError:
+                encoding = "latin-1"
+
+    return digest.hexdigest(), encoding
+
+
+@instrumentar
+def fingerprint(path):
+    """
+    Hash a file and detect its encoding in the same pass over it.
+
+    Parsing the CSV afterwards reads it again; ``load_rtt`` avoids that by
+    fingerprinting and parsing the same bytes.
+    """
+    with open(path, "rb") as f:
+        return fingerprint_blocks(iter(lambda: f.read(HASH_BLOCK_SIZE), b""))
+
+
+def read_source(path):
+    """The bytes of a file with their (digest, encoding), from a single read."""
+    with open(path, "rb") as f:
+        data = f.read()
+    view = memoryview(data)
+    digest, encoding = fingerprint_blocks(view[i:i + HASH_BLOCK_SIZE]
+                                          for i in range(0, len(data), HASH_BLOCK_SIZE))
+    return data, digest, encoding
+
+
+def normalize_chunk(chunk):
+    """
+    Normalize one chunk of either RTT dialect to the common typed schema.
+
+    - Timestamp: ISO strings, with or without the trailing ``Z`` (JADE), to datetime64.
+    - RTT_ms: ``"116,603"`` (JADE) or ``1.572`` (SPADE) to float64.
+    - Success: ``true`` / ``True`` to bool.
+    - Performative: lowercased, JADE writes ``PROPOSE`` and SPADE ``propose``.
+    """
+    chunk["Timestamp"] = pd.to_datetime(
+        chunk["Timestamp"].str.rstrip("Z"), format="ISO8601").astype("datetime64[ns]")
+    chunk["RTT_ms"] = chunk["RTT_ms"].str.replace(",", ".", regex=False).astype("float64")
+    chunk["Success"] = chunk["Success"].str.lower().eq("true").fillna(False).astype(bool)
+    chunk["Performative"] = chunk["Performative"].str.lower()
+    chunk["AdditionalInfo"] = chunk["AdditionalInfo"].fillna("")
+    return chunk
+
+
+@instrumentar
+def iter_rtt_chunks(path, encoding=None, chunksize=CHUNK_SIZE):
+    """
+    Stream an RTT CSV as normalized DataFrame chunks.
+
+    ``path`` may also be a binary file object; without ``encoding`` it must
+    be a path, which is read once more to detect the encoding.
+    """
+    if encoding is None:
+        _, encoding = fingerprint(path)
+
+    reader = pd.read_csv(
+        path,
+        encoding=encoding,
+        usecols=RTT_COLUMNS,
+        dtype=RAW_DTYPES,
+        keep_default_na=False,
+        na_values={"RTT_ms": [""], "Success": [""]},
+        chunksize=chunksize,
+    )
+    for chunk in reader:
+        yield normalize_chunk(chunk)
+
+
+@instrumentar
+def parse_rtt_csv(path, encoding=None, chunksize=CHUNK_SIZE):
+    """Parse an RTT CSV (JADE or SPADE dialect) into a typed DataFrame."""
+    chunks = list(iter_rtt_chunks(path, encoding, chunksize))
+    if not chunks:
+        return empty_frame()
+
+    df = pd.concat(chunks, ignore_index=True)
+    contar("rtt_reader.rows", len(df))
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype("category")
+    return df
+
+
+def empty_frame():
+    """Empty DataFrame with the normalized RTT schema."""
+    df = normalize_chunk(pd.DataFrame({
+        column: pd.Series(dtype=dtype) for column, dtype in RAW_DTYPES.items()
+    }))
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype("category")
+    return df
+
+
+def cache_path(digest, cache_dir=DEFAULT_CACHE_DIR):
+    return os.path.join(cache_dir, f"rtt-v{CACHE_VERSION}-{digest}.arrow")
+
+
+@instrumentar
+def write_cache(df, path):
+    """Write a DataFrame as an uncompressed Arrow IPC file so it can be memory-mapped."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+@instrumentar
+def read_cache(path):
+    """Memory-map a cached Arrow IPC file back into a DataFrame."""
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas()
+
+
+@instrumentar
+def load_rtt(path, platform=None, scenario=None, cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+    """
+    Load an RTT CSV with normalized dtypes, using the Arrow cache when possible.
+
+    The cache is keyed by the SHA-256 of the source file, so edited or
+    replaced CSVs are re-parsed automatically. Without pyarrow the CSV is
+    parsed every time. The file is read once: the bytes that are hashed
+    are the ones parsed on a cache miss.
+
+    Args:
+        path (str): Path to a JADE or SPADE RTT CSV.
+        platform (str): Optional value for a ``Platform`` column (e.g. "JADE").
+        scenario (str): Optional value for a ``Scenario`` column (e.g. "full").
+        cache_dir (str): Directory holding the Arrow cache files.
+        use_cache (bool): Set to False to always parse the CSV.
+
+    Returns:
+        pd.DataFrame: One row per RTT measurement.
+    """
+    data, digest, encoding = read_source(path)
+    cached = cache_path(digest, cache_dir) if use_cache and pa is not None else None
+
+    if cached and os.path.exists(cached):
+        df = read_cache(cached)
+    else:
+        df = parse_rtt_csv(io.BytesIO(data), encoding)
+        if cached:
+            try:
+                write_cache(df, cached)
+            except OSError as e:
+                print(f"Could not write RTT cache {cached}: {e}")
+
+    if platform is not None:
+        df["Platform"] = platform.upper()
+    if scenario is not None:
+        df["Scenario"] = scenario
+    return df
+
+
+def load_scenarios(scenarios=("small", "medium", "full"), platforms=("jade", "spade"),
+                   base_dir=os.path.join(CURRENT_DIR, "rtt"), **kwargs):
+    """Load ``rtt/<scenario>/<platform>.csv`` for every combination into one DataFrame."""
+    frames = []
+    for scenario in scenarios:
+        for platform in platforms:
+            path = os.path.join(base_dir, scenario, f"{platform}.csv")
+            if not os.path.exists(path):
+                print(f"No RTT file found at {path}")
+                continue
+            frames.append(load_rtt(path, platform=platform, scenario=scenario, **kwargs))
+
+    if not frames:
+        return empty_frame()
+    return pd.concat(frames, ignore_index=True)
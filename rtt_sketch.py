@@ -0,0 +1,311 @@
+import os
+import json
+import math
+import argparse
+import numpy as np
+import pandas as pd
+
+from rtt_reader import DEFAULT_CACHE_DIR, fingerprint, iter_rtt_chunks
+
+# Bump when the sketch layout or bucketing changes so stale cached sketches are ignored
+SKETCH_VERSION = 1
+
+# Quantiles are within 1% of the true value (relative error)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+DEFAULT_QUANTILES = [0.5, 0.95, 0.99, 0.999]
+
+KEY_FIELDS = ["Platform", "Scenario", "Performative", "Receiver"]
+
+
+class LatencySketch:
+    """
+    Log-bucketed latency histogram with a fixed relative error.
+
+    Values are counted in buckets whose bounds grow geometrically by
+    ``gamma = (1 + a) / (1 - a)``, so any quantile is returned within a
+    relative error ``a`` of the true value no matter how skewed the
+    distribution is (the same guarantee as DDSketch / HDR histograms).
+
+    Two sketches with the same accuracy merge exactly by adding bucket
+    counts, so per-run sketches can be combined in any order.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.bins = {}
+        # Values <= 0 cannot be log-bucketed; RTTs of exactly 0 ms end up here
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.add_many(np.asarray([value], dtype="float64"))
+
+    def add_many(self, values):
+        """Add an array of values; NaNs are ignored."""
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        if len(positive):
+            indexes = np.ceil(np.log(positive) / self.log_gamma).astype("int64")
+            unique, counts = np.unique(indexes, return_counts=True)
+            bins = self.bins
+            for index, count in zip(unique.tolist(), counts.tolist()):
+                bins[index] = bins.get(index, 0) + count
+
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def merge(self, other):
+        """Add another sketch's counts into this one."""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        bins = self.bins
+        for index, count in other.bins.items():
+            bins[index] = bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Value at quantile ``q`` (0..1), or NaN for an empty sketch."""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return min(max(0.0, self.min), self.max)
+
+        seen = self.zero_count
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                # Midpoint (in relative terms) of the bucket (gamma^(i-1), gamma^i]
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        return [self.quantile(q) for q in qs]
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else math.nan
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero_count": self.zero_count,
+            "bins": sorted(self.bins.items()),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"])
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"] if data["min"] is not None else math.inf
+        sketch.max = data["max"] if data["max"] is not None else -math.inf
+        sketch.zero_count = data["zero_count"]
+        sketch.bins = {int(index): count for index, count in data["bins"]}
+        return sketch
+
+
+class SketchSet:
+    """
+    Latency sketches keyed by (platform, scenario, performative, receiver).
+
+    Built while an RTT CSV is streamed in chunks, saved as a small JSON
+    document, and merged with other sets; queries merge the matching keys
+    on the fly, so percentiles over any slice of the run archive never
+    touch the raw rows.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.sketches = {}
+
+    def sketch(self, key):
+        sketch = self.sketches.get(key)
+        if sketch is None:
+            sketch = self.sketches[key] = LatencySketch(self.relative_accuracy)
+        return sketch
+
+    def add_frame(self, df, platform, scenario):
+        """Add the RTT_ms values of a normalized RTT chunk."""
+        groups = df.groupby(["Performative", "Receiver"], observed=True, sort=False)["RTT_ms"]
+        for (performative, receiver), values in groups:
+            self.sketch((platform, scenario, performative, receiver)).add_many(values.to_numpy())
+
+    @classmethod
+    def from_csv(cls, path, platform, scenario, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, encoding=None):
+        """Build the sketches of one RTT CSV chunk by chunk."""
+        sketches = cls(relative_accuracy)
+        for chunk in iter_rtt_chunks(path, encoding):
+            sketches.add_frame(chunk, platform.upper(), scenario)
+        return sketches
+
+    def relabel(self, platform, scenario):
+        """Replace the platform and scenario of every key."""
+        self.sketches = {(platform.upper(), scenario) + key[2:]: sketch
+                         for key, sketch in self.sketches.items()}
+        return self
+
+    def merge(self, other):
+        for key, sketch in other.sketches.items():
+            self.sketch(key).merge(sketch)
+        return self
+
+    def select(self, platform=None, scenario=None, performative=None, receiver=None):
+        """Merge every sketch matching the given key fields (None matches anything)."""
+        wanted = (platform.upper() if platform else None, scenario,
+                  performative.lower() if performative else None, receiver)
+        merged = LatencySketch(self.relative_accuracy)
+        for key, sketch in self.sketches.items():
+            if all(w is None or w == k for w, k in zip(wanted, key)):
+                merged.merge(sketch)
+        return merged
+
+    def summary(self, by=("Platform", "Scenario"), qs=DEFAULT_QUANTILES):
+        """
+        Percentile table grouped by any subset of KEY_FIELDS.
+
+        Returns:
+            pd.DataFrame: One row per group with count, mean, min, max and ``p<q>`` columns.
+        """
+        positions = [KEY_FIELDS.index(field) for field in by]
+        groups = {}
+        for key, sketch in self.sketches.items():
+            group = tuple(key[p] for p in positions)
+            if group not in groups:
+                groups[group] = LatencySketch(self.relative_accuracy)
+            groups[group].merge(sketch)
+
+        rows = []
+        for group, sketch in sorted(groups.items()):
+            row = dict(zip(by, group))
+            row.update({"count": sketch.count, "mean": sketch.mean,
+                        "min": sketch.min, "max": sketch.max})
+            for q, value in zip(qs, sketch.quantiles(qs)):
+                row[f"p{q * 100:g}"] = value
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def to_dict(self):
+        return {
+            "version": SKETCH_VERSION,
+            "relative_accuracy": self.relative_accuracy,
+            "sketches": [{"key": list(key), **sketch.to_dict()}
+                         for key, sketch in self.sketches.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketches = cls(data["relative_accuracy"])
+        for item in data["sketches"]:
+            sketches.sketches[tuple(item["key"])] = LatencySketch.from_dict(item)
+        return sketches
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def sketch_path(digest, relative_accuracy, cache_dir=DEFAULT_CACHE_DIR):
+    return os.path.join(cache_dir, f"sketch-v{SKETCH_VERSION}-{relative_accuracy:g}-{digest}.json")
+
+
+def sketch_rtt(path, platform, scenario, relative_accuracy=DEFAULT_RELATIVE_ACCURACY,
+               cache_dir=DEFAULT_CACHE_DIR, use_cache=True):
+    """
+    Sketches of one RTT CSV, cached next to the Arrow caches by content hash.
+
+    Only the first call on a file streams its rows; later calls read a
+    JSON document of a few KB.
+    """
+    digest, encoding = fingerprint(path)
+    cached = sketch_path(digest, relative_accuracy, cache_dir) if use_cache else None
+
+    if cached and os.path.exists(cached):
+        # The cache is keyed by content only; the same file may be labelled differently
+        return SketchSet.load(cached).relabel(platform, scenario)
+
+    sketches = SketchSet.from_csv(path, platform, scenario, relative_accuracy, encoding)
+    if cached:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            sketches.save(cached)
+        except OSError as e:
+            print(f"Could not write RTT sketch cache {cached}: {e}")
+    return sketches
+
+
+def sketch_runs(runs, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, **kwargs):
+    """
+    Merge the sketches of many runs.
+
+    Args:
+        runs (list): (platform, scenario, run_id, path) tuples, e.g. from
+            ``ingest_runs.stored_runs("rtt")``.
+
+    Returns:
+        SketchSet: All runs merged.
+    """
+    merged = SketchSet(relative_accuracy)
+    for platform, scenario, _, path in runs:
+        merged.merge(sketch_rtt(path, platform, scenario, relative_accuracy, **kwargs))
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RTT percentiles from mergeable latency sketches.")
+    parser.add_argument("--store", action="store_true",
+                        help="Sketch every run in the ingested run store instead of rtt/<scenario>/")
+    parser.add_argument("--by", nargs="+", default=["Platform", "Scenario"], choices=KEY_FIELDS)
+    parser.add_argument("--accuracy", type=float, default=DEFAULT_RELATIVE_ACCURACY)
+    parser.add_argument("--output", help="Save the merged sketches as JSON")
+    args = parser.parse_args()
+
+    if args.store:
+        from ingest_runs import stored_runs
+        runs = stored_runs("rtt")
+    else:
+        base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rtt")
+        runs = [(platform, scenario, "latest", os.path.join(base_dir, scenario, f"{platform.lower()}.csv"))
+                for scenario in ("small", "medium", "full") for platform in ("JADE", "SPADE")]
+        runs = [run for run in runs if os.path.exists(run[3])]
+
+    sketches = sketch_runs(runs, args.accuracy)
+    print(sketches.summary(args.by).round(3).to_string(index=False))
+    if args.output:
+        sketches.save(args.output)
+
+
+if __name__ == "__main__":
+    main()
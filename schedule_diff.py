@@ -0,0 +1,296 @@
+import csv
+import json
+import argparse
+from itertools import combinations
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent
+
+# Weights of the general match percentage used in awesome_comparison.ipynb
+SUBJECT_WEIGHT = 0.6
+ROOM_WEIGHT = 0.4
+
+ROW_FIELDS = ["Profesor", "Asignatura", "Día", "Bloque", "Actividad"]
+PROFESSOR_FIELDS = [
+    "Profesor", "Asignaturas_A", "Asignaturas_B", "Asignaturas_Coincidentes",
+    "Salas_Coincidentes", "PorcentajeMatchAsignaturas", "PorcentajeMatchSalas",
+    "PorcentajeMatchGeneral",
+]
+PAIR_FIELDS = [
+    "run_a", "run_b", "assignments_a", "assignments_b", "matches",
+    "room_matches", "subject_match_pct", "room_match_pct", "general_match_pct",
+]
+
+
+def assignment_key(asignatura):
+    """(subject, day, block, activity); days are logged as ``LUNES`` or ``Lunes``."""
+    return (
+        asignatura.get("Nombre", ""),
+        asignatura.get("Dia", "").capitalize(),
+        asignatura.get("Bloque", ""),
+        asignatura.get("Actividad", ""),
+    )
+
+
+def index_schedule(horarios_asignados):
+    """
+    Hash-index a ``Horarios_asignados.json`` by professor and assignment.
+
+    A professor can hold a (day, block) only once, so the key is unique in a
+    valid schedule; a repeated key (a clash) keeps its last room.
+
+    Returns:
+        dict: professor -> {(subject, day, block, activity): room}
+    """
+    index = {}
+    for profesor in horarios_asignados:
+        assignments = index.setdefault(profesor["Nombre"], {})
+        for asignatura in profesor.get("Asignaturas", []):
+            assignments[assignment_key(asignatura)] = asignatura.get("Sala", "")
+    return index
+
+
+def load_index(filename):
+    with open(filename, "r", encoding="utf-8") as f:
+        return index_schedule(json.load(f))
+
+
+def match_percentages(matches, room_matches, total_unique):
+    """Subject, room and weighted general match percentages, as in the notebook."""
+    if not total_unique:
+        return 0.0, 0.0, 0.0
+    subjects = matches / total_unique * 100
+    rooms = room_matches / matches * 100 if matches else 0.0
+    return subjects, rooms, subjects * SUBJECT_WEIGHT + rooms * ROOM_WEIGHT
+
+
+class ScheduleDiff:
+    """
+    One pass comparison of two indexed schedules.
+
+    Each assignment is looked up in the other schedule's dict instead of
+    scanning the professor's list, so a diff costs O(assignments). Rows are
+    produced lazily by ``rows()``; ``professors`` and ``summary()`` are filled
+    in as the rows are consumed.
+
+    Args:
+        index_a, index_b (dict): Results of ``index_schedule``.
+        label_a, label_b (str): Run labels used in the room column names.
+    """
+
+    def __init__(self, index_a, index_b, label_a="SPADE", label_b="JADE"):
+        self.index_a = index_a
+        self.index_b = index_b
+        self.label_a = label_a
+        self.label_b = label_b
+        self.professors = []
+        self.totals = {"assignments_a": 0, "assignments_b": 0, "matches": 0,
+                       "room_matches": 0, "total_unique": 0}
+
+    @property
+    def fieldnames(self):
+        return ROW_FIELDS + [
+            f"Sala_{self.label_a}", f"Sala_{self.label_b}", "CoincideAsignatura",
+            "CoincideSala", "PorcentajeMatchSalas", "PorcentajeMatchGeneral",
+        ]
+
+    def compare_professor(self, nombre, a, b):
+        """Rows of one professor; its summary is appended to ``self.professors``."""
+        sala_a, sala_b = f"Sala_{self.label_a}", f"Sala_{self.label_b}"
+        rows = []
+        matches = room_matches = 0
+
+        for key, room_a in a.items():
+            room_b = b.get(key)
+            matched = room_b is not None
+            same_room = matched and room_a == room_b
+            matches += matched
+            room_matches += same_room
+            rows.append({
+                "Profesor": nombre, "Asignatura": key[0], "Día": key[1],
+                "Bloque": key[2], "Actividad": key[3],
+                sala_a: room_a, sala_b: room_b if matched else "",
+                "CoincideAsignatura": matched, "CoincideSala": same_room,
+            })
+        for key, room_b in b.items():
+            if key not in a:
+                rows.append({
+                    "Profesor": nombre, "Asignatura": key[0], "Día": key[1],
+                    "Bloque": key[2], "Actividad": key[3],
+                    sala_a: "", sala_b: room_b,
+                    "CoincideAsignatura": False, "CoincideSala": False,
+                })
+
+        # |A u B| without materializing the union
+        total_unique = len(a) + len(b) - matches
+        subjects, rooms, general = match_percentages(matches, room_matches, total_unique)
+        for row in rows:
+            row["PorcentajeMatchSalas"] = rooms
+            row["PorcentajeMatchGeneral"] = general
+
+        self.professors.append({
+            "Profesor": nombre, "Asignaturas_A": len(a), "Asignaturas_B": len(b),
+            "Asignaturas_Coincidentes": matches, "Salas_Coincidentes": room_matches,
+            "PorcentajeMatchAsignaturas": subjects, "PorcentajeMatchSalas": rooms,
+            "PorcentajeMatchGeneral": general,
+        })
+        totals = self.totals
+        totals["assignments_a"] += len(a)
+        totals["assignments_b"] += len(b)
+        totals["matches"] += matches
+        totals["room_matches"] += room_matches
+        totals["total_unique"] += total_unique
+        return rows
+
+    def rows(self):
+        """Yield one row per assignment present in either schedule."""
+        empty = {}
+        for nombre, a in self.index_a.items():
+            yield from self.compare_professor(nombre, a, self.index_b.get(nombre, empty))
+        for nombre, b in self.index_b.items():
+            if nombre not in self.index_a:
+                yield from self.compare_professor(nombre, empty, b)
+
+    def summary(self):
+        totals = self.totals
+        subjects, rooms, general = match_percentages(
+            totals["matches"], totals["room_matches"], totals["total_unique"])
+        return {
+            "run_a": self.label_a,
+            "run_b": self.label_b,
+            "assignments_a": totals["assignments_a"],
+            "assignments_b": totals["assignments_b"],
+            "matches": totals["matches"],
+            "room_matches": totals["room_matches"],
+            "subject_match_pct": subjects,
+            "room_match_pct": rooms,
+            "general_match_pct": general,
+        }
+
+
+def write_ndjson(records, output):
+    """Stream records as compact newline-delimited JSON."""
+    count = 0
+    with open(output, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def write_csv(records, output, fieldnames):
+    count = 0
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    return count
+
+
+def write_records(records, output, fieldnames):
+    """Write to NDJSON or CSV depending on the output extension."""
+    if str(output).endswith((".ndjson", ".jsonl")):
+        return write_ndjson(records, output)
+    return write_csv(records, output, fieldnames)
+
+
+def pairwise_agreement(indexes):
+    """
+    Compare N runs pairwise for stability analysis.
+
+    Instead of N*(N-1)/2 separate diffs, every assignment of every run is
+    merged into a single dict keyed on (professor, subject, day, block,
+    activity) -> {run: room}. Each key then only contributes to the pairs
+    of runs that actually contain it, so the cost is one pass over all
+    assignments plus the shared keys, not a rescan per pair.
+
+    Args:
+        indexes (dict): run label -> ``index_schedule`` result.
+
+    Returns:
+        list: One ``PAIR_FIELDS`` dict per pair of runs.
+    """
+    labels = list(indexes)
+    position = {label: i for i, label in enumerate(labels)}
+    sizes = [0] * len(labels)
+    merged = {}
+    for label, index in indexes.items():
+        i = position[label]
+        for nombre, assignments in index.items():
+            sizes[i] += len(assignments)
+            for key, room in assignments.items():
+                merged.setdefault((nombre,) + key, []).append((i, room))
+
+    matches = {}
+    room_matches = {}
+    for present in merged.values():
+        if len(present) < 2:
+            continue
+        for (i, room_i), (j, room_j) in combinations(present, 2):
+            pair = (i, j)
+            matches[pair] = matches.get(pair, 0) + 1
+            if room_i == room_j:
+                room_matches[pair] = room_matches.get(pair, 0) + 1
+
+    results = []
+    for i, j in combinations(range(len(labels)), 2):
+        m = matches.get((i, j), 0)
+        rm = room_matches.get((i, j), 0)
+        subjects, rooms, general = match_percentages(m, rm, sizes[i] + sizes[j] - m)
+        results.append({
+            "run_a": labels[i], "run_b": labels[j],
+            "assignments_a": sizes[i], "assignments_b": sizes[j],
+            "matches": m, "room_matches": rm,
+            "subject_match_pct": subjects, "room_match_pct": rooms,
+            "general_match_pct": general,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare Horarios_asignados.json between platforms or between repeated runs.")
+    parser.add_argument("--scenario", default="full",
+                        help="Compare SPADE_Output/<scenario> against JADE_Output/<scenario>")
+    parser.add_argument("--runs", nargs="+", metavar="LABEL=PATH",
+                        help="Compare these Horarios_asignados.json files pairwise instead")
+    parser.add_argument("--output", help="Row output (.csv, .ndjson or .jsonl)")
+    parser.add_argument("--professors", help="Per-professor summary output (.csv, .ndjson or .jsonl)")
+    args = parser.parse_args()
+
+    if args.runs:
+        indexes = {}
+        for item in args.runs:
+            label, _, path = item.partition("=")
+            if not path:
+                label, path = Path(item).parent.name, item
+            indexes[label] = load_index(path)
+        results = pairwise_agreement(indexes)
+        if args.output:
+            write_records(results, args.output, PAIR_FIELDS)
+        for row in results:
+            print(f"{row['run_a']} vs {row['run_b']}: "
+                  f"asignaturas {row['subject_match_pct']:.2f}%, salas {row['room_match_pct']:.2f}%, "
+                  f"general {row['general_match_pct']:.2f}%")
+        return
+
+    diff = ScheduleDiff(
+        load_index(ROOT_DIR / "SPADE_Output" / args.scenario / "Horarios_asignados.json"),
+        load_index(ROOT_DIR / "JADE_Output" / args.scenario / "Horarios_asignados.json"))
+    output = args.output or f"comparacion_salas_{args.scenario}.csv"
+    count = write_records(diff.rows(), output, diff.fieldnames)
+    print(f"Wrote {count} rows to {output}")
+    if args.professors:
+        write_records(diff.professors, args.professors, PROFESSOR_FIELDS)
+
+    summary = diff.summary()
+    print(f"Asignaturas coincidentes: {summary['matches']} ({summary['subject_match_pct']:.2f}%)")
+    print(f"Salas coincidentes: {summary['room_matches']} ({summary['room_match_pct']:.2f}%)")
+    print(f"Porcentaje de coincidencia general: {summary['general_match_pct']:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
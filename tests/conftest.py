@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The scripts import each other as top-level modules from the repository root and dataset/
+for path in (ROOT, ROOT / "dataset"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
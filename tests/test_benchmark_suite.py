@@ -0,0 +1,20 @@
+import numpy as np
+
+from benchmark_suite import fit_complexity
+
+SIZES = np.array([300, 1_200, 5_000, 3_000, 12_000, 50_000, 30_000, 120_000, 500_000], dtype=float)
+
+
+def test_flat_timings_are_constant():
+    # perfmon-like: 39-57 ms regardless of size
+    times = np.random.default_rng(0).uniform(0.039, 0.057, len(SIZES))
+    fit = fit_complexity(SIZES, times)
+    assert fit["model"] == "O(1)"
+    assert abs(fit["exponent"]) < 0.1
+
+
+def test_scaling_models_are_still_recovered():
+    noise = np.random.default_rng(1).lognormal(0, 0.03, len(SIZES))
+    assert fit_complexity(SIZES, (0.01 + 1e-6 * SIZES) * noise)["model"] == "O(n)"
+    assert fit_complexity(SIZES, (0.01 + 1e-11 * SIZES ** 2) * noise)["model"] == "O(n^2)"
+    assert fit_complexity(SIZES, (0.01 + 0.002 * np.log(SIZES)) * noise)["model"] == "O(log n)"
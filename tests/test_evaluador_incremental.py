@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from Indices.Compactacion import calculate_global_compactness_matrix
+from Indices.EvaluadorIncremental import IncrementalEvaluator
+from Indices.MatrizHorario import DIAS, TOTAL_PERIODOS, build_schedule_tensor
+from Indices.RO import calculate_ro_matrix
+from Indices.SobreCapacidad import calculate_occupation_index
+from Indices.TE import calculate_te_matrix
+
+SALAS = ["A-101", "A-102", "B-201", "LAB-1"]
+CURSOS = ["Calculo", "Algebra", "Fisica", "Quimica", "Programacion"]
+CAPACIDADES = {"A-101": 40, "A-102": 30, "B-201": 25}  # LAB-1 sin capacidad
+VACANTES = {"Calculo-": 35, "Algebra-": 20, "Fisica-": 50, "Quimica-": 15}  # Programacion sin vacantes
+
+
+def recompute(asignaciones):
+    """Índices de `compute_run` recalculados desde cero sobre un Horarios_salas.json equivalente."""
+    horarios_salas = [{"Codigo": codigo, "Asignaturas": [
+        {"Nombre": curso, "Dia": dia, "Bloque": bloque}
+        for sala, dia, bloque, curso in asignaciones if sala == codigo
+    ]} for codigo in SALAS]
+    schedule = build_schedule_tensor(horarios_salas)
+    horarios_asignados = [{"Asignaturas": [{"Sala": sala, "Nombre": curso, "CodigoAsignatura": ""}
+                                           for sala, _, _, curso in asignaciones]}]
+    return {
+        "Ocupacion": calculate_occupation_index(horarios_asignados, CAPACIDADES, VACANTES)["ocupacion_promedio"],
+        "Compactacion": calculate_global_compactness_matrix(schedule),
+        "Room_Occupancy": calculate_ro_matrix(schedule),
+        "Time_Slot_Eligibility": calculate_te_matrix(schedule),
+    }
+
+
+def check(evaluador, asignaciones):
+    actual = evaluador.indices()
+    for nombre, esperado in recompute(asignaciones).items():
+        assert actual[nombre] == pytest.approx(esperado), nombre
+    assert len(evaluador) == len(asignaciones)
+
+
+def random_slot(rng):
+    return rng.choice(SALAS), rng.choice(DIAS), rng.randint(1, TOTAL_PERIODOS)
+
+
+def test_matches_a_full_recompute_over_random_moves():
+    rng = random.Random(0)
+    evaluador = IncrementalEvaluator(SALAS, CAPACIDADES, VACANTES)
+    asignaciones = []
+    for _ in range(40):
+        asignacion = (*random_slot(rng), rng.choice(CURSOS))
+        evaluador.assign(*asignacion)
+        asignaciones.append(asignacion)
+    # Duplicados: la misma asignatura dos veces y dos asignaturas en una franja
+    for asignacion in (asignaciones[0], ("A-101", "Lunes", 3, "Calculo"), ("A-101", "Lunes", 3, "Fisica")):
+        evaluador.assign(*asignacion)
+        asignaciones.append(asignacion)
+    check(evaluador, asignaciones)
+
+    for _ in range(300):
+        i = rng.randrange(len(asignaciones))
+        *origen, curso = asignaciones[i]
+        destino = random_slot(rng)
+
+        antes = evaluador.indices()
+        delta = evaluador.delta(tuple(origen), destino, curso)
+        assert evaluador.indices() == antes
+
+        evaluador.move(tuple(origen), destino, curso)
+        asignaciones[i] = (*destino, curso)
+        check(evaluador, asignaciones)
+        for nombre, cambio in delta.items():
+            assert evaluador.indices()[nombre] - antes[nombre] == pytest.approx(cambio), nombre
+
+    # Quitar todo, también las franjas duplicadas, deja el horario vacío
+    rng.shuffle(asignaciones)
+    while asignaciones:
+        evaluador.unassign(*asignaciones.pop())
+        check(evaluador, asignaciones)
+
+
+def test_unassign_of_a_missing_assignment_raises_and_changes_nothing():
+    evaluador = IncrementalEvaluator(SALAS, CAPACIDADES, VACANTES)
+    evaluador.assign("A-101", "Lunes", 1, "Calculo")
+    antes = evaluador.indices()
+    with pytest.raises(ValueError):
+        evaluador.unassign("A-101", "Lunes", 2, "Calculo")
+    with pytest.raises(ValueError):
+        evaluador.unassign("A-101", "Lunes", 1, "Fisica")
+    assert evaluador.indices() == antes
+    check(evaluador, [("A-101", "Lunes", 1, "Calculo")])
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from Indices import FormatoBinario
+from Indices.FormatoBinario import convertir, leer_columnas
+from Indices.SobreCapacidad import (
+    create_capacity_dict, create_vacancies_dict, load_capacity_dict, load_vacancies_dict,
+)
+
+SALAS = [
+    {"Codigo": "A-101", "Campus": "Kaufmann", "Capacidad": 40, "Turno": 1},
+    {"Codigo": "B-201", "Campus": "Playa Brava", "Capacidad": 25},
+    {"Codigo": "LAB-1", "Campus": "Kaufmann", "Capacidad": 18, "Turno": 2},
+]
+
+PROFESORES = [
+    {"Nombre": "Ana", "RUT": "1-9", "Asignaturas": [
+        {"Nombre": "Calculo", "CodigoAsignatura": "MAT101", "Campus": "Kaufmann", "Vacantes": 35},
+        {"Nombre": "Algebra", "CodigoAsignatura": "MAT102", "Vacantes": 20},
+    ]},
+    {"Nombre": "Luis", "RUT": "2-7", "Asignaturas": [
+        {"Nombre": "Fisica", "Campus": "Playa Brava", "Vacantes": 50},
+    ]},
+]
+
+
+@pytest.fixture(params=["json", "mmap"])
+def escenario(request, tmp_path, monkeypatch):
+    salas, profesores = tmp_path / "salas.json", tmp_path / "profesores.json"
+    salas.write_text(json.dumps(SALAS), encoding="utf-8")
+    profesores.write_text(json.dumps(PROFESORES), encoding="utf-8")
+    if request.param == "mmap":
+        convertir(salas)
+        convertir(profesores)
+        # Fuerza el binario aunque los JSON sean chicos
+        monkeypatch.setattr(FormatoBinario, "TAMANO_MINIMO_COLUMNAS", 0)
+    return salas, profesores
+
+
+def test_columns_match_the_json_objects(escenario):
+    salas, profesores = escenario
+    columnas = leer_columnas(salas, {"Codigo": None, "Turno": 0})
+    assert columnas == {"Codigo": ["A-101", "B-201", "LAB-1"], "Turno": [1, 0, 2]}
+
+    columnas = leer_columnas(profesores, {"CodigoAsignatura": "", "Campus": None}, anidadas=True)
+    assert columnas == {"CodigoAsignatura": ["MAT101", "MAT102", ""],
+                        "Campus": ["Kaufmann", None, "Playa Brava"]}
+
+
+def test_capacity_and_vacancy_dicts_match_the_object_versions(escenario):
+    salas, profesores = escenario
+    assert load_capacity_dict(salas) == create_capacity_dict(SALAS)
+    # create_vacancies_dict exige CodigoAsignatura; la versión por columnas usa '' como Validacion
+    assert load_vacancies_dict(profesores) == {**create_vacancies_dict(PROFESORES[:1]), "Fisica-": 50}
@@ -0,0 +1,35 @@
+import os
+from datetime import datetime
+
+from ingest_runs import ingest, latest_run
+
+
+def write_run(source_root, name, text, mtime):
+    directory = source_root / "JADE_Output" / "rtt_logs" / "small"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / name
+    path.write_text(text, encoding="utf-8")
+    stamp = datetime.fromisoformat(mtime).timestamp()
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_timestamped_runs_are_ordered_by_their_id_not_mtime(tmp_path):
+    source, store = tmp_path / "source", tmp_path / "runs"
+    # The older run was copied around later, so its mtime is newer
+    write_run(source, "rtt_measurements_small_20250620_100000.csv", "newer run\n", "2025-07-01 12:00:00")
+    write_run(source, "rtt_measurements_small_20250619_090000.csv", "older run\n", "2025-07-02 12:00:00")
+    ingest("rtt", source, store, platforms=["JADE"], scenarios=["small"])
+
+    latest = latest_run("rtt", store, platform="JADE", scenario="small")
+    assert os.path.basename(latest) == "rtt_measurements_small_20250620_100000.csv"
+
+
+def test_hash_ids_fall_back_to_the_recorded_mtime(tmp_path):
+    source, store = tmp_path / "source", tmp_path / "runs"
+    write_run(source, "rtt_measurements_small_a.csv", "first\n", "2025-07-01 12:00:00")
+    write_run(source, "rtt_measurements_small_b.csv", "second\n", "2025-07-02 12:00:00")
+    ingest("rtt", source, store, platforms=["JADE"], scenarios=["small"])
+
+    latest = latest_run("rtt", store, platform="JADE", scenario="small")
+    assert os.path.basename(latest) == "rtt_measurements_small_b.csv"
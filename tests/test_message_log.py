@@ -0,0 +1,32 @@
+import pytest
+
+from message_log import iter_pairs, parse_timestamp_ms, reconstruct_conversations
+
+HEADER = "timestamp,agent,agentAction,sender,receivers,performative,conversationId,content,sequenceId\n"
+
+
+def test_timestamps_cross_month_and_year_boundaries():
+    assert (parse_timestamp_ms("2025-06-01 00:00:00.100")
+            - parse_timestamp_ms("2025-05-31 23:59:59.900")) == pytest.approx(200)
+    assert (parse_timestamp_ms("2026-01-01 00:00:01.000")
+            - parse_timestamp_ms("2025-12-31 23:59:59.500")) == pytest.approx(1500)
+
+
+def test_timestamps_are_epoch_milliseconds():
+    assert parse_timestamp_ms("1970-01-02 00:00:00.250") == pytest.approx(86_400_250)
+
+
+def test_lowercase_jid_seen_before_its_capitalised_spelling_still_pairs(tmp_path):
+    # SPADE logs the JID first; the cased local name only shows up on the RECEIVE
+    path = tmp_path / "spade.csv"
+    path.write_text(HEADER
+                    + "2025-05-29 10:00:00.000,SalaCM3,SEND,salacm3@localhost,profesor0@localhost,propose,c1,,1\n"
+                    + "2025-05-29 10:00:00.020,Profesor0,RECEIVE,SalaCM3,Profesor0,PROPOSE,c1,,1\n",
+                    encoding="utf-8")
+
+    pairs = list(iter_pairs(path))
+    assert len(pairs) == 1
+    assert pairs[0][2:5] == ("SalaCM3", "Profesor0", pytest.approx(20))
+
+    [record] = reconstruct_conversations(path)
+    assert (record["matched"], record["unmatched_sends"], record["unmatched_receives"]) == (1, 0, 0)
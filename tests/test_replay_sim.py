@@ -0,0 +1,17 @@
+from pathlib import Path
+
+import pytest
+
+from replay_sim import Trace
+
+LOGS = Path(__file__).resolve().parent.parent / "message_logs" / "small"
+
+
+@pytest.mark.skipif(not (LOGS / "spade.csv").exists() or not (LOGS / "jade.csv").exists(),
+                    reason="small message logs not present")
+def test_both_platforms_see_the_same_rooms_and_professors():
+    # SPADE mixes salacm3@localhost and SalaCM3 for one room; JADE only logs SalaCM3
+    jade = Trace.from_message_log(LOGS / "jade.csv")
+    spade = Trace.from_message_log(LOGS / "spade.csv")
+    assert len(spade.rooms) == len(jade.rooms)
+    assert len(spade.professors) == len(jade.professors)
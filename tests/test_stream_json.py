@@ -0,0 +1,25 @@
+import json
+
+import pytest
+
+from stream_json import JsonArrayReader
+
+NUMERIC_DOCUMENTS = [
+    "[10, 1.5]",
+    "[7e5]",
+    "[1.25e-3, -0.5E+2, 123456789, 3.0, -0, 0.125]",
+    '[{"Capacidad": 45, "Vacantes": 1.5e1}, [2E-2, 40]]',
+    '{"a": 1.5e3, "b": -2, "c": [0.5, 12e+01]}',
+]
+
+
+@pytest.mark.parametrize("document", NUMERIC_DOCUMENTS)
+def test_numbers_split_at_every_chunk_boundary(tmp_path, document):
+    path = tmp_path / "data.json"
+    path.write_text(document, encoding="utf-8")
+    expected = json.loads(document)
+
+    for chunk_size in range(1, len(document) + 2):
+        items = list(JsonArrayReader(path, chunk_size=chunk_size))
+        result = dict(items) if isinstance(expected, dict) else items
+        assert result == expected, f"chunk_size={chunk_size}"
@@ -0,0 +1,82 @@
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+
+import message_log
+import timeline
+from message_log import MESSAGE_LOG_COLUMNS
+
+START = datetime(2025, 5, 31, 23, 59, 59)
+
+
+def write_log(path, pairs, spacing_ms=10, latency_ms=2):
+    """A message log with one CFP SEND/RECEIVE pair every ``spacing_ms``, crossing a month boundary."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(MESSAGE_LOG_COLUMNS)
+        for i in range(pairs):
+            sent = START + timedelta(milliseconds=i * spacing_ms)
+            received = sent + timedelta(milliseconds=latency_ms)
+            for ts, action in ((sent, "SEND"), (received, "RECEIVE")):
+                writer.writerow([ts.isoformat(sep=" ", timespec="milliseconds"), "Profesor0", action,
+                                 "Profesor0", "SalaA", "cfp", f"conv-{i}", "", i])
+
+
+class RecordingTimeline(timeline.WindowedTimeline):
+    def __init__(self, *args, log_done, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.log_done = log_done
+        self.batches = []
+
+    def add_messages(self, timestamps_ms, sizes=None):
+        self.batches.append((len(timestamps_ms), self.log_done[0]))
+        super().add_messages(timestamps_ms, sizes)
+
+
+def test_message_log_is_fed_in_batches_while_reading(tmp_path, monkeypatch):
+    path = tmp_path / "log.csv"
+    write_log(path, pairs=1061)
+
+    log_done = [False]
+    iter_events = message_log.iter_events
+
+    def tracked(path):
+        yield from iter_events(path)
+        log_done[0] = True
+
+    monkeypatch.setattr(message_log, "iter_events", tracked)
+    recorder = RecordingTimeline("SPADE", 1000, log_done=log_done)
+    rows = list(timeline.feed_message_log(path, [recorder], batch_size=50))
+
+    sizes = [size for size, _ in recorder.batches]
+    assert sum(sizes) == 1061
+    assert max(sizes) <= 50
+    # Every full batch reached the timeline before the whole log was read
+    assert not any(done for size, done in recorder.batches if size == 50)
+    assert sum(row["messages"] for row in rows) == 1061
+
+
+def test_in_flight_is_time_weighted(tmp_path):
+    path = tmp_path / "log.csv"
+    write_log(path, pairs=300, spacing_ms=10, latency_ms=2)
+
+    rows = list(timeline.feed_message_log(path, timeline.build_timelines("SPADE", [1000])))
+
+    assert sum(row["messages"] for row in rows) == 300
+    # 300 exchanges of 2 ms each over three 1 s buckets
+    total = sum(row["in_flight_avg"] for row in rows) * 1000
+    assert total == pytest.approx(300 * 2)
+    assert max(row["in_flight_max"] for row in rows) <= 1
+
+
+
+def test_exchanges_longer_than_the_lateness_are_counted():
+    line = timeline.WindowedTimeline("JADE", resolution_ms=100, lateness_ms=100)
+    line.add_messages([0, 950])
+    rows = list(line.drain())
+    assert rows and line.next_index == 9
+
+    # Started at 50 ms, in a bucket that is already closed
+    line.add_in_flight([50, 900], [1000, 1000])
+    assert line.late_in_flight == 1
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from Indices.Validacion import NOMBRE_REPORTE, filtrar_validas, validar_ejecucion
+
+SALAS = [
+    {"Codigo": "A", "Campus": "Kaufmann", "Capacidad": 40},
+    {"Codigo": "B", "Campus": "Kaufmann", "Capacidad": 20},
+    {"Codigo": "C", "Campus": "Playa Brava", "Capacidad": 50},
+]
+
+PROFESORES = [
+    {"Nombre": "P1", "Asignaturas": [
+        {"Nombre": "Calculo", "CodigoAsignatura": "MAT1", "Campus": "Kaufmann", "Vacantes": 30},
+        {"Nombre": "Fisica", "CodigoAsignatura": "FIS1", "Campus": "Kaufmann", "Vacantes": 30},
+        {"Nombre": "Algebra", "CodigoAsignatura": "ALG1", "Campus": "Kaufmann", "Vacantes": 10},
+    ]},
+    {"Nombre": "P2", "Asignaturas": [
+        {"Nombre": "Quimica", "CodigoAsignatura": "QUI1", "Campus": "Playa Brava", "Vacantes": 30},
+        {"Nombre": "Historia", "CodigoAsignatura": "HIS1", "Campus": "Playa Brava", "Vacantes": 30},
+    ]},
+]
+
+# (profesor, asignatura, código, sala, día, bloque)
+ASIGNACIONES = [
+    ("P1", "Calculo", "MAT1", "A", "LUNES", 1),
+    ("P1", "Fisica", "FIS1", "B", "LUNES", 1),       # choque_profesor con Calculo; sobre_capacidad 30 > 20
+    ("P1", "Algebra", "ALG1", "A", "MARTES", 2),
+    ("P2", "Quimica", "QUI1", "A", "MARTES", 2),     # sala_doble_reserva con Algebra; campus_distinto
+    ("P2", "Historia", "HIS1", "Z", "MIERCOLES", 3),  # sala_desconocida
+    ("P2", "Arte", "ART1", "C", "JUEVES", 4),         # asignatura_desconocida
+]
+
+
+def write(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def run(tmp_path):
+    salida = tmp_path / "SPADE_Output" / "small"
+    salida.mkdir(parents=True)
+    asignados = [{"Nombre": profesor, "Asignaturas": [
+        {"Nombre": nombre, "CodigoAsignatura": codigo, "Sala": sala, "Dia": dia, "Bloque": bloque}
+        for p, nombre, codigo, sala, dia, bloque in ASIGNACIONES if p == profesor
+    ]} for profesor in ("P1", "P2")]
+    por_sala = [{"Codigo": codigo, "Asignaturas": [
+        {"Nombre": nombre, "CodigoAsignatura": codigo_asignatura, "Dia": dia, "Bloque": bloque}
+        for _, nombre, codigo_asignatura, sala, dia, bloque in ASIGNACIONES if sala == codigo
+    ]} for codigo in ("A", "B", "C", "Z")]
+    return {
+        "platform": "SPADE", "scenario": "small", "run": "latest",
+        "horarios_salas": write(salida / "Horarios_salas.json", por_sala),
+        "horarios_asignados": write(salida / "Horarios_asignados.json", asignados),
+        "salas": write(tmp_path / "salas.json", SALAS),
+        "profesores": write(tmp_path / "profesores.json", PROFESORES),
+    }
+
+
+def test_one_of_each_violation(run):
+    reporte = validar_ejecucion(run)
+    assert reporte["filas"] == {
+        "sala_doble_reserva": 2, "choque_profesor": 2, "campus_distinto": 1,
+        "sobre_capacidad": 1, "sala_desconocida": 1, "asignatura_desconocida": 1,
+    }
+    assert reporte["distintos"] == {nombre: 1 for nombre in reporte["filas"]}
+    assert not reporte["valida"]
+    assert reporte["detalles"]["sobre_capacidad"][0]["sala"] == "B"
+    assert reporte["detalles"]["campus_distinto"][0]["campus_asignatura"] == "Playa Brava"
+
+
+def test_filtrar_validas_writes_no_report(run, tmp_path):
+    assert filtrar_validas([run]) == []
+    assert not list(tmp_path.rglob(NOMBRE_REPORTE))
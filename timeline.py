@@ -0,0 +1,303 @@
+import os
+import csv
+import argparse
+from collections import deque
+import numpy as np
+import pandas as pd
+
+from rtt_reader import iter_rtt_chunks
+from rtt_sketch import LatencySketch, DEFAULT_RELATIVE_ACCURACY
+from message_log import iter_pairs
+
+DEFAULT_RESOLUTIONS_MS = [10, 100, 1000]
+
+# How far behind the newest event a bucket stays open for late events
+DEFAULT_LATENESS_MS = 1000
+
+TIMELINE_COLUMNS = [
+    "Platform", "resolution_ms", "window_ms", "window_start", "window_end",
+    "messages", "messages_per_s", "bytes_per_s", "in_flight_avg", "in_flight_max",
+    "rtt_p50", "rtt_p95", "rtt_p99",
+]
+
+
+class Bucket:
+    """Aggregates of one resolution step."""
+
+    __slots__ = ("messages", "bytes", "sketch", "in_flight_delta", "in_flight_partial", "in_flight")
+
+    def __init__(self, relative_accuracy):
+        self.messages = 0
+        self.bytes = 0
+        self.sketch = LatencySketch(relative_accuracy)
+        # Change in exchanges covering the whole bucket, from this bucket on
+        self.in_flight_delta = 0
+        # Exchanges covering part of the bucket, as a fraction of the bucket
+        self.in_flight_partial = 0.0
+        self.in_flight = 0.0
+
+
+class WindowedTimeline:
+    """
+    Streaming tumbling/sliding windows over message events.
+
+    Events are added in (roughly) time order and folded into buckets of
+    ``resolution_ms``. A bucket is closed once the newest event is more
+    than ``lateness_ms`` past its end; closed buckets are emitted in order,
+    with empty buckets filled in so rates stay correct. With ``window_ms``
+    equal to the resolution the windows are tumbling; a larger multiple
+    gives sliding windows that advance one bucket at a time. Only the open
+    buckets and the last window are kept, so memory does not grow with the run.
+
+    In-flight is the time-weighted number of request/response exchanges
+    outstanding in a bucket: each interval passed to ``add_in_flight``
+    adds the fraction of the bucket it overlaps. The window reports the
+    mean over its buckets and the busiest bucket. An exchange is added
+    when it ends, so one that started in an already closed bucket (an RTT
+    longer than ``lateness_ms``) has its head folded into the oldest open
+    bucket; ``late_in_flight`` counts them, and ``lateness_ms`` should be
+    at least the longest RTT for exact in-flight values.
+
+    Timestamps are milliseconds since the epoch.
+    """
+
+    def __init__(self, platform, resolution_ms=100, window_ms=None,
+                 lateness_ms=DEFAULT_LATENESS_MS, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        window_ms = window_ms or resolution_ms
+        if window_ms % resolution_ms:
+            raise ValueError("window_ms must be a multiple of resolution_ms")
+        self.platform = platform
+        self.resolution_ms = resolution_ms
+        self.window_ms = window_ms
+        self.window_buckets = window_ms // resolution_ms
+        self.lateness_buckets = -(-lateness_ms // resolution_ms)
+        self.relative_accuracy = relative_accuracy
+
+        self.open = {}
+        self.next_index = None
+        self.max_index = None
+        self.in_flight = 0
+        self.late_in_flight = 0
+        self.window = deque(maxlen=self.window_buckets)
+
+    def bucket(self, index):
+        if self.next_index is not None and index < self.next_index:
+            # Too late: fold into the oldest bucket still open
+            index = self.next_index
+        bucket = self.open.get(index)
+        if bucket is None:
+            bucket = self.open[index] = Bucket(self.relative_accuracy)
+            if self.next_index is None:
+                self.next_index = index
+            if self.max_index is None or index > self.max_index:
+                self.max_index = index
+        return bucket
+
+    def add_messages(self, timestamps_ms, sizes=None):
+        """Count messages (and their bytes) at the given times."""
+        indexes = np.floor_divide(np.asarray(timestamps_ms, dtype="float64"), self.resolution_ms).astype("int64")
+        sizes = np.zeros(len(indexes)) if sizes is None else np.asarray(sizes, dtype="float64")
+        unique, inverse = np.unique(indexes, return_inverse=True)
+        counts = np.bincount(inverse)
+        totals = np.bincount(inverse, weights=sizes)
+        for index, count, total in zip(unique.tolist(), counts.tolist(), totals.tolist()):
+            bucket = self.bucket(index)
+            bucket.messages += count
+            bucket.bytes += total
+
+    def add_latencies(self, timestamps_ms, latencies_ms):
+        """Add RTT samples to the sketches of the buckets they complete in."""
+        indexes = np.floor_divide(np.asarray(timestamps_ms, dtype="float64"), self.resolution_ms).astype("int64")
+        latencies_ms = np.asarray(latencies_ms, dtype="float64")
+        order = np.argsort(indexes, kind="stable")
+        indexes, latencies_ms = indexes[order], latencies_ms[order]
+        unique, starts = np.unique(indexes, return_index=True)
+        for index, values in zip(unique.tolist(), np.split(latencies_ms, starts[1:])):
+            self.bucket(index).sketch.add_many(values)
+
+    def add_in_flight(self, starts_ms, ends_ms):
+        """Add exchanges outstanding from ``start`` to ``end``, weighted by their overlap with each bucket."""
+        ends_ms = np.asarray(ends_ms, dtype="float64")
+        starts_ms = np.minimum(np.asarray(starts_ms, dtype="float64"), ends_ms)
+        first = np.floor_divide(starts_ms, self.resolution_ms).astype("int64")
+        last = np.floor_divide(ends_ms, self.resolution_ms).astype("int64")
+        if self.next_index is not None:
+            self.late_in_flight += int(np.count_nonzero(first < self.next_index))
+
+        # Same bucket: the whole interval; otherwise the head of the first
+        # bucket, the tail of the last one and every bucket in between
+        single = first == last
+        head = np.where(single, ends_ms, (first + 1) * self.resolution_ms) - starts_ms
+        tail = ends_ms - last * self.resolution_ms
+        spans = ~single
+        partial = ((first, head), (last[spans], tail[spans]))
+        covered = ((first[spans] + 1, 1), (last[spans], -1))
+
+        for indexes, weights in partial:
+            unique, inverse = np.unique(indexes, return_inverse=True)
+            totals = np.bincount(inverse, weights=weights) / self.resolution_ms
+            for index, total in zip(unique.tolist(), totals.tolist()):
+                self.bucket(index).in_flight_partial += total
+        for indexes, sign in covered:
+            unique, counts = np.unique(indexes, return_counts=True)
+            for index, count in zip(unique.tolist(), counts.tolist()):
+                self.bucket(index).in_flight_delta += sign * count
+
+    def drain(self, final=False):
+        """Yield the windows whose buckets can no longer change."""
+        if self.next_index is None:
+            return
+        last = self.max_index if final else self.max_index - self.lateness_buckets
+        while self.next_index <= last:
+            index = self.next_index
+            bucket = self.open.pop(index, None) or Bucket(self.relative_accuracy)
+            self.next_index = index + 1
+            # Running sum of the fully covered exchanges plus the partial overlaps
+            self.in_flight += bucket.in_flight_delta
+            bucket.in_flight = self.in_flight + bucket.in_flight_partial
+            self.window.append((index, bucket))
+            if len(self.window) == self.window_buckets or final:
+                yield self.window_row()
+        if final:
+            self.open.clear()
+
+    def window_row(self):
+        first_index = self.window[0][0]
+        last_index = self.window[-1][0]
+        buckets = [bucket for _, bucket in self.window]
+        seconds = len(buckets) * self.resolution_ms / 1000
+
+        sketch = LatencySketch(self.relative_accuracy)
+        for bucket in buckets:
+            sketch.merge(bucket.sketch)
+        p50, p95, p99 = sketch.quantiles([0.5, 0.95, 0.99])
+        messages = sum(bucket.messages for bucket in buckets)
+        in_flight = [bucket.in_flight for bucket in buckets]
+
+        return {
+            "Platform": self.platform,
+            "resolution_ms": self.resolution_ms,
+            "window_ms": self.window_ms,
+            "window_start": pd.Timestamp(first_index * self.resolution_ms, unit="ms"),
+            "window_end": pd.Timestamp((last_index + 1) * self.resolution_ms, unit="ms"),
+            "messages": messages,
+            "messages_per_s": messages / seconds,
+            "bytes_per_s": sum(bucket.bytes for bucket in buckets) / seconds,
+            "in_flight_avg": sum(in_flight) / len(in_flight),
+            "in_flight_max": max(in_flight),
+            "rtt_p50": p50,
+            "rtt_p95": p95,
+            "rtt_p99": p99,
+        }
+
+
+def feed_rtt(path, timelines, encoding=None):
+    """
+    Stream an RTT CSV into one or more timelines in a single pass.
+
+    The Timestamp of an RTT row is when the reply arrived (JADE conversation
+    ids carry the send time, which is Timestamp - RTT_ms), so each row is an
+    exchange outstanding from ``Timestamp - RTT_ms`` to ``Timestamp``.
+
+    Yields:
+        dict: Window rows of all timelines as they close.
+    """
+    for chunk in iter_rtt_chunks(path, encoding):
+        timestamps = chunk["Timestamp"].to_numpy("datetime64[ns]").astype("int64") / 1e6
+        rtt = chunk["RTT_ms"].to_numpy("float64")
+        sizes = chunk["MessageSize_bytes"].to_numpy("float64")
+        valid = ~np.isnan(rtt)
+        for timeline in timelines:
+            timeline.add_messages(timestamps, sizes)
+            timeline.add_latencies(timestamps[valid], rtt[valid])
+            timeline.add_in_flight(timestamps[valid] - rtt[valid], timestamps[valid])
+            yield from timeline.drain()
+    for timeline in timelines:
+        yield from timeline.drain(final=True)
+
+
+def feed_message_log(path, timelines, batch_size=10_000):
+    """
+    Stream a message log into timelines using its SEND/RECEIVE pairs.
+
+    Every delivered message counts at its RECEIVE time, its latency feeds the
+    quantiles and it is in flight between SEND and RECEIVE. Pairs are added
+    in batches of ``batch_size`` as they are matched, so memory does not
+    grow with the log. Message logs carry no size, so bytes/s stays 0.
+    """
+    received, latencies = [], []
+
+    def flush():
+        ends = np.asarray(received)
+        values = np.asarray(latencies)
+        for timeline in timelines:
+            timeline.add_messages(ends)
+            timeline.add_latencies(ends, values)
+            timeline.add_in_flight(ends - values, ends)
+            yield from timeline.drain()
+        received.clear()
+        latencies.clear()
+
+    for _, _, _, _, latency, received_ms in iter_pairs(path):
+        received.append(received_ms)
+        latencies.append(latency)
+        if len(received) >= batch_size:
+            yield from flush()
+    if received:
+        yield from flush()
+    for timeline in timelines:
+        yield from timeline.drain(final=True)
+
+
+def build_timelines(platform, resolutions_ms=DEFAULT_RESOLUTIONS_MS, window_ms=None, **kwargs):
+    """One timeline per resolution; ``window_ms`` makes them sliding."""
+    return [WindowedTimeline(platform, resolution, max(window_ms or resolution, resolution), **kwargs)
+            for resolution in resolutions_ms]
+
+
+def write_timeline(rows, output):
+    count = 0
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=TIMELINE_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput, in-flight and RTT quantile timelines.")
+    parser.add_argument("--scenario", default="full")
+    parser.add_argument("--source", choices=["rtt", "message_logs"], default="rtt")
+    parser.add_argument("--resolution", type=int, nargs="+", default=DEFAULT_RESOLUTIONS_MS,
+                        help="Bucket sizes in ms")
+    parser.add_argument("--window", type=int, help="Sliding window length in ms (default: tumbling)")
+    parser.add_argument("--lateness", type=int, default=DEFAULT_LATENESS_MS)
+    parser.add_argument("--output", help="Default: timeline_<source>_<scenario>.csv")
+    args = parser.parse_args()
+
+    base_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), args.source, args.scenario)
+    feed = feed_rtt if args.source == "rtt" else feed_message_log
+
+    def rows():
+        for platform in ("jade", "spade"):
+            path = os.path.join(base_dir, f"{platform}.csv")
+            if not os.path.exists(path):
+                print(f"No {args.source} file found at {path}")
+                continue
+            timelines = build_timelines(platform.upper(), args.resolution, args.window,
+                                        lateness_ms=args.lateness)
+            yield from feed(path, timelines)
+            late = max(timeline.late_in_flight for timeline in timelines)
+            if late:
+                print(f"{platform}: {late} exchanges outlasted --lateness {args.lateness} ms; "
+                      f"their in-flight time was folded into later windows")
+
+    output = args.output or f"timeline_{args.source}_{args.scenario}.csv"
+    count = write_timeline(rows(), output)
+    print(f"Wrote {count} windows to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,572 @@
+import os
+import csv
+import ssl
+import time
+import uuid
+import base64
+import random
+import asyncio
+import argparse
+from collections import deque
+from datetime import datetime
+from xml.etree.ElementTree import XMLPullParser
+from xml.sax.saxutils import escape, quoteattr
+
+from rtt_reader import RTT_COLUMNS
+from rtt_sketch import LatencySketch
+
+NS_STREAM = "http://etherx.jabber.org/streams"
+NS_CLIENT = "jabber:client"
+NS_SASL = "urn:ietf:params:xml:ns:xmpp-sasl"
+NS_BIND = "urn:ietf:params:xml:ns:xmpp-bind"
+NS_TLS = "urn:ietf:params:xml:ns:xmpp-tls"
+NS_REGISTER = "jabber:iq:register"
+NS_DATA = "jabber:x:data"
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+ONTOLOGY = "classroom-availability"
+DEFAULT_DOMAIN = "localhost"
+DEFAULT_PAYLOAD_BYTES = 100
+
+
+def stream_header(to=None, from_=None, stream_id=None):
+    attributes = ""
+    if to:
+        attributes += f" to={quoteattr(to)}"
+    if from_:
+        attributes += f" from={quoteattr(from_)}"
+    if stream_id:
+        attributes += f" id={quoteattr(stream_id)}"
+    return (f"<?xml version='1.0'?><stream:stream xmlns='{NS_CLIENT}' "
+            f"xmlns:stream='{NS_STREAM}' version='1.0'{attributes}>")
+
+
+def message_stanza(to, thread, performative, body, stanza_id=None):
+    """A chat message carrying the FIPA metadata the way SPADE does (a data form)."""
+    return (
+        f"<message to={quoteattr(to)} type='chat' id={quoteattr(stanza_id or uuid.uuid4().hex)}>"
+        f"<body>{escape(body)}</body><thread>{escape(thread)}</thread>"
+        f"<x xmlns='{NS_DATA}' type='form'>"
+        f"<field var='performative'><value>{performative}</value></field>"
+        f"<field var='ontology'><value>{ONTOLOGY}</value></field>"
+        f"</x></message>"
+    )
+
+
+def local(tag):
+    """``{namespace}name`` -> ``name``."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def bare(jid):
+    return jid.split("/", 1)[0]
+
+
+class XmlStream:
+    """
+    One side of an XMPP XML stream over asyncio streams.
+
+    Incoming bytes are fed to an ``XMLPullParser``; every complete child of
+    the stream root (a stanza or nonza) is queued as an Element and detached
+    from the root so a long stream does not accumulate a tree. The parser
+    is replaced on every stream restart (after STARTTLS and SASL).
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.pending = deque()
+        self.reset()
+
+    def reset(self):
+        self.parser = XMLPullParser(events=("start", "end"))
+        self.depth = 0
+        self.header = None
+        self.closed = False
+
+    def send(self, data):
+        self.writer.write(data.encode("utf-8"))
+
+    async def drain(self):
+        await self.writer.drain()
+
+    def process(self):
+        for event, element in self.parser.read_events():
+            if event == "start":
+                self.depth += 1
+                if self.depth == 1:
+                    self.header = element
+                continue
+            self.depth -= 1
+            if self.depth == 1:
+                self.header.remove(element)
+                self.pending.append(element)
+            elif self.depth == 0:
+                self.closed = True
+
+    async def feed(self):
+        data = await self.reader.read(65536)
+        if not data:
+            self.closed = True
+            return
+        self.parser.feed(data)
+        self.process()
+
+    async def read(self):
+        """Next top-level element, or None when the stream ends."""
+        while not self.pending:
+            if self.closed:
+                return None
+            await self.feed()
+        return self.pending.popleft()
+
+    async def read_header(self):
+        """Wait for the peer's ``<stream:stream>`` opening tag."""
+        while self.header is None:
+            if self.closed:
+                raise ConnectionError("Stream closed before its header")
+            await self.feed()
+        return self.header
+
+    def close(self):
+        try:
+            self.send("</stream:stream>")
+        except Exception:
+            pass
+        self.writer.close()
+
+
+class XmppClient:
+    """
+    Minimal XMPP client: STARTTLS (optional), in-band registration (optional),
+    SASL PLAIN, resource binding and chat messages. Enough to drive Prosody,
+    ejabberd or the bundled stand-in with the SPADE message pattern.
+    """
+
+    def __init__(self, jid, password, host, port=5222, tls=False, register=False):
+        self.jid = jid
+        self.password = password
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self.register = register
+        self.user, self.domain = jid.split("@", 1)
+        self.stream = None
+        self.bound_jid = None
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.stream = XmlStream(reader, writer)
+        features = await self.open_stream()
+
+        if features.find(f"{{{NS_TLS}}}starttls") is not None and self.tls:
+            self.stream.send(f"<starttls xmlns='{NS_TLS}'/>")
+            answer = await self.stream.read()
+            if local(answer.tag) != "proceed":
+                raise ConnectionError("STARTTLS refused")
+            context = ssl.create_default_context()
+            # Local benchmark servers use self-signed certificates
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+            await writer.start_tls(context, server_hostname=self.domain)
+            features = await self.open_stream()
+
+        if self.register:
+            await self.register_account()
+
+        credentials = base64.b64encode(f"\0{self.user}\0{self.password}".encode()).decode()
+        self.stream.send(f"<auth xmlns='{NS_SASL}' mechanism='PLAIN'>{credentials}</auth>")
+        answer = await self.stream.read()
+        if answer is None or local(answer.tag) != "success":
+            raise ConnectionError(f"Authentication failed for {self.jid}")
+
+        await self.open_stream()
+        self.stream.send(f"<iq type='set' id='bind'><bind xmlns='{NS_BIND}'>"
+                         f"<resource>loadgen</resource></bind></iq>")
+        answer = await self.stream.read()
+        jid = answer.find(f"{{{NS_BIND}}}bind/{{{NS_BIND}}}jid") if answer is not None else None
+        if jid is None:
+            raise ConnectionError(f"Resource binding failed for {self.jid}")
+        self.bound_jid = jid.text
+        self.stream.send("<presence/>")
+        await self.stream.drain()
+
+    async def open_stream(self):
+        self.stream.reset()
+        self.stream.send(stream_header(to=self.domain))
+        await self.stream.drain()
+        await self.stream.read_header()
+        features = await self.stream.read()
+        if features is None or local(features.tag) != "features":
+            raise ConnectionError("Expected stream features")
+        return features
+
+    async def register_account(self):
+        """XEP-0077 in-band registration; an existing account is not an error."""
+        self.stream.send(f"<iq type='set' id='reg'><query xmlns='{NS_REGISTER}'>"
+                         f"<username>{escape(self.user)}</username>"
+                         f"<password>{escape(self.password)}</password></query></iq>")
+        await self.stream.drain()
+        await self.stream.read()
+
+    async def messages(self):
+        """Yield incoming ``<message>`` elements until the connection closes."""
+        while True:
+            element = await self.stream.read()
+            if element is None:
+                return
+            if local(element.tag) == "message":
+                yield element
+
+    def send_message(self, to, thread, performative, body):
+        stanza = message_stanza(to, thread, performative, body)
+        self.stream.send(stanza)
+        return len(stanza.encode("utf-8"))
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+
+
+def message_fields(element):
+    """(sender, thread, performative, body) of a received message."""
+    performative = None
+    for field in element.iter(f"{{{NS_DATA}}}field"):
+        if field.get("var") == "performative":
+            value = field.find(f"{{{NS_DATA}}}value")
+            performative = value.text if value is not None else None
+    thread = element.find(f"{{{NS_CLIENT}}}thread")
+    body = element.find(f"{{{NS_CLIENT}}}body")
+    return (element.get("from", ""), thread.text if thread is not None else "",
+            performative, body.text if body is not None else "")
+
+
+class StandInServer:
+    """
+    Minimal single-process XMPP router for running the harness without a broker.
+
+    Accepts any SASL PLAIN credentials, binds one resource per connection and
+    routes ``<message>`` stanzas to the bare JID's session. It has no TLS,
+    rosters or offline storage; it only measures the harness and the Python
+    asyncio baseline, not a production server.
+    """
+
+    def __init__(self, domain=DEFAULT_DOMAIN):
+        self.domain = domain
+        self.sessions = {}
+        self.server = None
+        self.handlers = set()
+
+    async def start(self, host="127.0.0.1", port=0):
+        self.server = await asyncio.start_server(self.handle, host, port)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop listening and let the open sessions see their clients' EOF."""
+        self.server.close()
+        if self.handlers:
+            await asyncio.wait(self.handlers, timeout=5)
+        for task in self.handlers:
+            task.cancel()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        task.add_done_callback(self.handlers.discard)
+        stream = XmlStream(reader, writer)
+        jid = None
+        user = None
+        try:
+            await stream.read_header()
+            stream.send(stream_header(from_=self.domain, stream_id=uuid.uuid4().hex))
+            stream.send(f"<stream:features><mechanisms xmlns='{NS_SASL}'>"
+                        f"<mechanism>PLAIN</mechanism></mechanisms></stream:features>")
+            while user is None:
+                element = await stream.read()
+                if element is None:
+                    return
+                if local(element.tag) == "auth":
+                    user = base64.b64decode(element.text or "").split(b"\0")[1].decode()
+                    stream.send(f"<success xmlns='{NS_SASL}'/>")
+                elif local(element.tag) == "iq":
+                    stream.send(f"<iq type='result' id={quoteattr(element.get('id', ''))}/>")
+
+            stream.reset()
+            await stream.read_header()
+            stream.send(stream_header(from_=self.domain, stream_id=uuid.uuid4().hex))
+            stream.send(f"<stream:features><bind xmlns='{NS_BIND}'/></stream:features>")
+
+            while True:
+                element = await stream.read()
+                if element is None:
+                    return
+                kind = local(element.tag)
+                if kind == "iq" and element.find(f"{{{NS_BIND}}}bind") is not None:
+                    jid = f"{user}@{self.domain}/loadgen"
+                    self.sessions[bare(jid)] = stream
+                    stream.send(f"<iq type='result' id={quoteattr(element.get('id', ''))}>"
+                                f"<bind xmlns='{NS_BIND}'><jid>{jid}</jid></bind></iq>")
+                elif kind == "message" and jid is not None:
+                    target = self.sessions.get(bare(element.get("to", "")))
+                    if target is not None:
+                        sender, thread, performative, body = message_fields(element)
+                        target.writer.write(
+                            message_stanza(element.get("to"), thread, performative or "", body)
+                            .replace("<message ", f"<message from={quoteattr(jid)} ", 1)
+                            .encode("utf-8"))
+                await stream.drain()
+        except (ConnectionError, IndexError, ValueError):
+            pass
+        finally:
+            if jid is not None and self.sessions.get(bare(jid)) is stream:
+                del self.sessions[bare(jid)]
+            writer.close()
+
+
+def load_patterns(path):
+    """
+    Negotiation rounds recorded in a SPADE message log.
+
+    A round is the run of CFPs one professor sends under one conversation
+    id, followed by the rooms' PROPOSE/REFUSE replies and an optional
+    ACCEPT_PROPOSAL.
+
+    Returns:
+        list: ``(fan_out, refusals, accepted, payload_bytes)`` tuples.
+    """
+    rounds = {}
+    order = []
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        for row in csv.DictReader(f):
+            if row["agentAction"] != "SEND":
+                continue
+            performative = row["performative"].lower().replace("_", "-")
+            conversation = row["conversationId"]
+            if performative == "cfp":
+                key = (row["sender"].lower(), conversation)
+                current = rounds.get(key)
+                if current is None or current["closed"]:
+                    current = rounds[key] = {"fan_out": 0, "refusals": 0, "accepted": False,
+                                             "payload": len(row["content"]), "closed": False}
+                    order.append(current)
+                current["fan_out"] += 1
+            elif performative in ("propose", "refuse", "accept-proposal"):
+                professor = (row["receivers"] if performative != "accept-proposal" else row["sender"])
+                current = rounds.get((professor.split("@", 1)[0].lower(), conversation))
+                if current is None:
+                    continue
+                if performative == "refuse":
+                    current["refusals"] += 1
+                elif performative == "accept-proposal":
+                    current["accepted"] = True
+                    current["closed"] = True
+    return [(r["fan_out"], min(r["refusals"], r["fan_out"]), r["accepted"], r["payload"])
+            for r in order if r["fan_out"]]
+
+
+class LoadGenerator:
+    """
+    Replays CFP/PROPOSE rounds between professor and room agents over XMPP.
+
+    Every agent is its own XMPP session. Professors start rounds at ``rate``
+    rounds per second (0 = as fast as possible), with at most
+    ``concurrency`` rounds in flight over all professors; rooms answer each
+    CFP with PROPOSE (or REFUSE, following the recorded pattern). Each reply
+    becomes one row of the RTT schema, timed from CFP send to reply receipt.
+    """
+
+    def __init__(self, host, port, professors, rooms, patterns, domain=DEFAULT_DOMAIN,
+                 concurrency=100, rate=0.0, rounds=1000, payload_bytes=None,
+                 tls=False, register=False, password="loadgen", seed=0):
+        self.host = host
+        self.port = port
+        self.domain = domain
+        self.professor_names = [f"profesor{i}" for i in range(professors)]
+        self.room_names = [f"sala{i}" for i in range(rooms)]
+        self.patterns = patterns
+        self.concurrency = concurrency
+        self.rate = rate
+        self.rounds = rounds
+        self.payload_bytes = payload_bytes
+        self.tls = tls
+        self.register = register
+        self.password = password
+        self.rng = random.Random(seed)
+
+        self.clients = {}
+        self.pending = {}
+        self.rows = []
+        self.sketch = LatencySketch()
+        self.tasks = []
+
+    def client(self, name):
+        return XmppClient(f"{name}@{self.domain}", self.password, self.host, self.port,
+                          self.tls, self.register)
+
+    async def connect_all(self):
+        names = self.professor_names + self.room_names
+        clients = [self.client(name) for name in names]
+        await asyncio.gather(*(c.connect() for c in clients))
+        self.clients = dict(zip(names, clients))
+
+    async def room_loop(self, name):
+        client = self.clients[name]
+        async for element in client.messages():
+            sender, thread, performative, body = message_fields(element)
+            if performative != "cfp":
+                continue
+            reply = "refuse" if body.startswith("refuse") else "propose"
+            client.send_message(bare(sender), thread, reply, body)
+            await client.stream.drain()
+
+    async def professor_loop(self, name):
+        client = self.clients[name]
+        async for element in client.messages():
+            sender, thread, performative, body = message_fields(element)
+            waiter = self.pending.get((thread, bare(sender)))
+            if waiter is not None and not waiter.done():
+                waiter.set_result((performative, time.perf_counter(), datetime.now().isoformat()))
+
+    async def run_round(self, professor, pattern, limiter):
+        fan_out, refusals, accepted, payload = pattern
+        payload = self.payload_bytes or payload or DEFAULT_PAYLOAD_BYTES
+        client = self.clients[professor]
+        loop = asyncio.get_running_loop()
+        thread = f"cfp-{uuid.uuid4()}"
+        rooms = self.rng.sample(self.room_names, min(fan_out, len(self.room_names)))
+
+        waiters = {}
+        sizes = {}
+        sent_at = time.perf_counter()
+        for i, room in enumerate(rooms):
+            jid = f"{room}@{self.domain}"
+            # The room answers REFUSE when the body says so, reproducing the recorded mix
+            body = ("refuse" if i < refusals else "propose").ljust(payload, "x")
+            waiters[jid] = self.pending[(thread, jid)] = loop.create_future()
+            sizes[jid] = client.send_message(jid, thread, "cfp", body)
+        await client.stream.drain()
+
+        try:
+            for jid, waiter in waiters.items():
+                try:
+                    performative, received_at, timestamp = await asyncio.wait_for(waiter, timeout=30)
+                    success = True
+                except asyncio.TimeoutError:
+                    performative, received_at, success = "timeout", time.perf_counter(), False
+                    timestamp = datetime.now().isoformat()
+                rtt_ms = (received_at - sent_at) * 1000
+                if success:
+                    self.sketch.add(rtt_ms)
+                self.rows.append({
+                    "Timestamp": timestamp,
+                    "Sender": professor,
+                    "Receiver": jid,
+                    "ConversationID": thread,
+                    "Performative": performative,
+                    "RTT_ms": f"{rtt_ms:.3f}",
+                    "MessageSize_bytes": sizes[jid],
+                    "Success": success,
+                    "AdditionalInfo": "",
+                    "Ontology": ONTOLOGY,
+                })
+            if accepted and rooms:
+                client.send_message(f"{rooms[-1]}@{self.domain}", thread, "accept-proposal", "{}")
+        finally:
+            for jid in waiters:
+                self.pending.pop((thread, jid), None)
+            limiter.release()
+
+    async def run(self):
+        await self.connect_all()
+        for name in self.room_names:
+            self.tasks.append(asyncio.create_task(self.room_loop(name)))
+        for name in self.professor_names:
+            self.tasks.append(asyncio.create_task(self.professor_loop(name)))
+
+        limiter = asyncio.Semaphore(self.concurrency)
+        rounds = []
+        start = time.perf_counter()
+        for i in range(self.rounds):
+            if self.rate:
+                delay = start + i / self.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await limiter.acquire()
+            professor = self.professor_names[i % len(self.professor_names)]
+            pattern = self.patterns[i % len(self.patterns)]
+            rounds.append(asyncio.create_task(self.run_round(professor, pattern, limiter)))
+        await asyncio.gather(*rounds)
+        elapsed = time.perf_counter() - start
+
+        for task in self.tasks:
+            task.cancel()
+        for client in self.clients.values():
+            client.close()
+        return elapsed
+
+
+def write_rows(rows, output):
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=RTT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+async def run_harness(args):
+    server = None
+    port = args.port
+    if args.server == "standin":
+        server = StandInServer(args.domain)
+        port = await server.start(args.host, args.port or 0)
+        print(f"Stand-in XMPP server listening on {args.host}:{port}")
+
+    patterns = load_patterns(args.pattern)
+    generator = LoadGenerator(
+        args.host, port or 5222, args.professors, args.rooms, patterns, args.domain,
+        args.concurrency, args.rate, args.rounds, args.payload_bytes,
+        args.tls, args.register, seed=args.seed)
+    try:
+        elapsed = await generator.run()
+    finally:
+        if server is not None:
+            await server.stop()
+
+    write_rows(generator.rows, args.output)
+    replies = len(generator.rows)
+    p50, p95, p99, p999 = generator.sketch.quantiles([0.5, 0.95, 0.99, 0.999])
+    print(f"{args.rounds} rounds, {replies} replies in {elapsed:.2f}s "
+          f"({replies / elapsed:.0f} replies/s)")
+    print(f"RTT p50 {p50:.3f} ms, p95 {p95:.3f} ms, p99 {p99:.3f} ms, p99.9 {p999:.3f} ms")
+    print(f"Rows written to {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay SPADE CFP/PROPOSE rounds against an XMPP server and record RTTs.",
+        epilog="Prosody/ejabberd in a container must allow plain SASL (or use --tls) and, "
+               "with --register, in-band registration.")
+    parser.add_argument("--server", choices=["standin", "external"], default="standin",
+                        help="Start the bundled stand-in or use a running server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help="Default: 5222 (external) or a free port")
+    parser.add_argument("--domain", default=DEFAULT_DOMAIN)
+    parser.add_argument("--pattern", default=os.path.join(CURRENT_DIR, "message_logs", "small", "spade.csv"),
+                        help="SPADE message log whose rounds are replayed")
+    parser.add_argument("--professors", type=int, default=20)
+    parser.add_argument("--rooms", type=int, default=15)
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100, help="Max rounds in flight")
+    parser.add_argument("--rate", type=float, default=0.0, help="Rounds per second (0 = unlimited)")
+    parser.add_argument("--payload-bytes", type=int, help="Override the recorded CFP payload size")
+    parser.add_argument("--tls", action="store_true", help="Use STARTTLS when offered")
+    parser.add_argument("--register", action="store_true", help="Register accounts in-band first")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="xmpp_loadgen.csv")
+    args = parser.parse_args()
+    asyncio.run(run_harness(args))
+
+
+if __name__ == "__main__":
+    main()